@@ -0,0 +1,347 @@
+import aiohttp
+from hexbytes import HexBytes
+from web3 import Web3
+from typing import (
+    Any,
+    Optional,
+    Sequence,
+)
+from eth_typing import (
+    BlockIdentifier,
+    ChecksumAddress,
+)
+from web3.types import (
+    Wei
+)
+
+from .Constant import(
+    FWX_HERMES_URL,
+    USDC_BASE,
+    USDC_AVALANCHE
+)
+from .types import (
+    EventRecord,
+    TxParamsInput,
+    FWXPerpHelperGetAllPositionRespond,
+    FWXPerpHelperGetBalanceRespond
+)
+from .W3 import (
+    SHARED_WEB3_POOL,
+    Web3Pool,
+)
+from .AsyncW3 import (
+    AsyncWeb3WalletHTTP,
+)
+from .AsyncContract import (
+    AsyncERC20Contract,
+    AsyncFWXMembershipContract,
+    AsyncFWXPerpCoreContract,
+    AsyncFWXPerpHelperContract,
+    AsyncPythContract,
+)
+from .Client import (
+    TRADE_EVENTS,
+    UNINDEXED_NFT_EVENTS,
+    UNINDEXED_POSITION_EVENTS,
+    FWXPerpClient,
+)
+from .Pyth import (
+    PythSnapshot,
+    decode_hermes_response,
+)
+
+async def async_get_fwx_raw_pyth_data(session:Optional[aiohttp.ClientSession]=None, timeout:float=10.0) -> dict[str,Any]:
+    if session is None:
+        async with aiohttp.ClientSession() as new_session:
+            return await async_get_fwx_raw_pyth_data(new_session, timeout)
+    
+    async with session.get(FWX_HERMES_URL, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+        response.raise_for_status()
+        return decode_hermes_response(await response.read())
+
+class AsyncFWXClient(AsyncWeb3WalletHTTP):
+    """
+    asyncio twin of FWXClient. Build it with `await AsyncFWXClient.create(provider, private_key)`,
+    which resolves the chain ID and the membership NFT ID (minting one if needed).
+    
+    Attributes:
+        membership (AsyncFWXMembershipContract): Instance of the AsyncFWXMembershipContract.
+        nft_id (int): The ID of the NFT representing the membership, 0 until setup() ran.
+    """
+    
+    def __init__(self,
+                 provider: str,
+                 private_key: str,
+                 refferal_id: int = 0,
+                 pool: Web3Pool = SHARED_WEB3_POOL) -> None:
+        super().__init__(provider, private_key, pool)
+        self.refferal_id = refferal_id
+        self.membership = AsyncFWXMembershipContract(provider, pool=pool)
+        self.nft_id:int = 0
+    
+    async def setup(self) -> None:
+        self.nft_id = await self.membership.get_default_membership(self.wallet_address)
+        if self.nft_id == 0:
+            print('This address is not a member')
+            print('Minting membership')
+            mint_func = self.membership.mint(self.refferal_id)
+            await self.build_and_send_transaction(func=mint_func)
+            print('Membership minted')
+            self.nft_id = await self.membership.get_default_membership(self.wallet_address)
+        
+        print(f'Membership ID: {self.nft_id}')
+
+class AsyncFWXPerpClient(AsyncFWXClient):
+    """
+    asyncio twin of FWXPerpClient, so many accounts and markets can be driven from one event loop.
+    
+    Example:
+        clients = await asyncio.gather(*[AsyncFWXPerpClient.create(provider, key) for key in private_keys])
+        balances = await asyncio.gather(*[client.get_perp_balance() for client in clients])
+    """
+    
+    def __init__(self,
+                 provider: str,
+                 private_key: str,
+                 refferal_id: int = 0,
+                 pool: Web3Pool = SHARED_WEB3_POOL) -> None:
+        super().__init__(provider, private_key, refferal_id, pool)
+        self.core = AsyncFWXPerpCoreContract(provider, pool=pool)
+        self.helper = AsyncFWXPerpHelperContract(provider, pool=pool)
+        self.pyth = AsyncPythContract(provider, pool=pool)
+        self.http_session:aiohttp.ClientSession|None = None
+        
+        match self.chain_id:
+            case 8453:
+                self.usdc = AsyncERC20Contract(provider,USDC_BASE,pool)
+            case 43114:
+                self.usdc = AsyncERC20Contract(provider,USDC_AVALANCHE,pool)
+            case _:
+                raise Exception('Chain ID not supported')
+    
+    async def setup(self) -> None:
+        await super().setup()
+        await self.usdc.setup()
+    
+    async def close(self) -> None:
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+    
+    async def get_fwx_raw_pyth_data(self) -> dict[str,Any]:
+        """
+        Fetch the FWX Pyth data over a keep-alive aiohttp session owned by the client.
+        """
+        if self.http_session is None:
+            self.http_session = aiohttp.ClientSession()
+        
+        return await async_get_fwx_raw_pyth_data(self.http_session)
+    
+    async def get_perp_balance(self) -> FWXPerpHelperGetBalanceRespond:
+        """
+        asyncio twin of FWXPerpClient.get_perp_balance.
+        """
+        pyth_data = PythSnapshot.from_raw(await self.get_fwx_raw_pyth_data()).pyth_data
+        
+        return await self.helper.get_balance(self.core.address,self.nft_id,pyth_data)
+    
+    async def get_all_positions(self) -> list[FWXPerpHelperGetAllPositionRespond]|None:
+        """
+        asyncio twin of FWXPerpClient.get_all_positions.
+        """
+        pyth_data = PythSnapshot.from_raw(await self.get_fwx_raw_pyth_data()).pyth_data
+        
+        return await self.helper.get_all_active_positions(self.core.address,self.nft_id,pyth_data)
+    
+    async def get_trade_history(self,
+                                from_block:BlockIdentifier=0,
+                                to_block:BlockIdentifier='latest',
+                                events:Sequence[str]=TRADE_EVENTS,
+                                chunk_size:int=10000,
+                                max_workers:int=4) -> list[EventRecord]:
+        """
+        asyncio twin of FWXPerpClient.get_trade_history.
+        """
+        
+        return [record async for record in self.core.scan_event_logs(from_block,to_block,events,nft_id=self.nft_id,chunk_size=chunk_size,max_workers=max_workers)]
+    
+    async def get_position_history(self,
+                                   pos_id:int,
+                                   from_block:BlockIdentifier=0,
+                                   to_block:BlockIdentifier='latest',
+                                   chunk_size:int=10000,
+                                   max_workers:int=4,
+                                   include_unindexed:bool=True) -> list[EventRecord]:
+        """
+        asyncio twin of FWXPerpClient.get_position_history.
+        """
+        to_block = await self.resolve_block_number(to_block)
+        records = [record async for record in self.core.scan_event_logs(from_block,to_block,None,nft_id=self.nft_id,pos_id=pos_id,chunk_size=chunk_size,max_workers=max_workers)]
+        if include_unindexed:
+            records += [record async for record in self.core.scan_event_logs(from_block,to_block,UNINDEXED_POSITION_EVENTS,chunk_size=chunk_size,max_workers=max_workers)
+                        if record.args.nft_id == self.nft_id and record.args.pos_id == pos_id]
+            records.sort(key=lambda record: (record.block_number, record.log_index))
+        return records
+    
+    async def get_account_history(self,
+                                  from_block:BlockIdentifier=0,
+                                  to_block:BlockIdentifier='latest',
+                                  chunk_size:int=10000,
+                                  max_workers:int=4,
+                                  include_unindexed:bool=True) -> list[EventRecord]:
+        """
+        asyncio twin of FWXPerpClient.get_account_history.
+        """
+        to_block = await self.resolve_block_number(to_block)
+        records = [record async for record in self.core.scan_event_logs(from_block,to_block,None,nft_id=self.nft_id,chunk_size=chunk_size,max_workers=max_workers)]
+        if include_unindexed:
+            records += [record async for record in self.core.scan_event_logs(from_block,to_block,UNINDEXED_NFT_EVENTS,chunk_size=chunk_size,max_workers=max_workers)
+                        if record.args.nft_id == self.nft_id]
+            records.sort(key=lambda record: (record.block_number, record.log_index))
+        return records
+    
+    async def resolve_block_number(self, block:BlockIdentifier) -> int:
+        
+        if isinstance(block, int):
+            return block
+        return await self.w3.eth.block_number if block == 'latest' else (await self.w3.eth.get_block(block))['number']
+    
+    async def deposite_collateral(self,
+                                  amount:Wei,
+                                  underlying_address:ChecksumAddress,
+                                  tx_params_input:TxParamsInput=TxParamsInput(),
+                                  waiting:bool=True)->HexBytes:
+        """
+        asyncio twin of FWXPerpClient.deposite_collateral.
+        """
+        await self.usdc.check_approval(self,self.core.address,amount)
+        deposite_func = self.core.depositCollateral(self.nft_id,self.usdc.address,underlying_address,amount)
+        
+        return await self.build_and_send_transaction(func=deposite_func,tx_params_input=tx_params_input,waiting=waiting)
+    
+    async def _openPositionGivenContractSize(self,
+                                             is_long: bool,
+                                             contract_size: int,
+                                             leverage: int,
+                                             underlying_address: ChecksumAddress,
+                                             raw_pyth_data: dict[str, Any] | PythSnapshot,
+                                             tx_params_input: TxParamsInput = TxParamsInput(),
+                                             waiting: bool = True) -> HexBytes:
+        leverage = leverage*10**18
+        snapshot = PythSnapshot.from_raw(raw_pyth_data)
+        pyth_updata_data = list(snapshot.update_data)
+        value = await self.pyth.get_update_fee(snapshot.update_data)
+        func = self.core.openPosition(self.nft_id,
+                                      is_long,
+                                      self.usdc.address,
+                                      underlying_address,
+                                      contract_size,
+                                      leverage,
+                                      pyth_updata_data,)
+        tx_params_input = tx_params_input._replace(value=value)
+        
+        return await self.build_and_send_transaction(func=func,tx_params_input=tx_params_input,waiting=waiting)
+    
+    async def get_max_contract_size(self,
+                                    underlying_address:ChecksumAddress,
+                                    raw_pyth_data:dict[str,Any]|PythSnapshot,
+                                    is_new_long:bool,
+                                    leverage:int=1,
+                                    safety_factor:int=980000)->int:
+        """
+        asyncio twin of FWXPerpClient.get_max_contract_size.
+        """
+        pyth_data = PythSnapshot.from_raw(raw_pyth_data).pyth_data
+        leverage = leverage*10**18
+        
+        return await self.helper.get_max_contract_size(self.core.address,
+                                                       self.nft_id,
+                                                       underlying_address,
+                                                       is_new_long,
+                                                       leverage,
+                                                       safety_factor,
+                                                       pyth_data)
+    
+    get_contract_size_given_volumn = FWXPerpClient.get_contract_size_given_volumn
+    
+    async def open_position_given_contract_size(self,
+                                                is_long:bool,
+                                                contract_size:int,
+                                                leverage:int,
+                                                underlying_address:ChecksumAddress,
+                                                raw_pyth_data:dict[str,Any]|PythSnapshot,
+                                                is_new_long:bool,
+                                                open_at_max:bool=True,
+                                                tx_params_input:TxParamsInput=TxParamsInput(),
+                                                waiting:bool=True)->HexBytes:
+        """
+        asyncio twin of FWXPerpClient.open_position_given_contract_size.
+        """
+        raw_pyth_data = PythSnapshot.from_raw(raw_pyth_data)
+        max_contract_size = await self.get_max_contract_size(underlying_address,
+                                                             raw_pyth_data,
+                                                             is_new_long,leverage)
+        
+        contract_size = Web3.to_wei(contract_size,'ether')
+        if open_at_max:
+            contract_size = min(contract_size,max_contract_size)
+        
+        else:
+            if contract_size > max_contract_size:
+                raise ValueError("Contract size is too large")
+        
+        return await self._openPositionGivenContractSize(is_long,
+                                                         contract_size,
+                                                         leverage,
+                                                         underlying_address,
+                                                         raw_pyth_data,
+                                                         tx_params_input,
+                                                         waiting)
+    
+    async def open_position_given_volume(self,
+                                         is_long:bool,
+                                         volume:float,
+                                         leverage:int,
+                                         underlying_address:ChecksumAddress,
+                                         raw_pyth_data:dict[str,Any]|PythSnapshot,
+                                         is_new_long:bool,
+                                         pyth_id:str,
+                                         open_at_max:bool=True,
+                                         tx_params_input:TxParamsInput=TxParamsInput(),
+                                         waiting:bool=True)->HexBytes:
+        """
+        asyncio twin of FWXPerpClient.open_position_given_volume.
+        """
+        raw_pyth_data = PythSnapshot.from_raw(raw_pyth_data)
+        contract_size = Wei(int(self.get_contract_size_given_volumn(volume,raw_pyth_data,pyth_id)))
+        
+        return await self.open_position_given_contract_size(is_long,
+                                                            contract_size,
+                                                            leverage,
+                                                            underlying_address,
+                                                            raw_pyth_data,
+                                                            is_new_long,
+                                                            open_at_max,
+                                                            tx_params_input,
+                                                            waiting)
+    
+    async def close_position(self,
+                             pos_id:int,
+                             closing_size:float,
+                             raw_pyth_data:dict[str,Any]|PythSnapshot,
+                             tx_params_input:TxParamsInput=TxParamsInput(),
+                             waiting:bool=True)->HexBytes:
+        """
+        asyncio twin of FWXPerpClient.close_position.
+        """
+        snapshot = PythSnapshot.from_raw(raw_pyth_data)
+        value = await self.pyth.get_update_fee(snapshot.update_data)
+        pyth_update_data = list(snapshot.update_data)
+        closing_size = Web3.to_wei(closing_size,'ether')
+        func =  self.core.closePosition(self.nft_id,
+                                        pos_id,
+                                        closing_size,
+                                        pyth_update_data=pyth_update_data)
+        tx_params_input = tx_params_input._replace(value=value)
+        
+        return await self.build_and_send_transaction(func=func,tx_params_input=tx_params_input,waiting=waiting)
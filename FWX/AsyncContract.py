@@ -0,0 +1,222 @@
+from typing import (
+    AsyncIterator,
+    Optional,
+    Sequence,
+)
+from eth_typing import (
+    BlockIdentifier,
+    ChecksumAddress,
+)
+from web3.types import (
+    Wei,
+)
+
+from .AsyncW3 import (
+    AsyncWeb3HTTP,
+    AsyncWeb3WalletHTTP,
+)
+from .W3 import (
+    SHARED_WEB3_POOL,
+    Web3Pool,
+)
+from .Events import (
+    AsyncLogScanner,
+)
+from .Contract import (
+    ERC20Contract,
+    ERC20ContractBase,
+    FWXMembershipContractBase,
+    FWXPerpCoreContract,
+    FWXPerpCoreContractBase,
+    FWXPerpHelperContractBase,
+    PythContractBase,
+)
+from .types import (
+    AddressLike,
+    EventRecord,
+    FWXPerpCoreGetPositionRespond,
+    FWXPerpHelperGetAllPositionRespond,
+    FWXPerpHelperGetBalanceRespond
+)
+from .Constant import (
+    MAX_UINT,
+)
+
+class AsyncERC20Contract(ERC20ContractBase, AsyncWeb3HTTP):
+
+    def __init__(self,
+                 provider: str,
+                 address:AddressLike,
+                 pool:Web3Pool=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,address,pool)
+        self.token_symbol:str|None = None
+        self.decimal:int|None = None
+    
+    async def setup(self) -> None:
+        if self.token_symbol is None:
+            self.token_symbol = await self.get_symbol()
+        if self.decimal is None:
+            self.decimal = await self.get_decimals()
+    
+    async def get_balanceOf(self,address:ChecksumAddress) -> Wei:
+        
+        return await self.balanceOf(address).call()
+    
+    async def get_allowance(self,owner:ChecksumAddress,spender:ChecksumAddress) -> Wei:
+        
+        return await self.allowance(owner,spender).call()
+    
+    async def get_name(self) -> str:
+        
+        return await self.name().call()
+    
+    async def get_totalSupply(self) -> Wei:
+        
+        return await self.totalSupply().call()
+    
+    async def get_symbol(self) -> str:
+        
+        return await self.symbol().call()
+    
+    async def get_decimals(self) -> int:
+        
+        return await self.decimals().call()
+    
+    process_transfer_event = ERC20Contract.process_transfer_event
+    
+    async def check_approval(self,
+                             wallet:AsyncWeb3WalletHTTP,
+                             spender:ChecksumAddress,
+                             amount:int=MAX_UINT,) -> int:
+        
+        owner = wallet.wallet_address
+        allowance:int = await self.get_allowance(owner,spender)
+        if allowance < amount:
+            print(f'Approve {amount} to {spender} from {owner}')
+            func = self.approve(spender,Wei(amount))
+            await wallet.build_and_send_transaction(func)
+            return amount
+        
+        else:
+            return allowance
+
+class AsyncFWXMembershipContract(FWXMembershipContractBase, AsyncWeb3HTTP):
+
+    def __init__(self,
+                 provider: str,
+                 address:Optional[AddressLike]=None,
+                 pool:Web3Pool=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,address,pool)
+    
+    async def get_default_membership(self,wallet_address:ChecksumAddress) -> int:
+        
+        return await self.getDefaultMembership(wallet_address).call()
+
+class AsyncFWXPerpCoreContract(FWXPerpCoreContractBase, AsyncWeb3HTTP):
+
+    def __init__(self,
+                 provider: str,
+                 address:Optional[AddressLike]=None,
+                 pool:Web3Pool=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,address,pool)
+    
+    async def get_position(self,nft_id:int,underlying_address:ChecksumAddress) -> FWXPerpCoreGetPositionRespond:
+        
+        res = await self.getPosition(nft_id,underlying_address).call()
+        
+        return FWXPerpCoreGetPositionRespond(*res)
+    
+    async def get_event_logs(self,
+                             from_block:BlockIdentifier,
+                             to_block:BlockIdentifier,
+                             events:Optional[Sequence[str]]=None,
+                             owner:Optional[AddressLike]=None,
+                             nft_id:Optional[int]=None,
+                             pos_id:Optional[int]=None) -> list[EventRecord]:
+        
+        logs = await self.get_raw_logs(self.event_log_filter(from_block,to_block,events,owner,nft_id,pos_id))
+        
+        return self.decode_logs(logs)
+    
+    def scan_event_logs(self,
+                        from_block:BlockIdentifier,
+                        to_block:BlockIdentifier='latest',
+                        events:Optional[Sequence[str]]=None,
+                        owner:Optional[AddressLike]=None,
+                        nft_id:Optional[int]=None,
+                        pos_id:Optional[int]=None,
+                        chunk_size:int=2000,
+                        max_workers:int=4) -> AsyncIterator[EventRecord]:
+        
+        scanner = AsyncLogScanner(self,self.event_log_filter(from_block,to_block,events,owner,nft_id,pos_id),self.log_decoder,chunk_size=chunk_size,max_workers=max_workers)
+        
+        return scanner.scan(from_block,to_block)
+    
+    # Building a transaction and decoding an event need no network call, so the sync versions are reused.
+    deposit_collateral = FWXPerpCoreContract.deposit_collateral
+    withdraw_collateral = FWXPerpCoreContract.withdraw_collateral
+    open_position = FWXPerpCoreContract.open_position
+    close_position = FWXPerpCoreContract.close_position
+    close_all_positions = FWXPerpCoreContract.close_all_positions
+    process_open_position_event = FWXPerpCoreContract.process_open_position_event
+    get_process_close_position_event_log = FWXPerpCoreContract.get_process_close_position_event_log
+
+class AsyncFWXPerpHelperContract(FWXPerpHelperContractBase, AsyncWeb3HTTP):
+
+    def __init__(self,
+                 provider:str,
+                 address:Optional[AddressLike]=None,
+                 pool:Web3Pool=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,address,pool)
+    
+    async def get_max_contract_size(self,
+                                    perps_core_address:ChecksumAddress,
+                                    nft_id:int,
+                                    underlying_address:ChecksumAddress,
+                                    is_new_long:bool,
+                                    leverage:int,
+                                    safety_factor:int,
+                                    pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]]) -> int:
+        
+        return await self.getMaxContractSize(perps_core_address,nft_id,underlying_address,is_new_long,leverage,safety_factor,pyth_data).call()
+    
+    async def get_balance(self,
+                          perps_core_address:ChecksumAddress,
+                          nft_id:int,
+                          pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]]) -> FWXPerpHelperGetBalanceRespond:
+        
+        res = await self.getBalance(perps_core_address,nft_id,pyth_data).call()
+        
+        return FWXPerpHelperGetBalanceRespond(*res)
+    
+    async def get_all_active_positions(self,
+                                       perps_core_address:ChecksumAddress,
+                                       nft_id:int,
+                                       pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]]) -> list[FWXPerpHelperGetAllPositionRespond]|None:
+        
+        res = await self.getAllActivePositions(perps_core_address,nft_id,pyth_data).call()
+        result:list[FWXPerpHelperGetAllPositionRespond] = []
+        for pos in res:
+            if len(pos) > 0:
+                result.append(FWXPerpHelperGetAllPositionRespond(*pos))
+        
+        if len(result) == 0:
+            return None
+        
+        return result
+
+class AsyncPythContract(PythContractBase, AsyncWeb3HTTP):
+    
+    def __init__(self,
+                 provider:str,
+                 address:Optional[AddressLike]=None,
+                 pool:Web3Pool=SHARED_WEB3_POOL,
+                 fee_ttl:float=60.0) -> None:
+        super().__init__(provider,address,pool,fee_ttl)
+    
+    async def get_update_fee(self,update_data:Sequence[bytes]) -> Wei:
+        count = self.count_updates(update_data)
+        fees = self._cached_fees()
+        if fees is None:
+            fees = self._set_fees(await self.singleUpdateFeeInWei().call(), await self.getUpdateFee(list(update_data)).call(), count)
+        return Wei(fees[0] * count + fees[1])
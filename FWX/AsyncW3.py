@@ -0,0 +1,330 @@
+import asyncio
+import time
+from typing import (
+    Any,
+    Optional,
+    Dict,
+    Sequence,
+    TypeVar,
+)
+from hexbytes import HexBytes
+from eth_typing import (
+    ChecksumAddress,
+    BlockIdentifier
+)
+from web3.contract.async_contract import (
+    AsyncContract,
+    AsyncContractEvent,
+    AsyncContractFunction,
+)
+from web3.types import (
+    BlockData,
+    EventData,
+    FilterParams,
+    LogReceipt,
+    RPCEndpoint,
+    TxParams,
+    TxReceipt,
+    Nonce,
+    Wei,
+)
+from web3.exceptions import (
+    TimeExhausted,
+    Web3RPCError,
+)
+from web3._utils.events import (
+    EventLogErrorFlags,
+)
+from web3._utils.method_formatters import (
+    block_formatter,
+    filter_params_formatter,
+    log_entry_formatter,
+    receipt_formatter,
+)
+from eth_account.datastructures import (
+    SignedTransaction,
+)
+
+from .W3 import (
+    SHARED_WEB3_POOL,
+    GasCache,
+    NonceManager,
+    Web3HTTP,
+    Web3Pool,
+    Web3WalletHTTP,
+)
+from .types import (
+    PendingTransaction,
+    TxParamsInput
+)
+
+AsyncWeb3HTTPType = TypeVar('AsyncWeb3HTTPType', bound='AsyncWeb3HTTP')
+
+class AsyncWeb3HTTP(Web3HTTP):
+    """
+    asyncio twin of Web3HTTP built on AsyncWeb3 and AsyncHTTPProvider.
+    
+    Every method that talks to the node is a coroutine. The chain id is resolved through
+    the Web3Pool, so build instances with `await cls.create(...)`, which resolves it once
+    per endpoint and then runs the async part of the set up.
+    """
+    
+    def __init__(self,
+                 provider:str,
+                 pool:Web3Pool=SHARED_WEB3_POOL) -> None:
+        if pool is None:
+            raise ValueError("Async wrappers resolve the chain ID through a Web3Pool")
+        self.provider = provider
+        self.pool = pool
+        self._chain_id:int|None = pool.get_cached_chain_id(provider)
+        self.w3 = pool.get_async_web3(provider)
+    
+    @classmethod
+    async def create(cls:type[AsyncWeb3HTTPType],
+                     provider:str,
+                     *args:Any,
+                     pool:Web3Pool=SHARED_WEB3_POOL,
+                     **kwargs:Any) -> AsyncWeb3HTTPType:
+        await pool.async_get_chain_id(provider)
+        instance = cls(provider, *args, pool=pool, **kwargs)
+        await instance.setup()
+        return instance
+    
+    async def setup(self) -> None:
+        pass
+    
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = self.pool.get_cached_chain_id(self.provider)
+            if self._chain_id is None:
+                raise ValueError("Chain ID is not resolved yet, build the wrapper with `await create(...)`")
+        return self._chain_id
+    
+    async def resolve_chain_id(self) -> int:
+        self._chain_id = await self.pool.async_get_chain_id(self.provider)
+        return self._chain_id
+    
+    def watch_transaction(self, txn_hash:HexBytes, timeout:float=120) -> 'asyncio.Future[TxReceipt]':
+        """
+        Awaitable twin of Web3HTTP.watch_transaction, resolved by the same shared receipt poller.
+        """
+        return asyncio.wrap_future(self.receipt_poller.watch(txn_hash, timeout))
+    
+    def load_contract(self,abi:Any,address:ChecksumAddress) -> AsyncContract:
+        return self.w3.eth.contract(abi=abi,address=address)
+    
+    async def get_event_data_with_txn(self,
+                                      txn:HexBytes,
+                                      event:AsyncContractEvent,
+                                      error:EventLogErrorFlags=EventLogErrorFlags.Discard) -> tuple[EventData]:
+        
+        receipt = await self.w3.eth.get_transaction_receipt(txn)
+        return event.process_receipt(receipt,errors=error)
+    
+    async def get_event_data_with_block(self,
+                                        event:AsyncContractEvent,
+                                        argument_filters: Optional[Dict[str, Any]] = None,
+                                        from_block: Optional[BlockIdentifier] = None,
+                                        to_block: Optional[BlockIdentifier] = None)->tuple[EventData]:
+        
+        return await event.get_logs(from_block=from_block, to_block=to_block, argument_filters=argument_filters)
+    
+    async def make_batch_request(self,
+                                 requests:Sequence[tuple[str, Any]],
+                                 max_batch_size:int=100) -> list[Any]:
+        results:list[Any] = []
+        for start in range(0, len(requests), max_batch_size):
+            batch = [(RPCEndpoint(method), params) for method, params in requests[start:start+max_batch_size]]
+            responses = await self.w3.provider.make_batch_request(batch)
+            if not isinstance(responses, list):
+                raise Web3RPCError(str(responses.get('error')), rpc_response=responses)
+            for response in responses:
+                if 'error' in response:
+                    raise Web3RPCError(str(response['error']), rpc_response=response)
+                results.append(response.get('result'))
+        
+        return results
+    
+    async def get_transaction_receipts(self, txn_hashes:Sequence[HexBytes]) -> list[TxReceipt|None]:
+        
+        results = await self.make_batch_request([('eth_getTransactionReceipt', [HexBytes(txn_hash).to_0x_hex()]) for txn_hash in txn_hashes])
+        
+        return [None if res is None else receipt_formatter(res) for res in results]
+    
+    async def get_transaction_counts(self,
+                                     addresses:Sequence[ChecksumAddress],
+                                     block_identifier:BlockIdentifier='pending') -> list[Nonce]:
+        
+        block = block_identifier if isinstance(block_identifier, str) else hex(int(block_identifier))
+        results = await self.make_batch_request([('eth_getTransactionCount', [address, block]) for address in addresses])
+        
+        return [Nonce(int(res, 16)) for res in results]
+    
+    async def get_blocks(self,
+                         block_numbers:Sequence[int],
+                         full_transactions:bool=False) -> list[BlockData|None]:
+        
+        results = await self.make_batch_request([('eth_getBlockByNumber', [hex(block_number), full_transactions]) for block_number in block_numbers])
+        
+        return [None if res is None else block_formatter(res) for res in results]
+    
+    async def get_logs_batch(self, filters:Sequence[FilterParams]) -> list[list[LogReceipt]]:
+        
+        results = await self.make_batch_request([('eth_getLogs', [filter_params_formatter(filter_params)]) for filter_params in filters])
+        
+        return [[log_entry_formatter(log) for log in res] for res in results]
+    
+    async def get_raw_logs(self, filter_params:FilterParams) -> list[dict[str, Any]]:
+        
+        response = await self.w3.provider.make_request(RPCEndpoint('eth_getLogs'), [filter_params_formatter(filter_params)])
+        if 'error' in response:
+            raise Web3RPCError(str(response['error']), rpc_response=response)
+        
+        return response['result']
+    
+    async def wait_for_transaction_receipts(self,
+                                            txn_hashes:Sequence[HexBytes],
+                                            timeout:float=120,
+                                            poll_latency:float=0.5) -> list[TxReceipt]:
+        receipts:dict[int, TxReceipt] = {}
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = [i for i in range(len(txn_hashes)) if i not in receipts]
+            for i, receipt in zip(pending, await self.get_transaction_receipts([txn_hashes[i] for i in pending])):
+                if receipt is not None:
+                    receipts[i] = receipt
+            if len(receipts) == len(txn_hashes):
+                return [receipts[i] for i in range(len(txn_hashes))]
+            if time.monotonic() > deadline:
+                raise TimeExhausted(f"{len(txn_hashes) - len(receipts)} transactions are not in the chain after {timeout} seconds")
+            await asyncio.sleep(poll_latency)
+
+class AsyncWeb3WalletHTTP(Web3WalletHTTP, AsyncWeb3HTTP):
+    """
+    asyncio twin of Web3WalletHTTP. Signing stays local, every node call is awaited.
+    """
+    
+    def __init__(self,
+                 provider:str,
+                 private_key:str,
+                 pool:Web3Pool=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,private_key,pool)
+        self._nonce_sync_lock = asyncio.Lock()
+    
+    async def create_txn_params(self, tx_params:TxParamsInput=TxParamsInput()) -> TxParams:
+        txn_params:TxParams = self._merge_txn_params(tx_params)
+        
+        if 'nonce' not in txn_params:
+            txn_params['nonce'] = await self.get_next_nonce()
+        
+        return txn_params
+    
+    async def get_next_nonce(self) -> Nonce:
+        if self.nonce_manager.needs_sync:
+            async with self._nonce_sync_lock:
+                if self.nonce_manager.needs_sync:
+                    self.nonce_manager.sync(await self.w3.eth.get_transaction_count(self.wallet_address, 'pending'))
+        return self.nonce_manager.allocate()
+    
+    async def check_nonce_gap(self) -> bool:
+        pending_nonce = await self.w3.eth.get_transaction_count(self.wallet_address, 'pending')
+        return self.nonce_manager.detect_gap(pending_nonce)
+    
+    async def checking_txn_params(self, txn_params:TxParams) -> TxParams:
+        if 'nonce' not in txn_params:
+            txn_params['nonce'] = await self.get_next_nonce()
+        
+        if 'to' not in txn_params:
+            raise ValueError("Destination address is required")
+        
+        return txn_params
+    
+    async def create_txn_params_with_func(self,
+                                          func:AsyncContractFunction,
+                                          tx_params:TxParamsInput=TxParamsInput()) -> TxParams:
+        
+        txn_params:TxParams = await self.create_txn_params(tx_params)
+        try:
+            return await self._build_transaction(func, txn_params)
+        except Exception:
+            if tx_params.nonce is None:
+                self.nonce_manager.release(int(txn_params['nonce']))
+            raise
+    
+    async def _build_transaction(self, func:AsyncContractFunction, txn_params:TxParams) -> TxParams:
+        if self.gas_cache is None:
+            return await func.build_transaction(txn_params)
+        
+        key = GasCache.profile_key(func.address, func._encode_transaction_data())
+        if 'gas' not in txn_params:
+            gas = self.gas_cache.get_gas(key)
+            if gas is not None:
+                txn_params['gas'] = gas
+        if self._uses_default_fees(txn_params):
+            txn_params['maxFeePerGas'], txn_params['maxPriorityFeePerGas'] = await self._get_cached_fees(self.gas_cache)
+        
+        txn = await func.build_transaction(txn_params)
+        if 'gas' not in txn_params:
+            self.gas_cache.record_gas(key, int(txn['gas']))
+        return txn
+    
+    async def _get_cached_fees(self, gas_cache:GasCache) -> tuple[Wei, Wei]:
+        fees = gas_cache.get_fees()
+        if fees is None:
+            max_priority_fee = await self.w3.eth.max_priority_fee
+            base_fee = (await self.w3.eth.get_block('latest'))['baseFeePerGas']
+            fees = gas_cache.set_fees(max_priority_fee, base_fee)
+        return fees
+    
+    async def build_txn(self,
+                        func:Optional[AsyncContractFunction]=None,
+                        tx_params:TxParamsInput=TxParamsInput()) -> TxParams:
+        
+        if func is None:
+            return await self.create_txn_params(tx_params)
+        else:
+            return await self.create_txn_params_with_func(func, tx_params)
+    
+    async def send_transaction(self,
+                               txn:TxParams,
+                               waiting:bool=True,
+                               timeout:float=120,
+                               managed_nonce:bool=False) -> HexBytes:
+        signed_txn:SignedTransaction = self.sign_transaction(txn)
+        try:
+            txn_hash:HexBytes = await self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        except Exception as e:
+            if not self.is_known_transaction(e):
+                if managed_nonce:
+                    self._release_nonce(txn, e)
+                raise
+            txn_hash = HexBytes(signed_txn.hash)
+        self._watch_gas_profile(txn, txn_hash)
+        if waiting:
+            await self.watch_transaction(txn_hash, timeout)
+        
+        return txn_hash
+    
+    async def submit_transaction(self,
+                                 func:Optional[AsyncContractFunction]=None,
+                                 tx_params_input:TxParamsInput=TxParamsInput(),
+                                 timeout:float=120) -> PendingTransaction:
+        
+        txn_hash = await self.build_and_send_transaction(func, tx_params_input, waiting=False)
+        return PendingTransaction(txn_hash, self.receipt_poller.watch(txn_hash, timeout))
+    
+    async def build_and_send_transaction(self,
+                                         func:Optional[AsyncContractFunction]=None,
+                                         tx_params_input:TxParamsInput=TxParamsInput(),
+                                         waiting:bool=True) -> HexBytes:
+        
+        managed_nonce = tx_params_input.nonce is None
+        txn:TxParams = await self.build_txn(func, tx_params_input)
+        try:
+            return await self.send_transaction(txn, waiting, managed_nonce=managed_nonce)
+        except Web3RPCError as e:
+            if not managed_nonce or not NonceManager.is_nonce_error(e):
+                raise
+            txn = await self.build_txn(func, tx_params_input)
+            return await self.send_transaction(txn, waiting, managed_nonce=managed_nonce)
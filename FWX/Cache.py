@@ -0,0 +1,80 @@
+import os
+import json
+import hashlib
+import threading
+from typing import (
+    Any,
+    Optional,
+)
+from eth_typing import (
+    ChecksumAddress,
+)
+
+class FWXClientCache:
+    """
+    JSON file cache for the metadata a client would otherwise fetch on start up.
+    
+    It stores the chain id of each provider, the membership NFT id of each wallet and
+    the symbol/decimals of each token so that a lazy client can be constructed without
+    any network call. Provider URLs are stored hashed because they often embed API keys.
+    
+    Attributes:
+        path (str | None): The file the cache is loaded from and saved to. None keeps the cache in memory.
+    """
+    
+    def __init__(self, path:Optional[str]=None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._data:dict[str, dict[str, Any]] = {'chain_id':{},
+                                                'nft_id':{},
+                                                'tokens':{}}
+        if path is not None and os.path.exists(path):
+            self.load()
+    
+    @staticmethod
+    def _provider_key(provider:str) -> str:
+        return hashlib.sha256(provider.encode()).hexdigest()
+    
+    def load(self) -> None:
+        if self.path is None:
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        with self._lock:
+            for key in self._data:
+                self._data[key].update(data.get(key,{}))
+    
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps(self._data, indent=2)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path,'w') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+    
+    def get_chain_id(self, provider:str) -> int|None:
+        return self._data['chain_id'].get(self._provider_key(provider))
+    
+    def set_chain_id(self, provider:str, chain_id:int) -> None:
+        with self._lock:
+            self._data['chain_id'][self._provider_key(provider)] = chain_id
+    
+    def get_nft_id(self, chain_id:int, wallet_address:ChecksumAddress) -> int|None:
+        return self._data['nft_id'].get(f'{chain_id}:{wallet_address}')
+    
+    def set_nft_id(self, chain_id:int, wallet_address:ChecksumAddress, nft_id:int) -> None:
+        with self._lock:
+            self._data['nft_id'][f'{chain_id}:{wallet_address}'] = nft_id
+    
+    def get_token(self, chain_id:int, address:ChecksumAddress) -> tuple[str,int]|None:
+        token = self._data['tokens'].get(f'{chain_id}:{address}')
+        if token is None:
+            return None
+        return token['symbol'],token['decimals']
+    
+    def set_token(self, chain_id:int, address:ChecksumAddress, symbol:str, decimals:int) -> None:
+        with self._lock:
+            self._data['tokens'][f'{chain_id}:{address}'] = {'symbol':symbol,
+                                                             'decimals':decimals}
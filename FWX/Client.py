@@ -1,10 +1,13 @@
+from functools import cached_property
 from hexbytes import HexBytes
 from web3 import Web3
-import requests
 from typing import (
     Any,
+    Optional,
+    Sequence,
 )
 from eth_typing import (
+    BlockIdentifier,
     ChecksumAddress,
 )
 from web3.types import (
@@ -16,12 +19,27 @@ from .Constant import(
     USDC_AVALANCHE
 )
 
+from .Cache import (
+    FWXClientCache,
+)
+from .Pyth import (
+    SHARED_PYTH_CACHE,
+    PythPriceCache,
+    PythPriceStream,
+    PythSnapshot,
+)
+from .Risk import (
+    PositionBook,
+)
 from .types import (
+    EventRecord,
     TxParamsInput,
     FWXPerpHelperGetAllPositionRespond,
     FWXPerpHelperGetBalanceRespond
 )
 from .W3 import (
+    SHARED_WEB3_POOL,
+    Web3Pool,
     Web3WalletHTTP,
 )
 from .Contract import (
@@ -29,28 +47,27 @@ from .Contract import (
     FWXMembershipContract,
     FWXPerpCoreContract,
     FWXPerpHelperContract,
+    PythContract,
 )
 
+# Core events that open, close or liquidate a position.
+TRADE_EVENTS = ('OpenPosition', 'ClosePosition', 'LiquidatePosition')
+# Core events that carry nftId without indexing it. The node cannot filter them by topic, so the
+# history methods fetch them by event name and keep the ones of the membership NFT.
+UNINDEXED_NFT_EVENTS = ('SetTPSL', 'TriggerTPSL', 'UpdateWallet')
+UNINDEXED_POSITION_EVENTS = ('SetTPSL', 'TriggerTPSL')
+
 def get_fwx_raw_pyth_data() -> dict[str,Any]:
-    url = 'https://hermes-pyth.fwx.finance/?pyth=perp&encoding=hex'
-    data = requests.get(url).json()
+    data = SHARED_PYTH_CACHE.get()
     return data
 
-def create_pyth_data(raw_pyth_data:dict[str,Any])->list[tuple[bytes,tuple[int,...],tuple[int,...]]]:
-    pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]] = []
-    for i in raw_pyth_data['parsed']:
-        
-        id:bytes = bytes.fromhex(i['id'])
-        price:tuple[int,...] = tuple([int(j) for j in i['price'].values()])
-        ema_price:tuple[int,...] = tuple([int(j) for j in i['ema_price'].values()])
-        d:tuple[bytes,tuple[int,...],tuple[int,...]] = (id,price,ema_price)
-        pyth_data.append(d)
-        
-    return pyth_data
+def create_pyth_data(raw_pyth_data:dict[str,Any]|PythSnapshot)->list[tuple[bytes,tuple[int,...],tuple[int,...]]]:
+    
+    return list(PythSnapshot.from_raw(raw_pyth_data).pyth_data)
 
-def create_pyth_update_data(raw_pyth_data:dict[str,Any])->list[bytes]:
+def create_pyth_update_data(raw_pyth_data:dict[str,Any]|PythSnapshot)->list[bytes]:
     
-    return [bytes.fromhex(raw_pyth_data['binary']['data'][0])]
+    return list(PythSnapshot.from_raw(raw_pyth_data).update_data)
 
 class FWXClient(Web3WalletHTTP):
     """
@@ -59,12 +76,16 @@ class FWXClient(Web3WalletHTTP):
     Attributes:
         membership (FWXMembershipContract): Instance of the FWXMembershipContract.
         nft_id (int): The ID of the NFT representing the membership.
+        cache (FWXClientCache | None): The persisted metadata cache used to skip start up calls.
     """
     
     def __init__(self, 
                  provider: str, 
                  private_key: str,
-                 refferal_id: int = 0) -> None:
+                 refferal_id: int = 0,
+                 pool: Optional[Web3Pool] = SHARED_WEB3_POOL,
+                 lazy: bool = False,
+                 cache: Optional[FWXClientCache] = None) -> None:
         """
         Initializes the FWXClient with the given provider, private key, and optional referral ID.
         
@@ -72,52 +93,194 @@ class FWXClient(Web3WalletHTTP):
             provider (str): The provider URL for the blockchain connection.
             private_key (str): The private key for the wallet.
             refferal_id (int, optional): The referral ID for minting membership. Defaults to 0.
+            pool (Web3Pool | None, optional): The provider pool shared by the client and its contract wrappers.
+                Defaults to SHARED_WEB3_POOL. Pass None to give every wrapper its own connection.
+            lazy (bool, optional): If True, the membership contract and the NFT ID are only resolved on first use,
+                so construction makes no network call. Defaults to False.
+            cache (FWXClientCache | None, optional): Cache the chain ID, NFT ID and token metadata are read from
+                before any network call is made. Defaults to None.
         """
-        super().__init__(provider, private_key)
-        self.membership = FWXMembershipContract(provider)
-        self.nft_id = self.membership.get_default_membership(self.wallet_address)
-        if self.nft_id == 0:
+        super().__init__(provider, private_key, pool)
+        self.refferal_id = refferal_id
+        self.cache = cache
+        self._nft_id:int|None = None
+        if cache is not None:
+            chain_id = cache.get_chain_id(provider)
+            if chain_id is not None:
+                self.set_chain_id(chain_id)
+                self._nft_id = cache.get_nft_id(chain_id, self.wallet_address)
+                
+        if not lazy:
+            print(f'Membership ID: {self.nft_id}')
+            
+    @cached_property
+    def membership(self) -> FWXMembershipContract:
+        
+        return FWXMembershipContract(self.provider, pool=self.pool)
+    
+    @property
+    def nft_id(self) -> int:
+        if self._nft_id is None:
+            self._nft_id = self._resolve_membership()
+        return self._nft_id
+    
+    @nft_id.setter
+    def nft_id(self, nft_id:int) -> None:
+        self._nft_id = nft_id
+        
+    def _resolve_membership(self) -> int:
+        nft_id = self.membership.get_default_membership(self.wallet_address)
+        if nft_id == 0:
             print('This address is not a member')
             print('Minting membership')
-            mint_func = self.membership.mint(refferal_id)
+            mint_func = self.membership.mint(self.refferal_id)
             self.build_and_send_transaction(func=mint_func)
             print('Membership minted')
-            self.nft_id = self.membership.get_default_membership(self.wallet_address)
+            nft_id = self.membership.get_default_membership(self.wallet_address)
             
-        print(f'Membership ID: {self.nft_id}')
+        return nft_id
+    
+    def save_cache(self) -> None:
+        """
+        Store the metadata resolved so far into the cache and write it to disk,
+        so the next lazy client can start without any network call.
+        """
+        if self.cache is None:
+            return
+        
+        if self._chain_id is not None:
+            self.cache.set_chain_id(self.provider, self._chain_id)
+            if self._nft_id is not None:
+                self.cache.set_nft_id(self._chain_id, self.wallet_address, self._nft_id)
+                
+        self.cache.save()
 
 class FWXPerpClient(FWXClient):
     
-    def __init__(self, provider: str, private_key: str, refferal_id: int = 0) -> None:
+    def __init__(self, 
+                 provider: str, 
+                 private_key: str, 
+                 refferal_id: int = 0,
+                 pool: Optional[Web3Pool] = SHARED_WEB3_POOL,
+                 lazy: bool = False,
+                 cache: Optional[FWXClientCache] = None,
+                 pyth_cache: PythPriceCache|PythPriceStream = SHARED_PYTH_CACHE) -> None:
         """
         Initialize the Client object.
         Args:
             provider (str): The provider URL or identifier.
             private_key (str): The private key for authentication.
             refferal_id (int, optional): The referral ID. Defaults to 0.
+            pool (Web3Pool | None, optional): The shared provider pool. Defaults to SHARED_WEB3_POOL.
+            lazy (bool, optional): If True, contract handles, the NFT ID and token metadata are resolved on first use
+                and construction makes no network call. Defaults to False.
+            cache (FWXClientCache | None, optional): Persisted metadata cache. Defaults to None.
+            pyth_cache (PythPriceCache | PythPriceStream, optional): Price source used by the read methods. Defaults to SHARED_PYTH_CACHE.
         Raises:
             Exception: If the chain ID is not supported.
         Example:
             client = Client(provider="https://mainnet.infura.io/v3/YOUR-PROJECT-ID", 
                             private_key="your_private_key", 
                             refferal_id=12345)
+                            
+            lazy_client = Client(provider="https://mainnet.infura.io/v3/YOUR-PROJECT-ID",
+                                 private_key="your_private_key",
+                                 lazy=True,
+                                 cache=FWXClientCache('fwx_cache.json'))
         """
-        super().__init__(provider, private_key,refferal_id)
-        self.core = FWXPerpCoreContract(provider)
-        self.helper = FWXPerpHelperContract(provider)
+        super().__init__(provider, private_key,refferal_id,pool,lazy,cache)
+        self.pyth_cache = pyth_cache
+        if not lazy:
+            self.core
+            self.helper
+            self.usdc
+            self.usdc.token_symbol
+            self.usdc.decimal
+            self.save_cache()
+            
+    @cached_property
+    def core(self) -> FWXPerpCoreContract:
+        
+        return FWXPerpCoreContract(self.provider, pool=self.pool)
+    
+    @cached_property
+    def helper(self) -> FWXPerpHelperContract:
         
+        return FWXPerpHelperContract(self.provider, pool=self.pool)
+    
+    @cached_property
+    def pyth(self) -> PythContract:
+        
+        return PythContract(self.provider, pool=self.pool)
+    
+    @cached_property
+    def usdc(self) -> ERC20Contract:
         match self.chain_id:
             case 8453:
-                self.usdc = ERC20Contract(provider,USDC_BASE)
+                usdc = ERC20Contract(self.provider,USDC_BASE,self.pool,lazy=True)
             case 43114:
-                self.usdc = ERC20Contract(provider,USDC_AVALANCHE)
+                usdc = ERC20Contract(self.provider,USDC_AVALANCHE,self.pool,lazy=True)
             case _:
                 raise Exception('Chain ID not supported')
+            
+        if self.cache is not None:
+            token = self.cache.get_token(self.chain_id, usdc.address)
+            if token is not None:
+                usdc.token_symbol, usdc.decimal = token
                 
+        return usdc
+    
+    def save_cache(self) -> None:
+        """
+        Store the chain ID, NFT ID and USDC metadata resolved so far and write the cache to disk.
+        """
+        if self.cache is None:
+            return
+        
+        usdc:ERC20Contract|None = self.__dict__.get('usdc')
+        if usdc is not None and usdc._token_symbol is not None and usdc._decimal is not None:
+            self.cache.set_token(self.chain_id, usdc.address, usdc._token_symbol, usdc._decimal)
+            
+        super().save_cache()
+                
+    def get_raw_pyth_data(self, max_age:Optional[float]=None) -> dict[str,Any]:
+        """
+        Return the FWX Pyth data from the client's price cache.
+        Concurrent callers share one Hermes request and a payload younger than max_age seconds is reused.
+        Args:
+            max_age (float | None, optional): Maximum age of the payload in seconds. Defaults to pyth_cache.max_age.
+        Returns:
+            dict[str, Any]: The raw Pyth data with its 'parsed' and 'binary' entries.
+        """
+        
+        return self.pyth_cache.get(max_age)
+    
+    def get_pyth_snapshot(self,
+                          max_age:Optional[float]=None,
+                          ids:Optional[Sequence[str]]=None) -> PythSnapshot:
+        """
+        Return the cached FWX Pyth data as a PythSnapshot, parsed once per fetched payload.
+        Pass it to the open, close and max contract size methods to reuse the same prices without parsing them again.
+        Args:
+            max_age (float | None, optional): Maximum age of the payload in seconds. Defaults to pyth_cache.max_age.
+            ids (Sequence[str] | None, optional): Restrict the snapshot and its update data to these feed IDs,
+                e.g. [PYTH_ID['ETH']] for a call that only trades ETH. Defaults to every feed.
+        Returns:
+            PythSnapshot: The parsed price snapshot.
+        Example:
+            eth_snapshot = client.get_pyth_snapshot(ids=[PYTH_ID['ETH']])
+            txn = client.close_position(pos_id, closing_size, eth_snapshot)
+        """
+        snapshot = self.pyth_cache.get_snapshot(max_age)
+        if ids is None:
+            return snapshot
+        
+        return snapshot.select(ids)
+    
     def get_perp_balance(self) -> FWXPerpHelperGetBalanceRespond:
         """
         Retrieve the perpetual balance for the current user.
-        This method fetches raw FWX Pyth data, processes it into a usable format,
+        This method reads the FWX Pyth data from the price cache, processes it into a usable format,
         and then retrieves the balance using the helper's get_balance method.
         Returns:
             FWXPerpHelperGetBalanceRespond: The balance response object.
@@ -129,15 +292,14 @@ class FWXPerpClient(FWXClient):
             net balance: 1000000000000000000
             avaliable balance: 1000000000000000000
         """
-        raw_fwx_pyth_data = get_fwx_raw_pyth_data()
-        pyth_data = create_pyth_data(raw_fwx_pyth_data)
+        pyth_data = self.get_pyth_snapshot().pyth_data
         
         return self.helper.get_balance(self.core.address,self.nft_id,pyth_data)
     
     def get_all_positions(self) -> list[FWXPerpHelperGetAllPositionRespond]|None:
         """
         Retrieve all active positions for the current user.
-        This method fetches raw FWX Pyth data, processes it into a usable format,
+        This method reads the FWX Pyth data from the price cache, processes it into a usable format,
         and then retrieves all active positions using the helper's get_all_active_positions method.
         Returns:
             list[FWXPerpHelperGetAllPositionRespond] | None: A list of position response objects or None if no positions are found.
@@ -153,15 +315,128 @@ class FWXPerpClient(FWXClient):
             Position ID: 12345
             Position Size: 10
         """
-        raw_fwx_pyth_data = get_fwx_raw_pyth_data()
-        pyth_data = create_pyth_data(raw_fwx_pyth_data)
+        pyth_data = self.get_pyth_snapshot().pyth_data
         
         return self.helper.get_all_active_positions(self.core.address,self.nft_id,pyth_data)
     
+    def get_position_book(self) -> PositionBook:
+        """
+        Load the active positions of the current user into a PositionBook.
+        The positions, maintenance margin ratios and Pyth feed IDs are read once; after that the book
+        recomputes pnl, roe, margin and liquidation distance locally for every price tick, without an
+        eth_call per poll.
+        Returns:
+            PositionBook: The local risk engine over the active positions.
+        Example:
+            book = client.get_position_book()
+            metrics = book.compute(client.get_pyth_snapshot())
+            for pos_id, pnl, distance in zip(metrics.pos_id, metrics.pnl, metrics.liquidation_distance):
+                print("Position ID:", pos_id, "pnl:", pnl, "distance:", distance)
+        Output:
+            Position ID: 12345 pnl: 1500000000000000000 distance: 230000000000000000
+        """
+        positions = self.get_all_positions() or []
+        ratios,pyth_ids = self.core.get_risk_params([position.underlying_address for position in positions])
+        
+        return PositionBook.from_helper_positions(positions,ratios,pyth_ids)
+    
+    def get_trade_history(self,
+                          from_block:BlockIdentifier=0,
+                          to_block:BlockIdentifier='latest',
+                          events:Sequence[str]=TRADE_EVENTS,
+                          chunk_size:int=10000,
+                          max_workers:int=4) -> list[EventRecord]:
+        """
+        Retrieve the trades of the current membership NFT.
+        The nft_id is encoded as a topic of the eth_getLogs filter, so the node only returns this
+        account's logs, and the range is split into adaptive chunks fetched in parallel.
+        Args:
+            from_block (BlockIdentifier, optional): First block of the history. Defaults to 0.
+            to_block (BlockIdentifier, optional): Last block of the history. Defaults to 'latest'.
+            events (Sequence[str], optional): Events to retrieve. Defaults to OpenPosition, ClosePosition and LiquidatePosition.
+            chunk_size (int, optional): Blocks per request to start with. Defaults to 10000.
+            max_workers (int, optional): Requests in flight at once. Defaults to 4.
+        Returns:
+            list[EventRecord]: The records in chain order.
+        Example:
+            for trade in client.get_trade_history(from_block=20000000):
+                print(trade.event, trade.args.pos_id)
+        Output:
+            OpenPosition 12345
+            ClosePosition 12345
+        """
+        
+        return list(self.core.scan_event_logs(from_block,to_block,events,nft_id=self.nft_id,chunk_size=chunk_size,max_workers=max_workers))
+    
+    def get_position_history(self,
+                             pos_id:int,
+                             from_block:BlockIdentifier=0,
+                             to_block:BlockIdentifier='latest',
+                             chunk_size:int=10000,
+                             max_workers:int=4,
+                             include_unindexed:bool=True) -> list[EventRecord]:
+        """
+        Retrieve every event of one position of the current membership NFT (opens, closes,
+        liquidation, collected fees, TP/SL updates and triggers).
+        The events indexing nftId and posId are filtered by the node. SetTPSL and TriggerTPSL do
+        not index them, so every one of those in the range is fetched and filtered locally.
+        Args:
+            pos_id (int): The position ID.
+            from_block (BlockIdentifier, optional): First block of the history. Defaults to 0.
+            to_block (BlockIdentifier, optional): Last block of the history. Defaults to 'latest'.
+            chunk_size (int, optional): Blocks per request to start with. Defaults to 10000.
+            max_workers (int, optional): Requests in flight at once. Defaults to 4.
+            include_unindexed (bool, optional): Also fetch SetTPSL and TriggerTPSL. Defaults to True.
+        Returns:
+            list[EventRecord]: The records in chain order.
+        """
+        to_block = self.resolve_block_number(to_block)
+        records = list(self.core.scan_event_logs(from_block,to_block,None,nft_id=self.nft_id,pos_id=pos_id,chunk_size=chunk_size,max_workers=max_workers))
+        if include_unindexed:
+            records += [record for record in self.core.scan_event_logs(from_block,to_block,UNINDEXED_POSITION_EVENTS,chunk_size=chunk_size,max_workers=max_workers)
+                        if record.args.nft_id == self.nft_id and record.args.pos_id == pos_id]
+            records.sort(key=lambda record: (record.block_number, record.log_index))
+        return records
+    
+    def get_account_history(self,
+                            from_block:BlockIdentifier=0,
+                            to_block:BlockIdentifier='latest',
+                            chunk_size:int=10000,
+                            max_workers:int=4,
+                            include_unindexed:bool=True) -> list[EventRecord]:
+        """
+        Retrieve every core event of the current membership NFT: trades, fees, collateral and
+        token deposits and withdrawals, rank changes, TP/SL updates and triggers, wallet updates.
+        The events indexing nftId are filtered by the node. SetTPSL, TriggerTPSL and UpdateWallet
+        do not index it, so every one of those in the range is fetched and filtered locally.
+        Args:
+            from_block (BlockIdentifier, optional): First block of the history. Defaults to 0.
+            to_block (BlockIdentifier, optional): Last block of the history. Defaults to 'latest'.
+            chunk_size (int, optional): Blocks per request to start with. Defaults to 10000.
+            max_workers (int, optional): Requests in flight at once. Defaults to 4.
+            include_unindexed (bool, optional): Also fetch SetTPSL, TriggerTPSL and UpdateWallet. Defaults to True.
+        Returns:
+            list[EventRecord]: The records in chain order.
+        """
+        to_block = self.resolve_block_number(to_block)
+        records = list(self.core.scan_event_logs(from_block,to_block,None,nft_id=self.nft_id,chunk_size=chunk_size,max_workers=max_workers))
+        if include_unindexed:
+            records += [record for record in self.core.scan_event_logs(from_block,to_block,UNINDEXED_NFT_EVENTS,chunk_size=chunk_size,max_workers=max_workers)
+                        if record.args.nft_id == self.nft_id]
+            records.sort(key=lambda record: (record.block_number, record.log_index))
+        return records
+    
+    def resolve_block_number(self, block:BlockIdentifier) -> int:
+        # Pins 'latest' and other tags once, so the scans of one history cover the same range.
+        if isinstance(block, int):
+            return block
+        return self.w3.eth.block_number if block == 'latest' else self.w3.eth.get_block(block)['number']
+    
     def deposite_collateral(self,
                             amount:Wei,
                             underlying_address:ChecksumAddress,
-                            tx_params_input:TxParamsInput=TxParamsInput(),)->HexBytes:
+                            tx_params_input:TxParamsInput=TxParamsInput(),
+                            waiting:bool=True)->HexBytes:
         """
         Deposit collateral into the system.
         This method approves the necessary amount of USDC, constructs the deposit transaction,
@@ -170,6 +445,7 @@ class FWXPerpClient(FWXClient):
             amount (Wei): The amount of collateral to deposit.
             underlying_address (ChecksumAddress): The address of the underlying asset.
             tx_params_input (TxParamsInput, optional): Transaction parameters. Defaults to TxParamsInput().
+            waiting (bool, optional): Wait for the transaction receipt before returning. Defaults to True.
         Returns:
             HexBytes: The transaction hash.
         Example:
@@ -181,8 +457,7 @@ class FWXPerpClient(FWXClient):
         
         self.usdc.check_approval(self,self.core.address,amount)
         deposite_func = self.core.depositCollateral(self.nft_id,self.usdc.address,underlying_address,amount)
-        txn = self.build_and_send_transaction(func=deposite_func,tx_params_input=tx_params_input)
-        self.w3.eth.wait_for_transaction_receipt(txn)
+        txn = self.build_and_send_transaction(func=deposite_func,tx_params_input=tx_params_input,waiting=waiting)
         
         return txn
     
@@ -191,8 +466,9 @@ class FWXPerpClient(FWXClient):
                                       contract_size: int,
                                       leverage: int,
                                       underlying_address: ChecksumAddress,
-                                      raw_pyth_data: dict[str, Any],
-                                      tx_params_input: TxParamsInput = TxParamsInput()) -> HexBytes:
+                                      raw_pyth_data: dict[str, Any] | PythSnapshot,
+                                      tx_params_input: TxParamsInput = TxParamsInput(),
+                                      waiting: bool = True) -> HexBytes:
         """
         Open a position given the contract size.
         This method constructs the necessary transaction to open a position with the specified parameters,
@@ -203,8 +479,9 @@ class FWXPerpClient(FWXClient):
             contract_size (int): The size of the contract.
             leverage (int): The leverage to be applied.
             underlying_address (ChecksumAddress): The address of the underlying asset.
-            raw_pyth_data (dict[str, Any]): The raw data from Pyth.
+            raw_pyth_data (dict[str, Any] | PythSnapshot): The raw data from Pyth.
             tx_params_input (TxParamsInput, optional): Transaction parameters. Defaults to TxParamsInput().
+            waiting (bool, optional): Wait for the transaction receipt before returning. Defaults to True.
         
         Returns:
             HexBytes: The transaction hash.
@@ -223,8 +500,9 @@ class FWXPerpClient(FWXClient):
             Transaction hash: 0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890
         """
         leverage = leverage*10**18
-        pyth_updata_data = create_pyth_update_data(raw_pyth_data)
-        value = len(raw_pyth_data['parsed']) + len(raw_pyth_data['binary'])
+        snapshot = PythSnapshot.from_raw(raw_pyth_data)
+        pyth_updata_data = list(snapshot.update_data)
+        value = self.pyth.get_update_fee(snapshot.update_data)
         func = self.core.openPosition(self.nft_id,
                                       is_long,
                                       self.usdc.address,
@@ -233,13 +511,12 @@ class FWXPerpClient(FWXClient):
                                       leverage,
                                       pyth_updata_data,)
         tx_params_input = tx_params_input._replace(value=value)
-        txn = self.build_and_send_transaction(func=func,tx_params_input=tx_params_input)
-        self.w3.eth.wait_for_transaction_receipt(txn)
+        txn = self.build_and_send_transaction(func=func,tx_params_input=tx_params_input,waiting=waiting)
         return txn
     
     def get_max_contract_size(self,
                               underlying_address:ChecksumAddress,
-                              raw_pyth_data:dict[str,Any],
+                              raw_pyth_data:dict[str,Any]|PythSnapshot,
                               is_new_long:bool,
                               leverage:int=1,
                               safety_factor:int=980000)->int:
@@ -247,7 +524,7 @@ class FWXPerpClient(FWXClient):
         Calculate the maximum contract size for a given underlying asset.
         Args:
             underlying_address (ChecksumAddress): The address of the underlying asset.
-            raw_pyth_data (dict[str, Any]): Raw data from the Pyth network.
+            raw_pyth_data (dict[str, Any] | PythSnapshot): Raw data from the Pyth network.
             is_new_long (bool): Indicates if the position is a new long position.
             leverage (int, optional): The leverage to be applied. Defaults to 1.
             safety_factor (int, optional): The safety factor to be applied. Defaults to 980000.
@@ -266,7 +543,7 @@ class FWXPerpClient(FWXClient):
         Output:
             Max Contract Size: 1000000000000000000
         """
-        pyth_data = create_pyth_data(raw_pyth_data)
+        pyth_data = PythSnapshot.from_raw(raw_pyth_data).pyth_data
         leverage = leverage*10**18
         
         return self.helper.get_max_contract_size(self.core.address,
@@ -279,7 +556,7 @@ class FWXPerpClient(FWXClient):
         
     def get_contract_size_given_volumn(self,
                                        volume: float,
-                                       raw_pyth_data: dict[str, Any],
+                                       raw_pyth_data: dict[str, Any] | PythSnapshot,
                                        pyth_id: str) -> float:
         """
         Calculate the contract size given a volume and Pyth data.
@@ -288,7 +565,7 @@ class FWXPerpClient(FWXClient):
         and uses the associated price to compute the contract size.
         Args:
             volume (float): The volume for which the contract size is to be calculated.
-            raw_pyth_data (dict[str, Any]): The raw Pyth data containing price information.
+            raw_pyth_data (dict[str, Any] | PythSnapshot): The raw Pyth data containing price information.
             pyth_id (str): The Pyth ID to search for in the raw Pyth data.
         Returns:
             float: The calculated contract size.
@@ -313,14 +590,10 @@ class FWXPerpClient(FWXClient):
         Output:
             10.0
         """
-        contract_size = 0
-        for i in raw_pyth_data['parsed']:
-            if i['id'] == pyth_id:
-                price = int(i['price']['price'])*10**i['price']['expo']
-                contract_size = volume/price
-                break
-        if contract_size == 0:
+        price = PythSnapshot.from_raw(raw_pyth_data).get_price(pyth_id)
+        if price is None:
             raise Exception('Pyth ID not found')
+        contract_size = volume/price.value
         
         return contract_size
     
@@ -329,10 +602,11 @@ class FWXPerpClient(FWXClient):
                                           contract_size:int,
                                           leverage:int,
                                           underlying_address:ChecksumAddress,
-                                          raw_pyth_data:dict[str,Any],
+                                          raw_pyth_data:dict[str,Any]|PythSnapshot,
                                           is_new_long:bool,
                                           open_at_max:bool=True,
-                                          tx_params_input:TxParamsInput=TxParamsInput())->HexBytes:
+                                          tx_params_input:TxParamsInput=TxParamsInput(),
+                                          waiting:bool=True)->HexBytes:
         """
         Open a position given the contract size.
         Args:
@@ -340,10 +614,11 @@ class FWXPerpClient(FWXClient):
             contract_size (int): The size of the contract to open.
             leverage (int): The leverage to be applied.
             underlying_address (ChecksumAddress): The address of the underlying asset.
-            raw_pyth_data (dict[str, Any]): Raw data from the Pyth network.
+            raw_pyth_data (dict[str, Any] | PythSnapshot): Raw data from the Pyth network.
             is_new_long (bool): Indicates if the position is a new long position.
             open_at_max (bool, optional): If True, open the position at the maximum contract size. Defaults to True.
             tx_params_input (TxParamsInput, optional): Transaction parameters input. Defaults to TxParamsInput().
+            waiting (bool, optional): Wait for the transaction receipt before returning. Defaults to True.
         Returns:
             HexBytes: The transaction hash of the opened position.
         Raises:
@@ -362,6 +637,7 @@ class FWXPerpClient(FWXClient):
         Output:
             Transaction Hash: 0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890
         """
+        raw_pyth_data = PythSnapshot.from_raw(raw_pyth_data)
         max_contract_size = self.get_max_contract_size(underlying_address,
                                                        raw_pyth_data,
                                                        is_new_long,leverage)
@@ -379,18 +655,20 @@ class FWXPerpClient(FWXClient):
                                                    leverage,
                                                    underlying_address,
                                                    raw_pyth_data,
-                                                   tx_params_input)
+                                                   tx_params_input,
+                                                   waiting)
         
     def open_position_given_volume(self,
                                    is_long:bool,
                                    volume:float,
                                    leverage:int,
                                    underlying_address:ChecksumAddress,
-                                   raw_pyth_data:dict[str,Any],
+                                   raw_pyth_data:dict[str,Any]|PythSnapshot,
                                    is_new_long:bool,
                                    pyth_id:str,
                                    open_at_max:bool=True,
-                                   tx_params_input:TxParamsInput=TxParamsInput())->HexBytes:
+                                   tx_params_input:TxParamsInput=TxParamsInput(),
+                                   waiting:bool=True)->HexBytes:
         """
         Open a position given the volume.
         Args:
@@ -398,11 +676,12 @@ class FWXPerpClient(FWXClient):
             volume (float): The volume of the position to open.
             leverage (int): The leverage to be applied.
             underlying_address (ChecksumAddress): The address of the underlying asset.
-            raw_pyth_data (dict[str, Any]): Raw data from the Pyth network.
+            raw_pyth_data (dict[str, Any] | PythSnapshot): Raw data from the Pyth network.
             is_new_long (bool): Indicates if the position is a new long position.
             pyth_id (str): The Pyth network identifier.
             open_at_max (bool, optional): If True, open the position at the maximum contract size. Defaults to True.
             tx_params_input (TxParamsInput, optional): Transaction parameters input. Defaults to TxParamsInput().
+            waiting (bool, optional): Wait for the transaction receipt before returning. Defaults to True.
         Returns:
             HexBytes: The transaction hash of the opened position.
         Raises:
@@ -423,6 +702,7 @@ class FWXPerpClient(FWXClient):
             Transaction Hash: 0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890
         """
         
+        raw_pyth_data = PythSnapshot.from_raw(raw_pyth_data)
         contract_size = Wei(int(self.get_contract_size_given_volumn(volume,raw_pyth_data,pyth_id)))
         
         return self.open_position_given_contract_size(is_long,
@@ -432,20 +712,23 @@ class FWXPerpClient(FWXClient):
                                                       raw_pyth_data,
                                                       is_new_long,
                                                       open_at_max,
-                                                      tx_params_input)
+                                                      tx_params_input,
+                                                      waiting)
         
     def close_position(self,
                        pos_id:int,
                        closing_size:float,
-                       raw_pyth_data:dict[str,Any],
-                       tx_params_input:TxParamsInput=TxParamsInput(),)->HexBytes:
+                       raw_pyth_data:dict[str,Any]|PythSnapshot,
+                       tx_params_input:TxParamsInput=TxParamsInput(),
+                       waiting:bool=True)->HexBytes:
         """
         Close a position.
         Args:
             pos_id (int): The ID of the position to close.
             closing_size (float): The size of the position to close.
-            raw_pyth_data (dict[str, Any]): Raw data from the Pyth network.
+            raw_pyth_data (dict[str, Any] | PythSnapshot): Raw data from the Pyth network.
             tx_params_input (TxParamsInput, optional): Transaction parameters input. Defaults to TxParamsInput().
+            waiting (bool, optional): Wait for the transaction receipt before returning. Defaults to True.
         Returns:
 
             HexBytes: The transaction hash of the closed position.
@@ -465,14 +748,14 @@ class FWXPerpClient(FWXClient):
             Transaction Hash: 0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890
         """
         
-        value = len(raw_pyth_data['parsed']) + len(raw_pyth_data['binary'])
-        pyth_update_data = create_pyth_update_data(raw_pyth_data)
+        snapshot = PythSnapshot.from_raw(raw_pyth_data)
+        value = self.pyth.get_update_fee(snapshot.update_data)
+        pyth_update_data = list(snapshot.update_data)
         closing_size = Web3.to_wei(closing_size,'ether')
         func =  self.core.closePosition(self.nft_id,
                                         pos_id,
                                         closing_size,
                                         pyth_update_data=pyth_update_data)
         tx_params_input = tx_params_input._replace(value=value)
-        txn = self.build_and_send_transaction(func=func,tx_params_input=tx_params_input)
-        self.w3.eth.wait_for_transaction_receipt(txn)
+        txn = self.build_and_send_transaction(func=func,tx_params_input=tx_params_input,waiting=waiting)
         return txn
\ No newline at end of file
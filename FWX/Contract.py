@@ -1,58 +1,207 @@
+import time
+from functools import cached_property
 from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
     Optional,
-)
-from web3 import (
-    Web3,
+    Sequence,
 )
 from web3.contract.contract import (
     ContractEvent,
     ContractFunction
 )
 from eth_typing import (
+    BlockIdentifier,
     ChecksumAddress,
 )
+from hexbytes import HexBytes
+from web3.exceptions import (
+    BadFunctionCallOutput,
+)
 from web3.types import (
     Wei,
 )
 from web3.types import (
     EventData,
+    FilterParams,
+)
+from web3.contract.utils import (
+    format_contract_call_return_data_curried,
+)
+from eth_utils.abi import (
+    abi_to_signature,
+    get_abi_output_types,
 )
 
 from .W3 import (
+    SHARED_WEB3_POOL,
     Web3HTTP,
-    Web3WalletHTTP
+    Web3Pool,
+    Web3WalletHTTP,
+    to_checksum_address,
 )
 from .types import (
     AddressLike,
     ERC20TransferArgs,
     ERC20TransferEventData,
+    EventRecord,
     FWXPerpCoreGetPositionRespond,
     FWXPerpCoreOpenPositionArgs,
     FWXPerpCoreOpenPositionEventData,
     FWXPerpCoreClosePositionArgs,
     FWXPerpCoreClosePositionEventData,
     FWXPerpHelperGetAllPositionRespond,
-    FWXPerpHelperGetBalanceRespond
+    FWXPerpHelperGetBalanceRespond,
+    MulticallResult
 )
 from .Constant import(
-    ERC20_ABI,
-    FWX_MEMBERSHIP_ABI,
     FWX_MEMBERSHIP_ADDRESS_BASE,
-    FWX_PERP_CORE_ABI,
     FWX_PERP_CORE_ADDRESS_BASE,
-    FWX_PERP_HELPER_ABI,
     FWX_PERP_HELPER_ADDRESS_BASE,
-    MAX_UINT
+    MAX_UINT,
+    MULTICALL3_ADDRESS,
+    PYTH_ADDRESS_AVALANCHE,
+    PYTH_ADDRESS_BASE,
+    load_abi
+)
+from .Events import (
+    BackfillScanner,
+    LogDecoder,
+    LogScanner,
+    get_perp_core_log_decoder,
+)
+from .Pyth import (
+    count_price_updates,
 )
 
+class Multicall3ContractBase(Web3HTTP):
+    
+    def __init__(self,
+                 provider:str,
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,pool)
+        if address is None:
+            self.address = MULTICALL3_ADDRESS
+        else:
+            self.address = to_checksum_address(address)
+            
+        self.contract = self.load_contract(load_abi('MULTICALL3_ABI'),self.address)
+        
+    # Call function Section
+    
+    def aggregate3(self,calls:list[tuple[ChecksumAddress,bool,bytes]]) -> ContractFunction:
+        
+        return self.contract.functions.aggregate3(calls)
+    
+class Multicall3Contract(Multicall3ContractBase):
+    """
+    Batch reader that packs many ContractFunction reads into Multicall3 aggregate3 calls.
+    
+    Calls are chunked so that every aggregate3 stays below max_calldata_size bytes of
+    calldata and gas_limit gas (budgeting gas_per_call for each read), and every read is
+    sent with allowFailure so one revert does not fail the rest of the batch.
+    """
+    
+    def __init__(self,
+                 provider:str,
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL,
+                 max_calldata_size:int=120_000,
+                 gas_limit:int=30_000_000,
+                 gas_per_call:int=500_000) -> None:
+        super().__init__(provider,address,pool)
+        self.max_calldata_size = max_calldata_size
+        self.gas_limit = gas_limit
+        self.gas_per_call = gas_per_call
+        
+    def _chunk_calls(self,calls:list[tuple[ChecksumAddress,bool,bytes]]) -> list[list[tuple[ChecksumAddress,bool,bytes]]]:
+        max_calls = max(1, self.gas_limit//self.gas_per_call)
+        chunks:list[list[tuple[ChecksumAddress,bool,bytes]]] = []
+        chunk:list[tuple[ChecksumAddress,bool,bytes]] = []
+        chunk_size = 0
+        for call in calls:
+            # target, allowFailure, offset and length words plus the padded calldata
+            call_size = 4*32 + (len(call[2]) + 31)//32*32
+            if chunk and (chunk_size + call_size > self.max_calldata_size or len(chunk) >= max_calls):
+                chunks.append(chunk)
+                chunk = []
+                chunk_size = 0
+            chunk.append(call)
+            chunk_size += call_size
+            
+        if chunk:
+            chunks.append(chunk)
+            
+        return chunks
+    
+    def _decode_result(self,func:ContractFunction,return_data:bytes) -> Any:
+        
+        return format_contract_call_return_data_curried(self.w3,
+                                                        False,
+                                                        func.abi,
+                                                        abi_to_signature(func.abi),
+                                                        (),
+                                                        get_abi_output_types(func.abi),
+                                                        return_data)
+    
+    def batch_call(self,
+                   funcs:Sequence[ContractFunction],
+                   allow_failure:bool=True,
+                   block_identifier:Optional[BlockIdentifier]=None) -> list[MulticallResult]:
+        """
+        Execute the given reads through Multicall3 and decode every result as ContractFunction.call() would.
+        
+        Args:
+            funcs (Sequence[ContractFunction]): The reads to execute, e.g. FWXPerpCoreContract.getPosition(...).
+            allow_failure (bool, optional): If False, raise when any read reverts. Defaults to True.
+            block_identifier (BlockIdentifier | None, optional): The block to read at. Defaults to latest.
+        Returns:
+            list[MulticallResult]: One result per read, in order. Failed reads have success False and result None.
+        Raises:
+            ValueError: If allow_failure is False and a read reverted or could not be decoded.
+        """
+        calls:list[tuple[ChecksumAddress,bool,bytes]] = [(func.address,True,HexBytes(func._encode_transaction_data())) for func in funcs]
+        results:list[MulticallResult] = []
+        for chunk in self._chunk_calls(calls):
+            results_chunk = self.aggregate3(chunk).call({'gas':self.gas_limit},block_identifier=block_identifier)
+            for func,(success,return_data) in zip(funcs[len(results):],results_chunk):
+                result = None
+                if success:
+                    try:
+                        result = self._decode_result(func,return_data)
+                    except BadFunctionCallOutput:
+                        success = False
+                if not success and not allow_failure:
+                    raise ValueError(f"Multicall read {abi_to_signature(func.abi)} on {func.address} failed")
+                results.append(MulticallResult(success,result))
+                
+        return results
+    
+    def batch_call_as(self,
+                      funcs:Sequence[ContractFunction],
+                      respond_type:Callable[...,Any],
+                      block_identifier:Optional[BlockIdentifier]=None) -> list[Any]:
+        """
+        Execute the given reads and build respond_type(*result) for each of them, or None for reads that failed.
+        """
+        results = self.batch_call(funcs,True,block_identifier)
+        
+        return [respond_type(*res.result) if res.success else None for res in results]
+    
+
 class ERC20ContractBase(Web3HTTP):
     
     def __init__(self, 
                  provider: str,
-                 address:AddressLike) -> None:
-        super().__init__(provider)
-        self.address = Web3.to_checksum_address(address)
-        self.contract = self.load_contract(ERC20_ABI,self.address)
+                 address:AddressLike,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,pool)
+        self.address = to_checksum_address(address)
+        self.contract = self.load_contract(load_abi('ERC20_ABI'),self.address)
         
         # Call Function Section
         
@@ -104,10 +253,35 @@ class ERC20Contract(ERC20ContractBase):
     
     def __init__(self, 
                  provider: str,
-                 address:AddressLike) -> None:
-        super().__init__(provider,address)
-        self.token_symbol = self.get_symbol()
-        self.decimal = self.get_decimals()
+                 address:AddressLike,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL,
+                 lazy:bool=False) -> None:
+        super().__init__(provider,address,pool)
+        self._token_symbol:str|None = None
+        self._decimal:int|None = None
+        if not lazy:
+            self._token_symbol = self.get_symbol()
+            self._decimal = self.get_decimals()
+            
+    @property
+    def token_symbol(self) -> str:
+        if self._token_symbol is None:
+            self._token_symbol = self.get_symbol()
+        return self._token_symbol
+    
+    @token_symbol.setter
+    def token_symbol(self, token_symbol:str) -> None:
+        self._token_symbol = token_symbol
+        
+    @property
+    def decimal(self) -> int:
+        if self._decimal is None:
+            self._decimal = self.get_decimals()
+        return self._decimal
+    
+    @decimal.setter
+    def decimal(self, decimal:int) -> None:
+        self._decimal = decimal
         
     def get_balanceOf(self,address:ChecksumAddress) -> Wei:
         
@@ -136,8 +310,8 @@ class ERC20Contract(ERC20ContractBase):
     def process_transfer_event(self,event:EventData) -> ERC20TransferEventData:
         
         base_event_data,arg = self.process_event_data(event)
-        sender = Web3.to_checksum_address(arg['from'])
-        receiver = Web3.to_checksum_address(arg['to'])
+        sender = to_checksum_address(arg['from'])
+        receiver = to_checksum_address(arg['to'])
         value = int(arg['value'])
         transfer_args = ERC20TransferArgs(sender,receiver,value)
         return ERC20TransferEventData(address=base_event_data.address,
@@ -157,8 +331,7 @@ class ERC20Contract(ERC20ContractBase):
         if allowance < amount:
             print(f'Approve {amount} to {spender} from {owner}')
             func = self.approve(spender,Wei(amount))
-            txn = wallet.build_and_send_transaction(func)
-            wallet.w3.eth.wait_for_transaction_receipt(txn)
+            wallet.build_and_send_transaction(func)
             return amount
         
         else:
@@ -167,8 +340,9 @@ class FWXMembershipContractBase(Web3HTTP):
     
     def __init__(self, 
                  provider: str,
-                 address:Optional[AddressLike]=None) -> None:
-        super().__init__(provider)
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,pool)
         if address is None:
             match self.chain_id:
                 case 8453:
@@ -176,9 +350,9 @@ class FWXMembershipContractBase(Web3HTTP):
                 case _:
                     raise ValueError("Invalid Chain ID")
         else:
-            self.address = Web3.to_checksum_address(address)
+            self.address = to_checksum_address(address)
             
-        self.contract = self.load_contract(FWX_MEMBERSHIP_ABI,self.address)
+        self.contract = self.load_contract(load_abi('FWX_MEMBERSHIP_ABI'),self.address)
         
         # Call Function Section
         
@@ -197,8 +371,9 @@ class FWXMembershipContract(FWXMembershipContractBase):
     
     def __init__(self, 
                  provider: str,
-                 address:Optional[AddressLike]=None) -> None:
-        super().__init__(provider,address)
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,address,pool)
         
     def get_default_membership(self,wallet_address:ChecksumAddress) -> int:
         
@@ -208,8 +383,9 @@ class FWXPerpCoreContractBase(Web3HTTP):
     
     def __init__(self, 
                  provider: str,
-                 address:Optional[AddressLike]=None) -> None:
-        super().__init__(provider)
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,pool)
         if address is None:
             match self.chain_id:
                 case 8453:
@@ -217,9 +393,9 @@ class FWXPerpCoreContractBase(Web3HTTP):
                 case _:
                     raise ValueError("Invalid Chain ID")
         else:
-            self.address = Web3.to_checksum_address(address)
+            self.address = to_checksum_address(address)
             
-        self.contract = self.load_contract(FWX_PERP_CORE_ABI,self.address)
+        self.contract = self.load_contract(load_abi('FWX_PERP_CORE_ABI'),self.address)
         
     # Call function Section
     
@@ -229,6 +405,14 @@ class FWXPerpCoreContractBase(Web3HTTP):
         
         return self.contract.functions.getPosition(nft_id,underlying_address)
     
+    def maintenanceMarginRatio(self,underlying_address:ChecksumAddress)->ContractFunction:
+        
+        return self.contract.functions.maintenanceMarginRatio(underlying_address)
+    
+    def pythOracleId(self,underlying_address:ChecksumAddress)->ContractFunction:
+        
+        return self.contract.functions.pythOracleId(underlying_address)
+    
     # Transaction Section
     
     def depositCollateral(self,
@@ -282,13 +466,50 @@ class FWXPerpCoreContractBase(Web3HTTP):
     def eventClosePosition(self) -> ContractEvent:
         
         return self.contract.events.ClosePosition()
+    
+    # Raw Log Section
+    
+    @property
+    def log_decoder(self) -> LogDecoder:
+        
+        return get_perp_core_log_decoder()
+    
+    def event_log_filter(self,
+                         from_block:BlockIdentifier,
+                         to_block:BlockIdentifier,
+                         events:Optional[Sequence[str]]=None,
+                         owner:Optional[AddressLike]=None,
+                         nft_id:Optional[int]=None,
+                         pos_id:Optional[int]=None) -> FilterParams:
+        """
+        Build the eth_getLogs filter of the core events. owner, nft_id and pos_id are encoded as
+        topics, so the node only returns the matching logs of the events that index them.
+        
+        Raises:
+            ValueError: If one of the events does not index a filtered argument.
+        """
+        filter_params = FilterParams(address=self.address,
+                                     fromBlock=from_block,
+                                     toBlock=to_block)
+        # Every core event is decoded, so without a selection the filter on the address alone is enough.
+        if events is not None or owner is not None or nft_id is not None or pos_id is not None:
+            filter_params['topics'] = self.log_decoder.topic_filter(events,
+                                                                    owner=None if owner is None else to_checksum_address(owner),
+                                                                    nftId=nft_id,
+                                                                    posId=pos_id)
+        return filter_params
+    
+    def decode_logs(self,logs:Iterable[Mapping[str,Any]]) -> list[EventRecord]:
+        
+        return self.log_decoder.decode_logs(logs)
 
 class FWXPerpCoreContract(FWXPerpCoreContractBase):
     
     def __init__(self, 
                  provider: str,
-                 address:Optional[AddressLike]=None) -> None:
-        super().__init__(provider,address)
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,address,pool)
         
     def get_position(self,nft_id:int,underlying_address:ChecksumAddress) -> FWXPerpCoreGetPositionRespond:
         
@@ -296,6 +517,36 @@ class FWXPerpCoreContract(FWXPerpCoreContractBase):
         
         return FWXPerpCoreGetPositionRespond(*res)
     
+    @cached_property
+    def multicall(self) -> Multicall3Contract:
+        
+        return Multicall3Contract(self.provider,pool=self.pool)
+    
+    def get_positions(self,
+                      positions:Sequence[tuple[int,ChecksumAddress]],
+                      block_identifier:Optional[BlockIdentifier]=None) -> list[FWXPerpCoreGetPositionRespond|None]:
+        """
+        Read many (nft_id, underlying_address) positions through Multicall3. Reverted reads come back as None.
+        """
+        funcs = [self.getPosition(nft_id,underlying_address) for nft_id,underlying_address in positions]
+        
+        return self.multicall.batch_call_as(funcs,FWXPerpCoreGetPositionRespond,block_identifier)
+    
+    def get_risk_params(self,
+                        underlyings:Sequence[ChecksumAddress],
+                        block_identifier:Optional[BlockIdentifier]=None) -> tuple[dict[ChecksumAddress,int],dict[ChecksumAddress,str]]:
+        """
+        Read the maintenance margin ratio (WAD) and the Pyth feed ID of each underlying in one Multicall3 round trip.
+        """
+        underlyings = list(dict.fromkeys(to_checksum_address(underlying) for underlying in underlyings))
+        funcs = [self.maintenanceMarginRatio(underlying) for underlying in underlyings]
+        funcs += [self.pythOracleId(underlying) for underlying in underlyings]
+        results = self.multicall.batch_call(funcs,False,block_identifier)
+        ratios = {underlying:res.result for underlying,res in zip(underlyings,results)}
+        pyth_ids = {underlying:HexBytes(res.result).hex() for underlying,res in zip(underlyings,results[len(underlyings):])}
+        
+        return ratios,pyth_ids
+    
     def deposit_collateral(self,
                             nft_id:int,
                             collateral_address:ChecksumAddress,
@@ -356,10 +607,107 @@ class FWXPerpCoreContract(FWXPerpCoreContractBase):
                                      pyth_update_data)
         
     
+    def get_event_logs(self,
+                       from_block:BlockIdentifier,
+                       to_block:BlockIdentifier,
+                       events:Optional[Sequence[str]]=None,
+                       owner:Optional[AddressLike]=None,
+                       nft_id:Optional[int]=None,
+                       pos_id:Optional[int]=None) -> list[EventRecord]:
+        """
+        Fetch the logs of every core event of a block range with one eth_getLogs on the contract
+        address, and decode each one through the topic0 table into its typed record, without
+        web3's EventData.
+        
+        Args:
+            from_block (BlockIdentifier): First block of the range.
+            to_block (BlockIdentifier): Last block of the range, inclusive.
+            events (Optional[Sequence[str]]): Event names to fetch, e.g. ['OpenPosition']. Defaults to every core event.
+            owner (Optional[AddressLike]): Only the events of this owner, filtered by the node.
+            nft_id (Optional[int]): Only the events of this membership NFT, filtered by the node.
+            pos_id (Optional[int]): Only the events of this position, filtered by the node.
+        Returns:
+            list[EventRecord]: The records in chain order.
+        """
+        logs = self.get_raw_logs(self.event_log_filter(from_block,to_block,events,owner,nft_id,pos_id))
+        
+        return self.decode_logs(logs)
+    
+    def scan_event_logs(self,
+                        from_block:BlockIdentifier,
+                        to_block:BlockIdentifier='latest',
+                        events:Optional[Sequence[str]]=None,
+                        owner:Optional[AddressLike]=None,
+                        nft_id:Optional[int]=None,
+                        pos_id:Optional[int]=None,
+                        chunk_size:int=2000,
+                        max_workers:int=4) -> Iterator[EventRecord]:
+        """
+        Stream the core events of a range of any length in chain order.
+        
+        The range is fetched in eth_getLogs chunks on up to max_workers threads. Chunks the node
+        rejects as too large are split, and the chunk size grows again over sparse blocks.
+        
+        Args:
+            from_block (BlockIdentifier): First block of the range.
+            to_block (BlockIdentifier): Last block of the range, inclusive. Defaults to 'latest'.
+            events (Optional[Sequence[str]]): Event names to fetch. Defaults to every core event.
+            owner (Optional[AddressLike]): Only the events of this owner, filtered by the node.
+            nft_id (Optional[int]): Only the events of this membership NFT, filtered by the node.
+            pos_id (Optional[int]): Only the events of this position, filtered by the node.
+            chunk_size (int): Blocks per request to start with.
+            max_workers (int): Requests in flight at once.
+        Returns:
+            Iterator[EventRecord]: The records, ordered by block number and log index.
+        """
+        scanner = LogScanner(self,self.event_log_filter(from_block,to_block,events,owner,nft_id,pos_id),self.log_decoder,chunk_size=chunk_size,max_workers=max_workers)
+        
+        return scanner.scan(from_block,to_block)
+    
+    def backfill_event_logs(self,
+                            from_block:BlockIdentifier,
+                            to_block:BlockIdentifier='latest',
+                            events:Optional[Sequence[str]]=None,
+                            owner:Optional[AddressLike]=None,
+                            nft_id:Optional[int]=None,
+                            pos_id:Optional[int]=None,
+                            chunk_size:int=2000,
+                            max_workers:int=4,
+                            processes:Optional[int]=None,
+                            batch_size:int=2000) -> Iterator[EventRecord]:
+        """
+        scan_event_logs for bulk backfills: the logs are fetched on max_workers threads and decoded
+        in batches of batch_size by a pool of processes (one per core by default), and the records
+        are still yielded in chain order.
+        
+        Args:
+            from_block (BlockIdentifier): First block of the range.
+            to_block (BlockIdentifier): Last block of the range, inclusive. Defaults to 'latest'.
+            events (Optional[Sequence[str]]): Event names to fetch. Defaults to every core event.
+            owner (Optional[AddressLike]): Only the events of this owner, filtered by the node.
+            nft_id (Optional[int]): Only the events of this membership NFT, filtered by the node.
+            pos_id (Optional[int]): Only the events of this position, filtered by the node.
+            chunk_size (int): Blocks per request to start with.
+            max_workers (int): Requests in flight at once.
+            processes (Optional[int]): Decoding processes. Defaults to the number of CPUs.
+            batch_size (int): Logs per decoding task.
+        Returns:
+            Iterator[EventRecord]: The records, ordered by block number and log index.
+        """
+        scanner = BackfillScanner(self,
+                                  self.event_log_filter(from_block,to_block,events,owner,nft_id,pos_id),
+                                  get_perp_core_log_decoder,
+                                  chunk_size=chunk_size,
+                                  max_workers=max_workers,
+                                  processes=processes,
+                                  batch_size=batch_size)
+        
+        return scanner.scan(from_block,to_block)
+    
     def process_open_position_event(self,event:EventData) -> FWXPerpCoreOpenPositionEventData:
             
         base_event_data,arg = self.process_event_data(event)
-        owener = Web3.to_checksum_address(arg['owner'])
+        owener = to_checksum_address(arg['owner'])
         nft_id = int(arg['nftId'])
         position_id = int(arg['posId'])
         entry_price = int(arg['entryPrice'])
@@ -368,7 +716,7 @@ class FWXPerpCoreContract(FWXPerpCoreContractBase):
         is_long = arg['isLong']
         pair_bytes = arg['pairByte']
         collateral_swap_amount_locked = int(arg['collateralSwappedAmountLock'])
-        router_address = Web3.to_checksum_address(arg['router'])
+        router_address = to_checksum_address(arg['router'])
         
         return FWXPerpCoreOpenPositionEventData(address=base_event_data.address,
                                                 block_hash=base_event_data.block_hash,
@@ -380,7 +728,7 @@ class FWXPerpCoreContract(FWXPerpCoreContractBase):
         
     def get_process_close_position_event_log(self,event_log:EventData) -> FWXPerpCoreClosePositionEventData:
         base_event_data,arg = self.process_event_data(event_log)
-        owener = Web3.to_checksum_address(arg['owner'])
+        owener = to_checksum_address(arg['owner'])
         nft_id = int(arg['nftId'])
         position_id = int(arg['posId'])
         closing_size = int(arg['closingSize'])
@@ -390,7 +738,7 @@ class FWXPerpCoreContract(FWXPerpCoreContractBase):
         clooe_all_positions = arg['closeAllPosition']
         pair_bytes = arg['pairByte']
         collateral_swap_amount_unlocked = int(arg['collateralSwappedAmountUnlock'])
-        router_address = Web3.to_checksum_address(arg['router'])
+        router_address = to_checksum_address(arg['router'])
         
         return FWXPerpCoreClosePositionEventData(address=base_event_data.address,
                                                 block_hash=base_event_data.block_hash,
@@ -404,8 +752,9 @@ class FWXPerpHelperContractBase(Web3HTTP):
     
     def __init__(self,
                     provider:str,
-                    address:Optional[AddressLike]=None) -> None:
-            super().__init__(provider)
+                    address:Optional[AddressLike]=None,
+                    pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+            super().__init__(provider,pool)
             if address is None:
                 match self.chain_id:
                     case 8453:
@@ -413,9 +762,9 @@ class FWXPerpHelperContractBase(Web3HTTP):
                     case _:
                         raise ValueError("Invalid Chain ID")
             else:
-                self.address = Web3.to_checksum_address(address)
+                self.address = to_checksum_address(address)
                 
-            self.contract = self.load_contract(FWX_PERP_HELPER_ABI,self.address)
+            self.contract = self.load_contract(load_abi('FWX_PERP_HELPER_ABI'),self.address)
             
     # Call function Section
     
@@ -448,8 +797,9 @@ class FWXPerpHelperContract(FWXPerpHelperContractBase):
     
     def __init__(self,
                     provider:str,
-                    address:Optional[AddressLike]=None) -> None:
-        super().__init__(provider,address)
+                    address:Optional[AddressLike]=None,
+                    pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,address,pool)
         
     def get_max_contract_size(self,
                               perps_core_address:ChecksumAddress,
@@ -471,6 +821,52 @@ class FWXPerpHelperContract(FWXPerpHelperContractBase):
         
         return FWXPerpHelperGetBalanceRespond(*res)
     
+    @cached_property
+    def multicall(self) -> Multicall3Contract:
+        
+        return Multicall3Contract(self.provider,pool=self.pool)
+    
+    def get_balances(self,
+                     perps_core_address:ChecksumAddress,
+                     nft_ids:Sequence[int],
+                     pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]],
+                     block_identifier:Optional[BlockIdentifier]=None) -> list[FWXPerpHelperGetBalanceRespond|None]:
+        """
+        Read the balance of many NFT IDs through Multicall3. Reverted reads come back as None.
+        """
+        funcs = [self.getBalance(perps_core_address,nft_id,pyth_data) for nft_id in nft_ids]
+        
+        return self.multicall.batch_call_as(funcs,FWXPerpHelperGetBalanceRespond,block_identifier)
+    
+    def get_max_contract_sizes(self,
+                               perps_core_address:ChecksumAddress,
+                               requests:Sequence[tuple[int,ChecksumAddress,bool,int,int]],
+                               pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]],
+                               block_identifier:Optional[BlockIdentifier]=None) -> list[int|None]:
+        """
+        Read many (nft_id, underlying_address, is_new_long, leverage, safety_factor) max contract sizes through Multicall3.
+        """
+        funcs = [self.getMaxContractSize(perps_core_address,*request,pyth_data) for request in requests]
+        
+        return [res.result if res.success else None for res in self.multicall.batch_call(funcs,True,block_identifier)]
+    
+    def get_all_active_positions_of(self,
+                                    perps_core_address:ChecksumAddress,
+                                    nft_ids:Sequence[int],
+                                    pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]],
+                                    block_identifier:Optional[BlockIdentifier]=None) -> list[list[FWXPerpHelperGetAllPositionRespond]|None]:
+        """
+        Read the active positions of many NFT IDs through Multicall3.
+        NFT IDs without positions, or whose read reverted, come back as None like get_all_active_positions.
+        """
+        funcs = [self.getAllActivePositions(perps_core_address,nft_id,pyth_data) for nft_id in nft_ids]
+        results:list[list[FWXPerpHelperGetAllPositionRespond]|None] = []
+        for res in self.multicall.batch_call(funcs,True,block_identifier):
+            positions = [FWXPerpHelperGetAllPositionRespond(*pos) for pos in res.result if len(pos) > 0] if res.success else []
+            results.append(positions if len(positions) > 0 else None)
+            
+        return results
+    
     def get_all_active_positions(self,
                                  perps_core_address:ChecksumAddress,
                                  nft_id:int,
@@ -485,4 +881,87 @@ class FWXPerpHelperContract(FWXPerpHelperContractBase):
         if len(result) == 0:
             return None
         
-        return result
\ No newline at end of file
+        return result
+
+class PythContractBase(Web3HTTP):
+    
+    def __init__(self,
+                 provider:str,
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL,
+                 fee_ttl:float=60.0) -> None:
+        super().__init__(provider,pool)
+        if address is None:
+            match self.chain_id:
+                case 8453:
+                    self.address = PYTH_ADDRESS_BASE
+                case 43114:
+                    self.address = PYTH_ADDRESS_AVALANCHE
+                case _:
+                    raise ValueError("Invalid Chain ID")
+        else:
+            self.address = to_checksum_address(address)
+            
+        self.contract = self.load_contract(load_abi('PYTH_ABI'),self.address)
+        self.fee_ttl = fee_ttl
+        self._fees:tuple[int,int,float]|None = None
+        self._update_counts:dict[tuple[bytes,...],int] = {}
+        
+    # Call function Section
+    
+    def getUpdateFee(self,update_data:list[bytes]) -> ContractFunction:
+        
+        return self.contract.functions.getUpdateFee(update_data)
+    
+    def singleUpdateFeeInWei(self) -> ContractFunction:
+        
+        return self.contract.functions.singleUpdateFeeInWei()
+    
+    def _cached_fees(self) -> tuple[int,int]|None:
+        cached = self._fees
+        if cached is None or time.monotonic() - cached[2] > self.fee_ttl:
+            return None
+        return cached[0], cached[1]
+    
+    def _set_fees(self, single_update_fee:int, onchain_fee:int, update_count:int) -> tuple[int,int]:
+        # Whatever getUpdateFee charges on top of singleUpdateFeeInWei per update (transactionFeeInWei
+        # on newer Pyth contracts) is kept as a flat fee per transaction.
+        transaction_fee = max(0, onchain_fee - single_update_fee * update_count)
+        self._fees = (single_update_fee, transaction_fee, time.monotonic())
+        return single_update_fee, transaction_fee
+    
+    def count_updates(self,update_data:Sequence[bytes]) -> int:
+        # Memoized per payload: bytes cache their hash, so the lookup does not rehash the blobs.
+        key = tuple(update_data)
+        count = self._update_counts.get(key)
+        if count is None:
+            count = count_price_updates(key)
+            if len(self._update_counts) >= 128:
+                self._update_counts.clear()
+            self._update_counts[key] = count
+        return count
+    
+class PythContract(PythContractBase):
+    """
+    Pyth price feed contract, used to compute the fee of a price update locally.
+    
+    Pyth charges singleUpdateFeeInWei for every feed update in the update data, and newer
+    contracts add a flat transactionFeeInWei. Once per fee_ttl seconds both singleUpdateFeeInWei
+    and the on-chain getUpdateFee of the payload being priced are read. The part of getUpdateFee
+    not explained by the per-update fee is kept as a flat fee. Between refreshes the number of
+    updates is counted from the payload, so pricing an order needs no RPC in the hot path.
+    """
+    
+    def __init__(self,
+                 provider:str,
+                 address:Optional[AddressLike]=None,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL,
+                 fee_ttl:float=60.0) -> None:
+        super().__init__(provider,address,pool,fee_ttl)
+        
+    def get_update_fee(self,update_data:Sequence[bytes]) -> Wei:
+        count = self.count_updates(update_data)
+        fees = self._cached_fees()
+        if fees is None:
+            fees = self._set_fees(self.singleUpdateFeeInWei().call(), self.getUpdateFee(list(update_data)).call(), count)
+        return Wei(fees[0] * count + fees[1])
@@ -0,0 +1,682 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+)
+from eth_abi import decode as abi_decode
+from eth_utils import (
+    event_abi_to_log_topic,
+)
+from eth_typing import (
+    BlockIdentifier,
+)
+from hexbytes import HexBytes
+
+from .Constant import (
+    load_abi,
+    to_checksum_address,
+)
+from .types import (
+    EventRecord,
+    FWXPerpCoreActivateRankArgs,
+    FWXPerpCoreActivateRankEventData,
+    FWXPerpCoreBurnAtpTokenArgs,
+    FWXPerpCoreBurnAtpTokenEventData,
+    FWXPerpCoreBurnPTokenArgs,
+    FWXPerpCoreBurnPTokenEventData,
+    FWXPerpCoreClaimTokenInterestArgs,
+    FWXPerpCoreClaimTokenInterestEventData,
+    FWXPerpCoreClosePositionArgs,
+    FWXPerpCoreClosePositionEventData,
+    FWXPerpCoreCollectFeesArgs,
+    FWXPerpCoreCollectFeesEventData,
+    FWXPerpCoreDepositArgs,
+    FWXPerpCoreDepositEventData,
+    FWXPerpCoreDepositCollateralArgs,
+    FWXPerpCoreDepositCollateralEventData,
+    FWXPerpCoreLiquidatePositionArgs,
+    FWXPerpCoreLiquidatePositionEventData,
+    FWXPerpCoreMintAtpTokenArgs,
+    FWXPerpCoreMintAtpTokenEventData,
+    FWXPerpCoreMintPTokenArgs,
+    FWXPerpCoreMintPTokenEventData,
+    FWXPerpCoreOpenPositionArgs,
+    FWXPerpCoreOpenPositionEventData,
+    FWXPerpCoreSetAllowUnderlyingArgs,
+    FWXPerpCoreSetAllowUnderlyingEventData,
+    FWXPerpCoreSetBountyFeeRateToLiquidatorArgs,
+    FWXPerpCoreSetBountyFeeRateToLiquidatorEventData,
+    FWXPerpCoreSetBountyFeeRateToProtocolArgs,
+    FWXPerpCoreSetBountyFeeRateToProtocolEventData,
+    FWXPerpCoreSetFeeToProtocolRateArgs,
+    FWXPerpCoreSetFeeToProtocolRateEventData,
+    FWXPerpCoreSetLiquidatePnlRatioArgs,
+    FWXPerpCoreSetLiquidatePnlRatioEventData,
+    FWXPerpCoreSetLiquidityRatioArgs,
+    FWXPerpCoreSetLiquidityRatioEventData,
+    FWXPerpCoreSetMaintenanceMarginRatioArgs,
+    FWXPerpCoreSetMaintenanceMarginRatioEventData,
+    FWXPerpCoreSetMaxPnlsArgs,
+    FWXPerpCoreSetMaxPnlsEventData,
+    FWXPerpCoreSetMaximumOpenSizeArgs,
+    FWXPerpCoreSetMaximumOpenSizeEventData,
+    FWXPerpCoreSetMinimumMarginRatioArgs,
+    FWXPerpCoreSetMinimumMarginRatioEventData,
+    FWXPerpCoreSetMinimumOpenSizeArgs,
+    FWXPerpCoreSetMinimumOpenSizeEventData,
+    FWXPerpCoreSetOIConfigArgs,
+    FWXPerpCoreSetOIConfigEventData,
+    FWXPerpCoreSetPerpCloseTradingArgs,
+    FWXPerpCoreSetPerpCloseTradingEventData,
+    FWXPerpCoreSetPerpLendingArgs,
+    FWXPerpCoreSetPerpLendingEventData,
+    FWXPerpCoreSetPerpTradingArgs,
+    FWXPerpCoreSetPerpTradingEventData,
+    FWXPerpCoreSetPerpWalletTradingArgs,
+    FWXPerpCoreSetPerpWalletTradingEventData,
+    FWXPerpCoreSetPythIdArgs,
+    FWXPerpCoreSetPythIdEventData,
+    FWXPerpCoreSetStalePeriodArgs,
+    FWXPerpCoreSetStalePeriodEventData,
+    FWXPerpCoreSetTPSLArgs,
+    FWXPerpCoreSetTPSLEventData,
+    FWXPerpCoreSetTPSLExecutionFeeArgs,
+    FWXPerpCoreSetTPSLExecutionFeeEventData,
+    FWXPerpCoreSetTradingFeeArgs,
+    FWXPerpCoreSetTradingFeeEventData,
+    FWXPerpCoreTriggerTPSLArgs,
+    FWXPerpCoreTriggerTPSLEventData,
+    FWXPerpCoreUpdateGlobalStatArgs,
+    FWXPerpCoreUpdateGlobalStatEventData,
+    FWXPerpCoreUpdateWalletArgs,
+    FWXPerpCoreUpdateWalletEventData,
+    FWXPerpCoreWithdrawArgs,
+    FWXPerpCoreWithdrawEventData,
+    FWXPerpCoreWithdrawCollateralArgs,
+    FWXPerpCoreWithdrawCollateralEventData,
+)
+
+
+# Worker processes of a BackfillScanner import this module to decode logs, so web3 is only
+# imported for type checking and a worker starts without loading it.
+if TYPE_CHECKING:
+    from web3.types import FilterParams
+    from .AsyncW3 import AsyncWeb3HTTP
+    from .W3 import Web3HTTP
+
+# Event name -> (record class, args class) for every event of the FWXPerpCore ABI. The args fields follow the ABI input order.
+PERP_CORE_EVENT_RECORDS:dict[str, tuple[type[EventRecord], Callable[..., Any]]] = {
+    'ActivateRank': (FWXPerpCoreActivateRankEventData, FWXPerpCoreActivateRankArgs),
+    'BurnAtpToken': (FWXPerpCoreBurnAtpTokenEventData, FWXPerpCoreBurnAtpTokenArgs),
+    'BurnPToken': (FWXPerpCoreBurnPTokenEventData, FWXPerpCoreBurnPTokenArgs),
+    'ClaimTokenInterest': (FWXPerpCoreClaimTokenInterestEventData, FWXPerpCoreClaimTokenInterestArgs),
+    'ClosePosition': (FWXPerpCoreClosePositionEventData, FWXPerpCoreClosePositionArgs),
+    'CollectFees': (FWXPerpCoreCollectFeesEventData, FWXPerpCoreCollectFeesArgs),
+    'Deposit': (FWXPerpCoreDepositEventData, FWXPerpCoreDepositArgs),
+    'DepositCollateral': (FWXPerpCoreDepositCollateralEventData, FWXPerpCoreDepositCollateralArgs),
+    'LiquidatePosition': (FWXPerpCoreLiquidatePositionEventData, FWXPerpCoreLiquidatePositionArgs),
+    'MintAtpToken': (FWXPerpCoreMintAtpTokenEventData, FWXPerpCoreMintAtpTokenArgs),
+    'MintPToken': (FWXPerpCoreMintPTokenEventData, FWXPerpCoreMintPTokenArgs),
+    'OpenPosition': (FWXPerpCoreOpenPositionEventData, FWXPerpCoreOpenPositionArgs),
+    'SetAllowUnderlying': (FWXPerpCoreSetAllowUnderlyingEventData, FWXPerpCoreSetAllowUnderlyingArgs),
+    'SetBountyFeeRateToLiquidator': (FWXPerpCoreSetBountyFeeRateToLiquidatorEventData, FWXPerpCoreSetBountyFeeRateToLiquidatorArgs),
+    'SetBountyFeeRateToProtocol': (FWXPerpCoreSetBountyFeeRateToProtocolEventData, FWXPerpCoreSetBountyFeeRateToProtocolArgs),
+    'SetFeeToProtocolRate': (FWXPerpCoreSetFeeToProtocolRateEventData, FWXPerpCoreSetFeeToProtocolRateArgs),
+    'SetLiquidatePnlRatio': (FWXPerpCoreSetLiquidatePnlRatioEventData, FWXPerpCoreSetLiquidatePnlRatioArgs),
+    'SetLiquidityRatio': (FWXPerpCoreSetLiquidityRatioEventData, FWXPerpCoreSetLiquidityRatioArgs),
+    'SetMaintenanceMarginRatio': (FWXPerpCoreSetMaintenanceMarginRatioEventData, FWXPerpCoreSetMaintenanceMarginRatioArgs),
+    'SetMaxPnls': (FWXPerpCoreSetMaxPnlsEventData, FWXPerpCoreSetMaxPnlsArgs),
+    'SetMaximumOpenSize': (FWXPerpCoreSetMaximumOpenSizeEventData, FWXPerpCoreSetMaximumOpenSizeArgs),
+    'SetMinimumMarginRatio': (FWXPerpCoreSetMinimumMarginRatioEventData, FWXPerpCoreSetMinimumMarginRatioArgs),
+    'SetMinimumOpenSize': (FWXPerpCoreSetMinimumOpenSizeEventData, FWXPerpCoreSetMinimumOpenSizeArgs),
+    'SetOIConfig': (FWXPerpCoreSetOIConfigEventData, FWXPerpCoreSetOIConfigArgs),
+    'SetPerpCloseTrading': (FWXPerpCoreSetPerpCloseTradingEventData, FWXPerpCoreSetPerpCloseTradingArgs),
+    'SetPerpLending': (FWXPerpCoreSetPerpLendingEventData, FWXPerpCoreSetPerpLendingArgs),
+    'SetPerpTrading': (FWXPerpCoreSetPerpTradingEventData, FWXPerpCoreSetPerpTradingArgs),
+    'SetPerpWalletTrading': (FWXPerpCoreSetPerpWalletTradingEventData, FWXPerpCoreSetPerpWalletTradingArgs),
+    'SetPythId': (FWXPerpCoreSetPythIdEventData, FWXPerpCoreSetPythIdArgs),
+    'SetStalePeriod': (FWXPerpCoreSetStalePeriodEventData, FWXPerpCoreSetStalePeriodArgs),
+    'SetTPSL': (FWXPerpCoreSetTPSLEventData, FWXPerpCoreSetTPSLArgs),
+    'SetTPSLExecutionFee': (FWXPerpCoreSetTPSLExecutionFeeEventData, FWXPerpCoreSetTPSLExecutionFeeArgs),
+    'SetTradingFee': (FWXPerpCoreSetTradingFeeEventData, FWXPerpCoreSetTradingFeeArgs),
+    'TriggerTPSL': (FWXPerpCoreTriggerTPSLEventData, FWXPerpCoreTriggerTPSLArgs),
+    'UpdateGlobalStat': (FWXPerpCoreUpdateGlobalStatEventData, FWXPerpCoreUpdateGlobalStatArgs),
+    'UpdateWallet': (FWXPerpCoreUpdateWalletEventData, FWXPerpCoreUpdateWalletArgs),
+    'Withdraw': (FWXPerpCoreWithdrawEventData, FWXPerpCoreWithdrawArgs),
+    'WithdrawCollateral': (FWXPerpCoreWithdrawCollateralEventData, FWXPerpCoreWithdrawCollateralArgs),
+}
+
+def _to_bytes(value:Any) -> bytes:
+    
+    return bytes.fromhex(value[2:]) if isinstance(value, str) else bytes(value)
+
+def _to_hexbytes(value:Any) -> HexBytes:
+    # bytes.__new__ skips the input normalization of HexBytes(), which costs twice as much as the copy.
+    return bytes.__new__(HexBytes, _to_bytes(value))
+
+def _to_int(value:Any) -> int:
+    
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+def _decode_address(word:bytes) -> Any:
+    
+    return to_checksum_address('0x' + word[12:].hex())
+
+def _decode_uint(word:bytes) -> int:
+    
+    return int.from_bytes(word, 'big')
+
+def _decode_int(word:bytes) -> int:
+    
+    return int.from_bytes(word, 'big', signed=True)
+
+def _decode_bool(word:bytes) -> bool:
+    
+    return word[31] == 1
+
+def _word_decoder(abi_type:str) -> Optional[Callable[[bytes], Any]]:
+    """
+    Return the decoder of one 32 byte word for a static ABI type, or None when the type is dynamic.
+    """
+    if abi_type == 'address':
+        return _decode_address
+    if abi_type == 'bool':
+        return _decode_bool
+    if abi_type.startswith('uint') and abi_type[4:].isdigit():
+        return _decode_uint
+    if abi_type.startswith('int') and abi_type[3:].isdigit():
+        return _decode_int
+    if abi_type.startswith('bytes') and abi_type[5:].isdigit():
+        size = int(abi_type[5:])
+        return lambda word: word[:size]
+    return None
+
+def _encode_topic(value:Any) -> str:
+    """
+    Encode an indexed address, integer, bool or bytes32 value as a 0x topic.
+    """
+    if isinstance(value, str) and len(value) == 42:
+        return '0x' + '00' * 12 + value[2:].lower()
+    if isinstance(value, int):
+        return '0x' + value.to_bytes(32, 'big', signed=value < 0).hex()
+    return '0x' + bytes(value).ljust(32, b'\0').hex()
+
+def _abi_value_decoder(abi_type:str) -> Callable[[Any], Any]:
+    """
+    Return the conversion of a value decoded by eth_abi, which leaves addresses in lowercase.
+    """
+    if abi_type.endswith(']'):
+        item = _abi_value_decoder(abi_type[:abi_type.rindex('[')])
+        return lambda value: tuple(item(v) for v in value)
+    if abi_type == 'address':
+        return to_checksum_address
+    return lambda value: value
+
+class _EventSpec:
+    __slots__ = ('name', 'record', 'args', 'size', 'topic_names', 'topic_decoders', 'data_decoders', 'data_types', 'data_values', 'data_positions')
+    
+    def __init__(self, event_abi:dict[str,Any], record:type[EventRecord], args:Callable[..., Any]) -> None:
+        self.name = event_abi['name']
+        self.record = record
+        self.args = args
+        inputs = event_abi['inputs']
+        self.size = len(inputs)
+        self.topic_names = [arg['name'] for arg in inputs if arg['indexed']]
+        # Indexed dynamic values (string, bytes, arrays) only exist as their keccak hash in the topic.
+        self.topic_decoders = [(i, _word_decoder(arg['type']) or bytes) for i, arg in enumerate(inputs) if arg['indexed']]
+        data_inputs = [(i, arg['type']) for i, arg in enumerate(inputs) if not arg['indexed']]
+        self.data_positions = [i for i, _ in data_inputs]
+        decoders = [_word_decoder(abi_type) for _, abi_type in data_inputs]
+        if all(decoder is not None for decoder in decoders):
+            self.data_decoders:Optional[list[Callable[[bytes], Any]]] = decoders
+            self.data_types = None
+            self.data_values = None
+        else:
+            # Dynamic data cannot be read word by word; eth_abi decodes it instead.
+            self.data_decoders = None
+            self.data_types = [abi_type for _, abi_type in data_inputs]
+            self.data_values = [_abi_value_decoder(abi_type) for abi_type in self.data_types]
+    
+    def decode_args(self, topics:Sequence[Any], data:bytes) -> Any:
+        values:list[Any] = [None] * self.size
+        for (position, decoder), topic in zip(self.topic_decoders, topics[1:]):
+            values[position] = decoder(_to_bytes(topic))
+        if self.data_decoders is None:
+            for position, decoder, value in zip(self.data_positions, self.data_values, abi_decode(self.data_types, data)):
+                values[position] = decoder(value)
+        else:
+            for offset, (position, decoder) in enumerate(zip(self.data_positions, self.data_decoders)):
+                values[position] = decoder(data[offset*32:offset*32+32])
+        
+        return self.args(*values)
+
+class LogDecoder:
+    """
+    Decode raw logs straight into event records.
+    
+    The decoder keeps a table from topic0 to the layout of every registered event, so a log
+    is matched with one dict lookup and its topics and data words are converted directly into
+    the record, without building web3's AttributeDict EventData first. Logs may come straight
+    from eth_getLogs (hex strings) or from web3 (HexBytes and ints).
+    """
+    
+    def __init__(self,
+                 abi:Sequence[dict[str,Any]],
+                 records:Mapping[str, tuple[type[EventRecord], Callable[..., Any]]]) -> None:
+        self.events:dict[bytes, _EventSpec] = {}
+        for item in abi:
+            if item.get('type') == 'event' and item['name'] in records and not item.get('anonymous'):
+                record, args = records[item['name']]
+                self.events[event_abi_to_log_topic(item)] = _EventSpec(item, record, args)
+    
+    @property
+    def topics(self) -> list[str]:
+        """
+        The topic0 of every registered event as 0x hex, ready for a getLogs topics filter.
+        """
+        return ['0x' + topic.hex() for topic in self.events]
+    
+    def topic_of(self, name:str) -> str:
+        for topic, spec in self.events.items():
+            if spec.name == name:
+                return '0x' + topic.hex()
+        raise ValueError(f"Event {name} is not registered")
+    
+    def topic_filter(self,
+                     events:Optional[Sequence[str]]=None,
+                     **indexed_args:Any) -> list[Any]:
+        """
+        Build an eth_getLogs topics filter matching indexed arguments, so the node only returns matching logs.
+        
+        A topic filter is positional, so every selected event must index each filtered argument
+        at the same topic. Without events, the registered events that can be filtered that way are selected.
+        
+        Args:
+            events (Optional[Sequence[str]]): Event names to match.
+            **indexed_args: ABI argument names and values, e.g. nftId=12. None values are ignored.
+        Returns:
+            list[Any]: The topics filter, topic0 alternatives first.
+        Raises:
+            ValueError: If a selected event does not index a filtered argument, or indexes it at another topic.
+        """
+        indexed_args = {name: value for name, value in indexed_args.items() if value is not None}
+        specs = [spec for spec in self.events.values() if events is None or spec.name in events]
+        if events is not None:
+            missing = set(events) - {spec.name for spec in specs}
+            if missing:
+                raise ValueError(f"Events {sorted(missing)} are not registered")
+        positions:dict[str, int] = {}
+        for name in indexed_args:
+            for spec in specs:
+                if name in spec.topic_names:
+                    positions.setdefault(name, spec.topic_names.index(name) + 1)
+            if name not in positions:
+                raise ValueError(f"No selected event indexes {name}")
+        selected = [spec for spec in specs if all(name in spec.topic_names and spec.topic_names.index(name) + 1 == position for name, position in positions.items())]
+        if events is not None and len(selected) != len(specs):
+            rejected = sorted(spec.name for spec in specs if spec not in selected)
+            raise ValueError(f"Events {rejected} do not index {sorted(indexed_args)} at the same topic")
+        topics:list[Any] = [[self.topic_of(spec.name) for spec in selected]]
+        for name, position in sorted(positions.items(), key=lambda item: item[1]):
+            topics.extend([None] * (position - len(topics)))
+            topics.append(_encode_topic(indexed_args[name]))
+        return topics
+    
+    def decode(self, log:Mapping[str,Any]) -> Optional[EventRecord]:
+        """
+        Decode one log. Logs of unregistered events, and removed logs, return None.
+        """
+        topics = log['topics']
+        if not topics or log.get('removed'):
+            return None
+        spec = self.events.get(_to_bytes(topics[0]))
+        if spec is None:
+            return None
+        return spec.record(address=to_checksum_address(log['address']),
+                           block_hash=_to_hexbytes(log['blockHash']),
+                           block_number=_to_int(log['blockNumber']),
+                           log_index=_to_int(log['logIndex']),
+                           transaction_hash=_to_hexbytes(log['transactionHash']),
+                           transaction_index=_to_int(log['transactionIndex']),
+                           args=spec.decode_args(topics, _to_bytes(log['data'])))
+    
+    def decode_logs(self, logs:Iterable[Mapping[str,Any]]) -> list[EventRecord]:
+        """
+        Decode many logs, keeping their order and skipping those decode() returns None for.
+        """
+        decode = self.decode
+        return [record for record in map(decode, logs) if record is not None]
+
+@lru_cache(maxsize=None)
+def get_perp_core_log_decoder() -> LogDecoder:
+    
+    return LogDecoder(load_abi('FWX_PERP_CORE_ABI'), PERP_CORE_EVENT_RECORDS)
+
+class LogScannerBase:
+    """
+    Splits a block range into eth_getLogs chunks and adapts the chunk size to the node.
+    
+    A chunk the node refuses as too large (see RANGE_ERRORS) is split in two and retried, and
+    later chunks start at the smaller size. A chunk that comes back with fewer than
+    sparse_results logs doubles the size of the next ones, up to max_chunk_size. A chunk the
+    node rate limits (see RATE_LIMIT_ERRORS) is fetched again unchanged after an exponential
+    back-off, at most RATE_LIMIT_RETRIES times.
+    """
+    
+    # Range and result-size limits as worded by the common nodes and providers.
+    RANGE_ERRORS = ('query returned more than',              # geth, Infura, Alchemy
+                    'log response size exceeded',            # Alchemy
+                    'consider reducing your block range',    # Alchemy query timeout
+                    'exceed maximum block range',            # BSC, NodeReal
+                    'query exceeds max block range',         # reth
+                    'query exceeds max results',             # reth
+                    'requested too many blocks',             # Avalanche (coreth)
+                    'block range too large',
+                    'block range is too wide',               # Ankr
+                    'block range limit exceeded',            # Chainstack
+                    'eth_getlogs is limited to',             # QuickNode
+                    'eth_getlogs and eth_newfilter are limited to')
+    RATE_LIMIT_ERRORS = ('too many requests',                # HTTP 429
+                         'rate limit',
+                         'request rate exceeded',            # Infura
+                         'compute units per second')         # Alchemy
+    RATE_LIMIT_RETRIES = 5
+    RATE_LIMIT_BACKOFF = 1.0
+    
+    def __init__(self,
+                 filter_params:'FilterParams',
+                 decoder:Optional[LogDecoder]=None,
+                 chunk_size:int=2000,
+                 max_chunk_size:int=100_000,
+                 sparse_results:int=1000,
+                 max_workers:int=4) -> None:
+        self.filter_params = filter_params
+        self.decoder = decoder
+        self.chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.sparse_results = sparse_results
+        self.max_workers = max_workers
+    
+    @classmethod
+    def is_range_error(cls, error:Exception) -> bool:
+        message = str(error).lower()
+        return any(range_error in message for range_error in cls.RANGE_ERRORS)
+    
+    @classmethod
+    def is_rate_limit_error(cls, error:Exception) -> bool:
+        if cls.is_range_error(error):
+            return False
+        message = str(error).lower()
+        return any(rate_limit_error in message for rate_limit_error in cls.RATE_LIMIT_ERRORS)
+    
+    def retry_delay(self, attempt:int, error:Exception) -> float:
+        """
+        Seconds to wait before fetching a rate limited chunk again, doubling with every attempt.
+        Re-raises error once the chunk was retried RATE_LIMIT_RETRIES times.
+        """
+        if attempt >= self.RATE_LIMIT_RETRIES:
+            raise error
+        return self.RATE_LIMIT_BACKOFF * 2 ** attempt
+    
+    def chunk_filter(self, start:int, end:int) -> 'FilterParams':
+        
+        return {**self.filter_params, 'fromBlock': start, 'toBlock': end}
+    
+    def next_chunk(self, start:int, to_block:int) -> tuple[int, int]:
+        
+        return start, min(start + self.chunk_size - 1, to_block)
+    
+    def split_chunk(self, start:int, end:int, error:Exception) -> list[tuple[int, int]]:
+        if start == end or not self.is_range_error(error):
+            raise error
+        middle = (start + end) // 2
+        self.chunk_size = min(self.chunk_size, middle - start + 1)
+        return [(start, middle), (middle + 1, end)]
+    
+    def record_chunk(self, start:int, end:int, logs:Sequence[Any]) -> None:
+        if len(logs) < self.sparse_results and end - start + 1 >= self.chunk_size:
+            self.chunk_size = min(self.chunk_size * 2, self.max_chunk_size)
+    
+    def decode(self, logs:list[Any]) -> list[Any]:
+        
+        return logs if self.decoder is None else self.decoder.decode_logs(logs)
+
+class LogScanner(LogScannerBase):
+    """
+    Stream the logs of a block range through chunked eth_getLogs calls run on up to max_workers
+    threads. Chunks are yielded in block order whatever order they complete in, and the node
+    returns the logs of a chunk in (block_number, log_index) order.
+    """
+    
+    def __init__(self,
+                 web3_http:'Web3HTTP',
+                 filter_params:'FilterParams',
+                 decoder:Optional[LogDecoder]=None,
+                 chunk_size:int=2000,
+                 max_chunk_size:int=100_000,
+                 sparse_results:int=1000,
+                 max_workers:int=4) -> None:
+        super().__init__(filter_params, decoder, chunk_size, max_chunk_size, sparse_results, max_workers)
+        self.web3_http = web3_http
+    
+    def resolve_block(self, block:BlockIdentifier) -> int:
+        
+        if isinstance(block, int):
+            return block
+        return self.web3_http.w3.eth.block_number if block == 'latest' else self.web3_http.w3.eth.get_block(block)['number']
+    
+    def _get_raw_logs(self, filter_params:'FilterParams', delay:float) -> list[dict[str, Any]]:
+        if delay:
+            time.sleep(delay)
+        return self.web3_http.get_raw_logs(filter_params)
+    
+    def iter_chunks(self, from_block:BlockIdentifier, to_block:BlockIdentifier='latest') -> Iterator[tuple[int, int, list[dict[str, Any]]]]:
+        """
+        Yield (start, end, raw logs) for consecutive chunks covering from_block to to_block.
+        
+        Raises:
+            Web3RPCError: If a single block still fails, or the node fails with any other error.
+        """
+        start, to_block = self.resolve_block(from_block), self.resolve_block(to_block)
+        executor = ThreadPoolExecutor(self.max_workers)
+        pending:deque[tuple[int, int, int, Future[list[dict[str, Any]]]]] = deque()
+        
+        def submit(chunk_start:int, chunk_end:int, attempt:int=0, delay:float=0) -> tuple[int, int, int, Future[list[dict[str, Any]]]]:
+            
+            return chunk_start, chunk_end, attempt, executor.submit(self._get_raw_logs, self.chunk_filter(chunk_start, chunk_end), delay)
+        
+        try:
+            while pending or start <= to_block:
+                while len(pending) < self.max_workers and start <= to_block:
+                    chunk_start, chunk_end = self.next_chunk(start, to_block)
+                    pending.append(submit(chunk_start, chunk_end))
+                    start = chunk_end + 1
+                chunk_start, chunk_end, attempt, future = pending.popleft()
+                try:
+                    logs = future.result()
+                except Exception as error:
+                    if self.is_rate_limit_error(error):
+                        pending.appendleft(submit(chunk_start, chunk_end, attempt + 1, self.retry_delay(attempt, error)))
+                    else:
+                        pending.extendleft(reversed([submit(*chunk) for chunk in self.split_chunk(chunk_start, chunk_end, error)]))
+                    continue
+                self.record_chunk(chunk_start, chunk_end, logs)
+                yield chunk_start, chunk_end, logs
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def scan(self, from_block:BlockIdentifier, to_block:BlockIdentifier='latest') -> Iterator[Any]:
+        """
+        Yield the decoded records (or the raw logs without a decoder) of the range in chain order.
+        """
+        for _, _, logs in self.iter_chunks(from_block, to_block):
+            yield from self.decode(logs)
+
+def _decode_batch(decoder_factory:Callable[[], LogDecoder], logs:list[dict[str, Any]]) -> list[EventRecord]:
+    # Runs in the worker processes, each of which builds its decoder once through the cached factory.
+    return decoder_factory().decode_logs(logs)
+
+class BackfillScanner(LogScanner):
+    """
+    LogScanner for bulk backfills, decoding in a ProcessPoolExecutor.
+    
+    A feeder thread runs the chunked eth_getLogs fetches (on max_workers I/O threads) and
+    puts batches of batch_size raw logs on a queue bounded by max_pending. The batches are
+    decoded by up to processes worker processes, and the records are yielded in chain order.
+    At most max_pending batches are fetched ahead or in flight, which bounds memory when
+    decoding is slower than the node or the other way round.
+    
+    decoder_factory must be a module-level function (it is pickled to the workers), like
+    get_perp_core_log_decoder.
+    
+    The workers are started with forkserver where available (spawn elsewhere), not fork: the
+    pool starts while the feeder and I/O threads run, and a forked child could inherit a lock
+    one of them holds. Like any spawn-based pool, a script calling scan must therefore guard
+    its entry point with if __name__ == '__main__'. Pass mp_context to choose another start method.
+    """
+    
+    def __init__(self,
+                 web3_http:'Web3HTTP',
+                 filter_params:'FilterParams',
+                 decoder_factory:Callable[[], LogDecoder],
+                 chunk_size:int=2000,
+                 max_chunk_size:int=100_000,
+                 sparse_results:int=1000,
+                 max_workers:int=4,
+                 processes:Optional[int]=None,
+                 batch_size:int=2000,
+                 max_pending:Optional[int]=None,
+                 mp_context:Optional[Any]=None) -> None:
+        super().__init__(web3_http, filter_params, decoder_factory(), chunk_size, max_chunk_size, sparse_results, max_workers)
+        self.decoder_factory = decoder_factory
+        self.processes = processes
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        if mp_context is None:
+            mp_context = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+        self.mp_context = mp_context
+    
+    def _feed(self, from_block:BlockIdentifier, to_block:BlockIdentifier, batches:'queue.Queue[Any]', stop:threading.Event) -> None:
+        try:
+            for _, _, logs in self.iter_chunks(from_block, to_block):
+                for start in range(0, len(logs), self.batch_size):
+                    while not stop.is_set():
+                        try:
+                            batches.put(logs[start:start+self.batch_size], timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+                    if stop.is_set():
+                        return
+            batches.put(None)
+        except BaseException as error:
+            batches.put(error)
+    
+    def scan(self, from_block:BlockIdentifier, to_block:BlockIdentifier='latest') -> Iterator[EventRecord]:
+        """
+        Yield the decoded records of the range in chain order.
+        """
+        processes = self.processes or os.cpu_count() or 1
+        max_pending = self.max_pending or 2 * processes
+        executor = ProcessPoolExecutor(processes, mp_context=self.mp_context)
+        batches:'queue.Queue[Any]' = queue.Queue(max_pending)
+        stop = threading.Event()
+        feeder = threading.Thread(target=self._feed, args=(from_block, to_block, batches, stop), daemon=True)
+        feeder.start()
+        pending:deque[Future[list[EventRecord]]] = deque()
+        done = False
+        try:
+            while not done or pending:
+                # Keep the pool busy; only block on the queue when nothing is decoding.
+                while not done and len(pending) < max_pending:
+                    try:
+                        batch = batches.get(timeout=0.05 if pending else None)
+                    except queue.Empty:
+                        break
+                    if batch is None:
+                        done = True
+                    elif isinstance(batch, BaseException):
+                        raise batch
+                    else:
+                        pending.append(executor.submit(_decode_batch, self.decoder_factory, batch))
+                if pending and (done or len(pending) >= max_pending or pending[0].done()):
+                    yield from pending.popleft().result()
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+class AsyncLogScanner(LogScannerBase):
+    """
+    asyncio twin of LogScanner, running up to max_workers eth_getLogs requests concurrently.
+    """
+    
+    def __init__(self,
+                 web3_http:'AsyncWeb3HTTP',
+                 filter_params:'FilterParams',
+                 decoder:Optional[LogDecoder]=None,
+                 chunk_size:int=2000,
+                 max_chunk_size:int=100_000,
+                 sparse_results:int=1000,
+                 max_workers:int=4) -> None:
+        super().__init__(filter_params, decoder, chunk_size, max_chunk_size, sparse_results, max_workers)
+        self.web3_http = web3_http
+    
+    async def resolve_block(self, block:BlockIdentifier) -> int:
+        
+        if isinstance(block, int):
+            return block
+        return await self.web3_http.w3.eth.block_number if block == 'latest' else (await self.web3_http.w3.eth.get_block(block))['number']
+    
+    async def _get_raw_logs(self, filter_params:'FilterParams', delay:float) -> list[dict[str, Any]]:
+        if delay:
+            await asyncio.sleep(delay)
+        return await self.web3_http.get_raw_logs(filter_params)
+    
+    async def iter_chunks(self, from_block:BlockIdentifier, to_block:BlockIdentifier='latest') -> AsyncIterator[tuple[int, int, list[dict[str, Any]]]]:
+        start, to_block = await self.resolve_block(from_block), await self.resolve_block(to_block)
+        pending:deque[tuple[int, int, int, asyncio.Task[list[dict[str, Any]]]]] = deque()
+        
+        def submit(chunk_start:int, chunk_end:int, attempt:int=0, delay:float=0) -> tuple[int, int, int, asyncio.Task[list[dict[str, Any]]]]:
+            
+            return chunk_start, chunk_end, attempt, asyncio.ensure_future(self._get_raw_logs(self.chunk_filter(chunk_start, chunk_end), delay))
+        
+        try:
+            while pending or start <= to_block:
+                while len(pending) < self.max_workers and start <= to_block:
+                    chunk_start, chunk_end = self.next_chunk(start, to_block)
+                    pending.append(submit(chunk_start, chunk_end))
+                    start = chunk_end + 1
+                chunk_start, chunk_end, attempt, task = pending.popleft()
+                try:
+                    logs = await task
+                except Exception as error:
+                    if self.is_rate_limit_error(error):
+                        pending.appendleft(submit(chunk_start, chunk_end, attempt + 1, self.retry_delay(attempt, error)))
+                    else:
+                        pending.extendleft(reversed([submit(*chunk) for chunk in self.split_chunk(chunk_start, chunk_end, error)]))
+                    continue
+                self.record_chunk(chunk_start, chunk_end, logs)
+                yield chunk_start, chunk_end, logs
+        finally:
+            for _, _, _, task in pending:
+                task.cancel()
+    
+    async def scan(self, from_block:BlockIdentifier, to_block:BlockIdentifier='latest') -> AsyncIterator[Any]:
+        async for _, _, logs in self.iter_chunks(from_block, to_block):
+            for record in self.decode(logs):
+                yield record
@@ -0,0 +1,245 @@
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+from hexbytes import HexBytes
+
+from .Contract import (
+    FWXPerpCoreContract,
+)
+from .Events import (
+    LogScanner,
+    _to_int,
+)
+from .types import (
+    EventRecord,
+)
+
+if TYPE_CHECKING:
+    from web3.types import FilterParams
+
+logger = logging.getLogger(__name__)
+
+class Checkpoint(NamedTuple):
+    block_number: int
+    block_hash: str
+    # (block_number, block_hash) of the previous checkpoints, oldest first, used to find where a reorg forked.
+    history: tuple[tuple[int, str], ...] = ()
+    
+    def to_json(self) -> dict[str, Any]:
+        
+        return {'block_number': self.block_number, 'block_hash': self.block_hash, 'history': [list(item) for item in self.history]}
+    
+    @classmethod
+    def from_json(cls, data:dict[str, Any]) -> 'Checkpoint':
+        
+        return cls(int(data['block_number']), data['block_hash'], tuple((int(number), block_hash) for number, block_hash in data.get('history', ())))
+
+class EventSink(ABC):
+    """
+    Destination of the records of an EventIndexer.
+    
+    append receives the records of each chunk in chain order. rollback must drop every record
+    above block_number, which is how the indexer undoes a reorg or a chunk that was stored
+    before a crash but never checkpointed.
+    """
+    
+    @abstractmethod
+    def append(self, records:Sequence[EventRecord]) -> None:
+        pass
+    
+    @abstractmethod
+    def rollback(self, block_number:int) -> None:
+        pass
+
+class MemoryEventSink(EventSink):
+    
+    def __init__(self) -> None:
+        self.records:list[EventRecord] = []
+    
+    def append(self, records:Sequence[EventRecord]) -> None:
+        
+        self.records.extend(records)
+    
+    def rollback(self, block_number:int) -> None:
+        while self.records and self.records[-1].block_number > block_number:
+            self.records.pop()
+
+class _PinnedLogScanner(LogScanner):
+    # Reads the hash of a chunk's last block right before its eth_getLogs, so the indexer can
+    # check afterwards that the chain did not move under the logs.
+    
+    def __init__(self, *args:Any, **kwargs:Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.block_hashes:dict[int, Optional[HexBytes]] = {}
+    
+    def _get_raw_logs(self, filter_params:'FilterParams', delay:float) -> list[dict[str, Any]]:
+        if delay:
+            time.sleep(delay)
+        to_block = int(filter_params['toBlock'])
+        block = self.web3_http.get_blocks([to_block])[0]
+        logs = self.web3_http.get_raw_logs(filter_params)
+        self.block_hashes[to_block] = None if block is None else HexBytes(block['hash'])
+        return logs
+
+class EventIndexer:
+    """
+    Incremental, resumable indexer of the FWXPerpCore events.
+    
+    Each sync scans from the block after the checkpoint up to the head (minus confirmations)
+    with a LogScanner, hands the records of every chunk to the sink, then saves the chunk's last
+    block number and hash to checkpoint_path. A restart resumes from that checkpoint instead of
+    re-scanning from start_block.
+    
+    Before scanning, the checkpoint hash is compared with the chain. If it no longer matches,
+    the block was reorged out: the indexer walks back through the hashes of the previous
+    checkpoints to the newest one still on chain, rolls the sink back to it and re-ingests
+    from there.
+    
+    A reorg during the scan is caught per chunk. The hash of the chunk's last block is read
+    before its eth_getLogs and again after it, together with the blocks of its logs. The chunk
+    is stored and checkpointed only if that hash did not change and every log's blockHash
+    matches the chain. Otherwise sync stops at the previous checkpoint, and the next sync
+    resolves the reorg.
+    """
+    
+    def __init__(self,
+                 contract:FWXPerpCoreContract,
+                 sink:EventSink,
+                 checkpoint_path:str,
+                 start_block:int=0,
+                 events:Optional[Sequence[str]]=None,
+                 confirmations:int=0,
+                 chunk_size:int=2000,
+                 max_workers:int=4,
+                 max_history:int=128) -> None:
+        self.contract = contract
+        self.sink = sink
+        self.checkpoint_path = checkpoint_path
+        self.start_block = start_block
+        self.events = events
+        self.confirmations = confirmations
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.max_history = max_history
+        self.checkpoint = self.load_checkpoint()
+        self._stop = threading.Event()
+    
+    def load_checkpoint(self) -> Optional[Checkpoint]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            return Checkpoint.from_json(json.load(f))
+    
+    def save_checkpoint(self, checkpoint:Optional[Checkpoint]) -> None:
+        self.checkpoint = checkpoint
+        if checkpoint is None:
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+            return
+        # Write then rename, so a crash never leaves a truncated checkpoint behind.
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint.to_json(), f)
+        os.replace(tmp_path, self.checkpoint_path)
+    
+    def advance(self, block_number:int, block_hash:str) -> Checkpoint:
+        history = () if self.checkpoint is None else self.checkpoint.history + ((self.checkpoint.block_number, self.checkpoint.block_hash),)
+        checkpoint = Checkpoint(block_number, block_hash, history[-self.max_history:])
+        self.save_checkpoint(checkpoint)
+        return checkpoint
+    
+    def find_fork_point(self, checkpoint:Checkpoint) -> Optional[Checkpoint]:
+        """
+        Return the newest of the previous checkpoints whose block hash is still on chain,
+        or None if they were all reorged out.
+        """
+        history = checkpoint.history
+        blocks = self.contract.get_blocks([number for number, _ in history])
+        for i in range(len(history) - 1, -1, -1):
+            block = blocks[i]
+            if block is not None and block['hash'].to_0x_hex() == history[i][1]:
+                return Checkpoint(history[i][0], history[i][1], history[:i])
+        return None
+    
+    def check_reorg(self) -> bool:
+        """
+        Roll back to the fork point if the checkpoint block is no longer on chain. Returns True after a rollback.
+        """
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            return False
+        block = self.contract.get_blocks([checkpoint.block_number])[0]
+        if block is not None and block['hash'].to_0x_hex() == checkpoint.block_hash:
+            return False
+        fork = self.find_fork_point(checkpoint)
+        logger.warning('Reorg detected at block %d, rolling back to %d', checkpoint.block_number, self.start_block - 1 if fork is None else fork.block_number)
+        self.sink.rollback(self.start_block - 1 if fork is None else fork.block_number)
+        self.save_checkpoint(fork)
+        return True
+    
+    def is_on_chain(self, chunk_end:int, block_hash:Optional[HexBytes], logs:Sequence[dict[str, Any]]) -> bool:
+        """
+        Check that chunk_end still has the hash read before the chunk's logs, and that every log's blockHash is on chain.
+        """
+        numbers = sorted({_to_int(log['blockNumber']) for log in logs} | {chunk_end})
+        hashes = {number: None if block is None else HexBytes(block['hash']) for number, block in zip(numbers, self.contract.get_blocks(numbers))}
+        if block_hash is None or hashes[chunk_end] != block_hash:
+            return False
+        return all(HexBytes(log['blockHash']) == hashes[_to_int(log['blockNumber'])] for log in logs)
+    
+    def sync(self, to_block:Optional[int]=None) -> int:
+        """
+        Index every event between the checkpoint and to_block, by default the head minus confirmations.
+        Stops early, at the last checkpoint, if the chain reorganized under a chunk.
+        Returns the number of new records.
+        """
+        self.check_reorg()
+        start = self.start_block if self.checkpoint is None else self.checkpoint.block_number + 1
+        # Records above the checkpoint were stored before a crash but never checkpointed.
+        self.sink.rollback(start - 1)
+        head = self.contract.w3.eth.block_number - self.confirmations if to_block is None else to_block
+        if start > head:
+            return 0
+        scanner = _PinnedLogScanner(self.contract,
+                                    self.contract.event_log_filter(start, head, self.events),
+                                    self.contract.log_decoder,
+                                    chunk_size=self.chunk_size,
+                                    max_workers=self.max_workers)
+        count = 0
+        for chunk_start, chunk_end, logs in scanner.iter_chunks(start, head):
+            block_hash = scanner.block_hashes.pop(chunk_end)
+            if not self.is_on_chain(chunk_end, block_hash, logs):
+                logger.warning('Chain changed while blocks %d-%d were fetched, stopping at block %d', chunk_start, chunk_end, chunk_start - 1)
+                break
+            records = scanner.decode(logs)
+            if records:
+                self.sink.append(records)
+                count += len(records)
+            self.advance(chunk_end, block_hash.to_0x_hex())
+        return count
+    
+    def run(self, poll_interval:float=2.0) -> None:
+        """
+        Keep the sink in sync with the chain until stop() is called.
+        """
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception:
+                logger.exception('Indexer sync failed')
+            self._stop.wait(poll_interval)
+    
+    def stop(self) -> None:
+        
+        self._stop.set()
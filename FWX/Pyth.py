@@ -0,0 +1,548 @@
+import json
+import logging
+import socket
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from .Constant import (
+    FWX_HERMES_URL,
+    PYTH_HERMES_LATEST_URL,
+    PYTH_HERMES_STREAM_URL,
+    PYTH_ID,
+)
+from .types import (
+    HermesPrice,
+    HermesResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+# Optional fast JSON decoders: msgspec decodes and validates against the HermesResponse schema,
+# orjson only decodes, and the stdlib json module is the fallback. All three return the same
+# payload shape. Benchmark them with benchmarks/hermes_decode.py.
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    
+if msgspec is not None:
+    _HERMES_DECODER = msgspec.json.Decoder(HermesResponse, strict=False)
+    
+    def decode_hermes_response(data:bytes|str) -> HermesResponse:
+        
+        return _HERMES_DECODER.decode(data)
+    
+elif orjson is not None:
+    def decode_hermes_response(data:bytes|str) -> HermesResponse:
+        
+        return orjson.loads(data)
+    
+else:
+    def decode_hermes_response(data:bytes|str) -> HermesResponse:
+        
+        return json.loads(data)
+
+def _price_tuple(price:HermesPrice) -> tuple[int,...]:
+    
+    return (int(price['price']), int(price['conf']), int(price['expo']), int(price['publish_time']))
+
+ACCUMULATOR_MAGIC = b'PNAU'
+
+class AccumulatorUpdate(NamedTuple):
+    """
+    A Pyth accumulator ('PNAU') update split into its shared header and its per-feed updates.
+    
+    The header (magic, version, trailing header, update type and the Wormhole VAA carrying the
+    Merkle root) is shared, and every feed update carries its own Merkle proof. Any subset of
+    the updates re-encoded behind the same header is therefore still a valid update.
+    """
+    header:bytes
+    updates:tuple[tuple[bytes,bytes],...]
+    
+    @classmethod
+    def decode(cls, data:bytes) -> 'AccumulatorUpdate':
+        if data[:4] != ACCUMULATOR_MAGIC:
+            raise ValueError('Not a Pyth accumulator update')
+        offset = 6 + 1 + data[6]
+        if data[offset] != 0:
+            raise ValueError('Unsupported Pyth accumulator update type')
+        offset += 1
+        offset += 2 + int.from_bytes(data[offset:offset+2], 'big')
+        header = data[:offset]
+        
+        updates:list[tuple[bytes,bytes]] = []
+        count = data[offset]
+        offset += 1
+        for _ in range(count):
+            start = offset
+            message_size = int.from_bytes(data[offset:offset+2], 'big')
+            # The message starts with its type byte followed by the 32 byte feed ID.
+            feed_id = data[offset+3:offset+35]
+            offset += 2 + message_size
+            offset += 1 + 20 * data[offset]
+            updates.append((feed_id, data[start:offset]))
+        if offset != len(data):
+            raise ValueError('Malformed Pyth accumulator update')
+        
+        return cls(header, tuple(updates))
+    
+    def encode(self) -> bytes:
+        
+        return self.header + bytes([len(self.updates)]) + b''.join(update for _, update in self.updates)
+    
+    def select(self, feed_ids:set[bytes]) -> 'AccumulatorUpdate':
+        
+        return AccumulatorUpdate(self.header, tuple(update for update in self.updates if update[0] in feed_ids))
+
+def count_price_updates(update_data:Sequence[bytes]) -> int:
+    """
+    Count the price updates Pyth charges for: every feed update of an accumulator blob, or one per legacy VAA.
+    """
+    count = 0
+    for data in update_data:
+        count += len(AccumulatorUpdate.decode(data).updates) if data[:4] == ACCUMULATOR_MAGIC else 1
+    return count
+
+class PythPrice(NamedTuple):
+    id:str
+    id_bytes:bytes
+    price:tuple[int,...]
+    ema_price:tuple[int,...]
+    
+    @property
+    def value(self) -> float:
+        
+        return int(self.price[0])*10**self.price[2]
+
+class PythSnapshot(NamedTuple):
+    """
+    Immutable, parsed view of one Hermes payload, built once per fetch.
+    
+    The price data and update bytes the contracts expect are decoded here once, so the same
+    snapshot can be reused for the balance, max contract size and open/close calls without
+    parsing the payload again. Feed IDs are indexed lower case without 0x.
+    
+    Attributes:
+        raw (Mapping[str, Any]): The payload the snapshot was built from.
+        prices (Mapping[str, PythPrice]): Feed ID to parsed price.
+        pyth_data (tuple): The (id, price, ema_price) entries passed as pyth_data.
+        update_data (tuple[bytes, ...]): The update blobs passed as pyth_update_data.
+        value (int): The legacy len()-based estimate of the update fee. The clients pay the
+            fee from PythContract.get_update_fee instead.
+    """
+    raw:Mapping[str,Any]
+    prices:Mapping[str,PythPrice]
+    pyth_data:tuple[tuple[bytes,tuple[int,...],tuple[int,...]],...]
+    update_data:tuple[bytes,...]
+    value:int
+    
+    @classmethod
+    def from_raw(cls, raw_pyth_data:'dict[str,Any]|PythSnapshot') -> 'PythSnapshot':
+        if isinstance(raw_pyth_data, PythSnapshot):
+            return raw_pyth_data
+        
+        prices:dict[str,PythPrice] = {}
+        for entry in raw_pyth_data['parsed']:
+            id = entry['id'].lower().removeprefix('0x')
+            prices[id] = PythPrice(id,
+                                   bytes.fromhex(id),
+                                   _price_tuple(entry['price']),
+                                   _price_tuple(entry['ema_price']))
+        binary = raw_pyth_data['binary']
+        update_data = tuple(bytes.fromhex(data) for data in binary['data']) if binary else ()
+        
+        return cls(raw_pyth_data,
+                   MappingProxyType(prices),
+                   tuple((price.id_bytes, price.price, price.ema_price) for price in prices.values()),
+                   update_data,
+                   len(raw_pyth_data['parsed']) + len(binary))
+    
+    def get_price(self, id:str) -> PythPrice|None:
+        
+        return self.prices.get(id.lower().removeprefix('0x'))
+    
+    def select(self, ids:Iterable[str]) -> 'PythSnapshot':
+        """
+        Return a snapshot restricted to the given feed IDs, for a call that only involves those underlyings.
+        Accumulator update blobs are cut down to the selected feeds, so the calldata shrinks as well.
+        
+        Raises:
+            ValueError: If a feed ID is not in the snapshot.
+        """
+        selected:dict[str,PythPrice] = {}
+        for id in ids:
+            price = self.get_price(id)
+            if price is None:
+                raise ValueError(f'Pyth ID {id} not found')
+            selected[price.id] = price
+            
+        feed_ids = {price.id_bytes for price in selected.values()}
+        update_data:list[bytes] = []
+        for data in self.update_data:
+            if data[:4] != ACCUMULATOR_MAGIC:
+                update_data.append(data)
+                continue
+            update = AccumulatorUpdate.decode(data).select(feed_ids)
+            if update.updates:
+                update_data.append(update.encode())
+                
+        raw = {'parsed':[entry for entry in self.raw['parsed'] if entry['id'].lower().removeprefix('0x') in selected],
+               'binary':{'encoding':'hex',
+                         'data':[data.hex() for data in update_data]}}
+        
+        return PythSnapshot(raw,
+                            MappingProxyType(selected),
+                            tuple((price.id_bytes, price.price, price.ema_price) for price in selected.values()),
+                            tuple(update_data),
+                            len(raw['parsed']) + len(raw['binary']))
+
+class PythPriceCache:
+    """
+    Cache of the FWX Hermes price payload shared by every client method that needs prices.
+    
+    A payload younger than max_age seconds is returned as is. When it is older, the first
+    caller fetches a new one over a keep-alive session while concurrent callers wait for that
+    same request instead of sending their own (single-flight), so a burst of reads costs one
+    Hermes request.
+    
+    By default every FWX perp feed is fetched from the FWX endpoint. Given ids, only those feeds
+    are requested as ids[] parameters, which shrinks both the download and the update data sent
+    on-chain. The FWX endpoint serves a fixed set of feeds, so ids also requires an explicit url
+    that accepts ids[], such as Pyth's public Hermes endpoint.
+    
+    Example:
+        eth_prices = PythPriceCache(PYTH_HERMES_LATEST_URL, ids=[PYTH_ID['ETH']])
+    
+    Attributes:
+        url (str): The Hermes endpoint returning the 'parsed' and 'binary' price data.
+        ids (list[str] | None): The feed IDs to request, None for the endpoint's default set.
+        max_age (float): How long, in seconds, a fetched payload is served from the cache.
+        timeout (float): The HTTP timeout of a fetch, in seconds.
+    """
+    
+    def __init__(self,
+                 url:Optional[str]=None,
+                 max_age:float=1.0,
+                 timeout:float=10.0,
+                 session:Optional[requests.Session]=None,
+                 ids:Optional[Sequence[str]]=None) -> None:
+        if url is None:
+            if ids is not None:
+                raise ValueError(f"Selecting ids needs a Hermes url that accepts ids[], e.g. PYTH_HERMES_LATEST_URL ({PYTH_HERMES_LATEST_URL})")
+            url = FWX_HERMES_URL
+        self.ids = None if ids is None else [id.lower().removeprefix('0x') for id in ids]
+        self.url = url
+        self.max_age = max_age
+        self.timeout = timeout
+        self._session = session
+        self._session_lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._entry:tuple[dict[str,Any], float]|None = None
+        self._snapshot:PythSnapshot|None = None
+    
+    @property
+    def session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_maxsize=4))
+                self._session = session
+            return self._session
+    
+    def fetch(self) -> dict[str,Any]:
+        """
+        Fetch a new payload from Hermes, bypassing the cache.
+        """
+        params = None
+        if self.ids is not None:
+            params = [('ids[]', id) for id in self.ids] + [('encoding', 'hex'), ('parsed', 'true')]
+        response = self.session.get(self.url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        
+        return decode_hermes_response(response.content)
+    
+    def _cached(self, max_age:float) -> dict[str,Any]|None:
+        entry = self._entry
+        if entry is not None and time.monotonic() - entry[1] <= max_age:
+            return entry[0]
+        return None
+    
+    def get(self, max_age:Optional[float]=None) -> dict[str,Any]:
+        """
+        Return a payload at most max_age seconds old (defaults to self.max_age), fetching it if needed.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        data = self._cached(max_age)
+        if data is not None:
+            return data
+        
+        with self._fetch_lock:
+            data = self._cached(max_age)
+            if data is not None:
+                return data
+            data = self.fetch()
+            self._entry = (data, time.monotonic())
+        
+        return data
+    
+    def get_snapshot(self, max_age:Optional[float]=None) -> PythSnapshot:
+        """
+        Return get(max_age) as a PythSnapshot, parsed once per fetched payload.
+        """
+        data = self.get(max_age)
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.raw is not data:
+            snapshot = PythSnapshot.from_raw(data)
+            self._snapshot = snapshot
+        return snapshot
+    
+    def invalidate(self) -> None:
+        self._entry = None
+    
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+SHARED_PYTH_CACHE = PythPriceCache()
+
+class PythPriceStream:
+    """
+    Subscriber to a Hermes server-sent-events price stream.
+    
+    A background thread holds one long lived streaming connection, keeps the latest price
+    of every feed in memory and reconnects when the connection drops. Prices can be read
+    through callbacks, get_price, or snapshot(), which returns a payload shaped like the
+    FWX Hermes response and so works with create_pyth_data and create_pyth_update_data.
+    get() and get_snapshot() serve the same payload as a PythPriceCache, so a stream can be
+    passed wherever a cache is expected. They check that every feed was updated within max_age
+    seconds: before the stream is ready, or once it stopped delivering, they fetch from the
+    fallback cache if one is set and raise otherwise, instead of serving stale or missing prices.
+    
+    Example:
+        with PythPriceStream() as stream:
+            stream.wait_ready()
+            balance = FWXPerpClient(provider, private_key, pyth_cache=stream).get_perp_balance()
+    
+    Attributes:
+        ids (list[str]): The Pyth feed IDs to subscribe to, hex without 0x.
+        url (str): The Hermes stream endpoint.
+        max_age (float): Default age, in seconds, past which a feed's latest update counts as stale.
+        fallback (PythPriceCache | None): HTTP cache used while the stream is not fresh, e.g. SHARED_PYTH_CACHE.
+    """
+    
+    def __init__(self,
+                 ids:Optional[Sequence[str]]=None,
+                 url:str=PYTH_HERMES_STREAM_URL,
+                 session:Optional[requests.Session]=None,
+                 reconnect_delay:float=1.0,
+                 read_timeout:float=30.0,
+                 max_age:float=5.0,
+                 fallback:Optional['PythPriceCache']=None) -> None:
+        self.ids = [id.lower().removeprefix('0x') for id in (PYTH_ID.values() if ids is None else ids)]
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.read_timeout = read_timeout
+        self.max_age = max_age
+        self.fallback = fallback
+        self.session = requests.Session() if session is None else session
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._prices:dict[str, dict[str,Any]] = {}
+        self._updated_at:dict[str, float] = {}
+        self._blobs:dict[str, tuple[str,...]] = {}
+        self._snapshot:dict[str,Any]|None = None
+        self._pyth_snapshot:PythSnapshot|None = None
+        self._callbacks:list[Callable[[dict[str,Any]], None]] = []
+        self._thread:threading.Thread|None = None
+        self._response:requests.Response|None = None
+        self._stopped = threading.Event()
+        
+    def __enter__(self) -> 'PythPriceStream':
+        self.start()
+        return self
+    
+    def __exit__(self, *args:Any) -> None:
+        self.stop()
+        
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='FWXPythPriceStream', daemon=True)
+        self._thread.start()
+        
+    def stop(self, timeout:Optional[float]=5.0) -> None:
+        self._stopped.set()
+        response = self._response
+        if response is not None:
+            self._shutdown(response)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            
+    @staticmethod
+    def _shutdown(response:requests.Response) -> None:
+        # response.close() waits for the lock held by the stream thread's blocked read.
+        # Shutting the socket down instead wakes that read, and the thread closes the response.
+        try:
+            sock = response.raw._fp.fp.raw._sock
+            socket.socket.shutdown(sock, socket.SHUT_RDWR)
+        except (AttributeError, OSError):
+            pass
+            
+    def wait_ready(self, timeout:Optional[float]=None) -> bool:
+        """
+        Block until every subscribed feed received a price, or until timeout seconds passed.
+        """
+        return self._ready.wait(timeout)
+    
+    def subscribe(self, callback:Callable[[dict[str,Any]], None]) -> None:
+        """
+        Call callback(parsed_price) from the stream thread for every price update received.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+            
+    def unsubscribe(self, callback:Callable[[dict[str,Any]], None]) -> None:
+        with self._lock:
+            self._callbacks.remove(callback)
+            
+    def get_price(self, id:str) -> dict[str,Any]|None:
+        
+        return self._prices.get(id.lower().removeprefix('0x'))
+    
+    def stale_ids(self, max_age:Optional[float]=None) -> list[str]:
+        """
+        Return the feeds without an update in the last max_age seconds (default self.max_age), including those never received.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        now = time.monotonic()
+        with self._lock:
+            return [id for id in self.ids if id not in self._updated_at or now - self._updated_at[id] > max_age]
+        
+    def snapshot(self) -> dict[str,Any]:
+        """
+        Return the latest prices as {'parsed': [...], 'binary': {'encoding': 'hex', 'data': [...]}}.
+        The payload is rebuilt only after an update arrived, and must not be mutated.
+        Unlike get(), it does not check how old the prices are.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                parsed = [self._prices[id] for id in self.ids if id in self._prices]
+                blobs = list(dict.fromkeys(blob for id in self.ids for blob in self._blobs.get(id, ())))
+                self._snapshot = {'parsed':parsed,
+                                  'binary':{'encoding':'hex',
+                                            'data':blobs}}
+            return self._snapshot
+        
+    def _check_fresh(self, max_age:Optional[float]) -> bool:
+        # True when the stream can serve the request, False when the fallback should.
+        stale = self.stale_ids(max_age)
+        if not stale:
+            return True
+        if self.fallback is not None:
+            return False
+        raise ValueError(f"Pyth price stream has no update younger than {self.max_age if max_age is None else max_age}s for {stale}")
+    
+    def get(self, max_age:Optional[float]=None) -> dict[str,Any]:
+        """
+        Return snapshot() if every feed is fresh, else the fallback's payload.
+        
+        Raises:
+            ValueError: If a feed is stale or missing and there is no fallback.
+        """
+        if not self._check_fresh(max_age):
+            return self.fallback.get(max_age)
+        
+        return self.snapshot()
+    
+    def get_snapshot(self, max_age:Optional[float]=None) -> PythSnapshot:
+        if not self._check_fresh(max_age):
+            return self.fallback.get_snapshot(max_age)
+        data = self.snapshot()
+        snapshot = self._pyth_snapshot
+        if snapshot is None or snapshot.raw is not data:
+            snapshot = PythSnapshot.from_raw(data)
+            self._pyth_snapshot = snapshot
+        return snapshot
+    
+    def _run(self) -> None:
+        params = [('ids[]', id) for id in self.ids] + [('encoding', 'hex'), ('parsed', 'true')]
+        while not self._stopped.is_set():
+            try:
+                with self.session.get(self.url,
+                                      params=params,
+                                      stream=True,
+                                      timeout=(10, self.read_timeout)) as response:
+                    self._response = response
+                    response.raise_for_status()
+                    for line in self._iter_lines(response):
+                        if self._stopped.is_set():
+                            break
+                        if line.startswith(b'data:'):
+                            self._handle_update(decode_hermes_response(line[5:]))
+            except Exception as e:
+                if not self._stopped.is_set():
+                    logger.warning('Pyth price stream disconnected: %s', e)
+            finally:
+                self._response = None
+            self._stopped.wait(self.reconnect_delay)
+            
+    @staticmethod
+    def _iter_lines(response:requests.Response) -> Iterator[bytes]:
+        # iter_lines() waits for a full 512 byte chunk, holding back short events.
+        # read1 returns whatever already arrived, so every line is yielded as soon as it ends.
+        read1 = getattr(response.raw, 'read1', None)
+        if read1 is None:
+            yield from response.iter_lines(chunk_size=None)
+            return
+        pending = b''
+        while True:
+            data = read1(65536)
+            if not data:
+                break
+            lines = (pending + data).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line.rstrip(b'\r')
+            
+    def _handle_update(self, update:dict[str,Any]) -> None:
+        blobs = tuple(update.get('binary', {}).get('data', []))
+        parsed = update.get('parsed', [])
+        with self._lock:
+            now = time.monotonic()
+            for price in parsed:
+                id = price['id'].lower().removeprefix('0x')
+                self._prices[id] = price
+                self._updated_at[id] = now
+                if blobs:
+                    self._blobs[id] = blobs
+            self._snapshot = None
+            callbacks = list(self._callbacks)
+            if all(id in self._prices for id in self.ids):
+                self._ready.set()
+                
+        for callback in callbacks:
+            for price in parsed:
+                try:
+                    callback(price)
+                except Exception:
+                    logger.exception('Pyth price callback failed')
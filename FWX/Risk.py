@@ -0,0 +1,279 @@
+from typing import (
+    Any,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+from eth_typing import (
+    ChecksumAddress,
+)
+
+from .Pyth import (
+    PythSnapshot,
+)
+from .types import (
+    AddressLike,
+    FWXPerpCoreGetPositionRespond,
+    FWXPerpHelperGetAllPositionRespond,
+    PortfolioMetrics,
+)
+from .W3 import (
+    to_checksum_address,
+)
+
+# Optional: with NumPy the columns are object arrays and a pass is a handful of array operations,
+# without it every position goes through the same formulas in a Python loop.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WAD = 10**18
+
+METRIC_FIELDS = ('pnl', 'roe', 'margin', 'liquidation_price')
+
+def _div(a:Any, b:Any) -> Any:
+    # Solidity division truncates toward zero where // rounds down. b is always positive here.
+    q = a // b
+    return q + ((q < 0) & (q * b != a))
+
+def _clamp0(a:Any) -> Any:
+    
+    return a * (a > 0)
+
+def _metrics(direction:Any, entry_price:Any, contract_size:Any, collateral:Any, maintenance_margin_ratio:Any, price:Any) -> tuple[Any, ...]:
+    # Written once for Python ints and for object arrays, so both paths round the same way.
+    pnl = _div(direction * (price - entry_price) * contract_size, WAD)
+    roe = _div(pnl * WAD, collateral)
+    margin = collateral + pnl
+    # Price at which margin falls to maintenance_margin_ratio of the position's notional.
+    liquidation_price = _clamp0(_div(_div(entry_price * contract_size - direction * collateral * WAD, contract_size) * WAD,
+                                     WAD - direction * maintenance_margin_ratio))
+    liquidation_distance = _div(direction * (price - liquidation_price) * WAD, price)
+    return pnl, roe, margin, liquidation_price, liquidation_distance
+
+def _column(values:Sequence[int]) -> Any:
+    # dtype=object keeps Python ints: WAD products overflow int64 and float64 loses the low digits.
+    if np is None:
+        return list(values)
+    return np.array(values, dtype=object)
+
+def pyth_price_to_wad(price:Sequence[int]) -> int:
+    """
+    Convert a Pyth (price, conf, expo, publish_time) tuple to a WAD scaled integer.
+    """
+    shift = 18 + int(price[2])
+    if shift >= 0:
+        return int(price[0]) * 10**shift
+    return _div(int(price[0]), 10**-shift)
+
+class PositionBook:
+    """
+    Local, vectorized risk engine over a fixed set of positions.
+    
+    The position state is loaded once into columns and every compute() recomputes pnl, roe,
+    margin, liquidation price and liquidation distance for all positions in one pass from a
+    price tick, instead of an FWXPerpHelper.getAllActivePositions eth_call per poll.
+    
+    All values are WAD (1e18) fixed point and every division truncates toward zero like
+    Solidity. With NumPy the columns are object arrays of Python ints, so the products never
+    overflow; without it the same formulas run per position.
+    
+    The formulas are a model of the helper's and cover price pnl only: trading, funding and
+    interest fees settled by the core contract are not modeled. Results are estimates until
+    validate() has matched them against getAllActivePositions output for the positions in use;
+    tests/test_risk.py does so for recorded helper rows.
+    """
+    
+    def __init__(self,
+                 pos_ids:Sequence[int],
+                 is_long:Sequence[bool],
+                 underlyings:Sequence[AddressLike],
+                 entry_prices:Sequence[int],
+                 contract_sizes:Sequence[int],
+                 collaterals:Sequence[int],
+                 maintenance_margin_ratios:Mapping[AddressLike,int],
+                 pyth_ids:Optional[Mapping[AddressLike,str]]=None) -> None:
+        """
+        Args:
+            pos_ids (Sequence[int]): Position IDs.
+            is_long (Sequence[bool]): Direction of each position.
+            underlyings (Sequence[AddressLike]): Underlying token of each position.
+            entry_prices (Sequence[int]): Entry prices, WAD.
+            contract_sizes (Sequence[int]): Contract sizes, WAD.
+            collaterals (Sequence[int]): Collateral of each position as the helper reports it in collateral_swapped_amount, WAD.
+            maintenance_margin_ratios (Mapping[AddressLike, int]): Underlying to maintenance margin ratio, WAD.
+            pyth_ids (Mapping[AddressLike, str] | None, optional): Underlying to Pyth feed ID, needed to compute from a PythSnapshot.
+        Raises:
+            ValueError: If the columns differ in length, a size or collateral is not positive, or an underlying has no margin ratio.
+        """
+        columns = (pos_ids, is_long, underlyings, entry_prices, contract_sizes, collaterals)
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError("Position columns must have the same length")
+        if any(size <= 0 for size in contract_sizes) or any(collateral <= 0 for collateral in collaterals):
+            raise ValueError("Contract sizes and collaterals must be positive")
+        
+        position_underlyings = [to_checksum_address(underlying) for underlying in underlyings]
+        self.underlyings:list[ChecksumAddress] = list(dict.fromkeys(position_underlyings))
+        ratios = {to_checksum_address(underlying):ratio for underlying,ratio in maintenance_margin_ratios.items()}
+        missing = [underlying for underlying in self.underlyings if underlying not in ratios]
+        if missing:
+            raise ValueError(f"Missing maintenance margin ratio for {missing}")
+        self.pyth_ids = {} if pyth_ids is None else {to_checksum_address(underlying):id.lower().removeprefix('0x') for underlying,id in pyth_ids.items()}
+        
+        index = {underlying:i for i,underlying in enumerate(self.underlyings)}
+        self._underlying_index = [index[underlying] for underlying in position_underlyings]
+        if np is not None:
+            self._underlying_index = np.array(self._underlying_index, dtype=np.intp)
+        self._position_index = {pos_id:i for i,pos_id in enumerate(pos_ids)}
+        self.pos_ids = _column(pos_ids)
+        self.direction = _column([1 if long else -1 for long in is_long])
+        self.entry_prices = _column(entry_prices)
+        self.contract_sizes = _column(contract_sizes)
+        self.collaterals = _column(collaterals)
+        self.maintenance_margin_ratios = self._gather([ratios[underlying] for underlying in self.underlyings])
+    
+    @classmethod
+    def from_helper_positions(cls,
+                              positions:Sequence[FWXPerpHelperGetAllPositionRespond],
+                              maintenance_margin_ratios:Mapping[AddressLike,int],
+                              pyth_ids:Optional[Mapping[AddressLike,str]]=None) -> 'PositionBook':
+        """
+        Load the positions returned by FWXPerpHelperContract.get_all_active_positions.
+        """
+        return cls([position.pos_id for position in positions],
+                   [position.is_long for position in positions],
+                   [position.underlying_address for position in positions],
+                   [position.entry_price for position in positions],
+                   [position.contract_size for position in positions],
+                   [position.collateral_swapped_amount for position in positions],
+                   maintenance_margin_ratios,
+                   pyth_ids)
+    
+    @classmethod
+    def from_core_positions(cls,
+                            positions:Sequence[FWXPerpCoreGetPositionRespond],
+                            is_long:Sequence[bool],
+                            collaterals:Sequence[int],
+                            maintenance_margin_ratios:Mapping[AddressLike,int],
+                            pyth_ids:Optional[Mapping[AddressLike,str]]=None) -> 'PositionBook':
+        """
+        Load positions read with FWXPerpCoreContract.get_positions. The core struct has no direction, so is_long is given per position.
+        Its collateral_locked is not the collateral_swapped_amount the helper computes with, so the collateral of each position
+        is given in that basis too.
+        """
+        return cls([position.pos_id for position in positions],
+                   is_long,
+                   [position.underlying_address for position in positions],
+                   [position.entry_price for position in positions],
+                   [position.contract_size for position in positions],
+                   collaterals,
+                   maintenance_margin_ratios,
+                   pyth_ids)
+    
+    def __len__(self) -> int:
+        
+        return len(self.pos_ids)
+    
+    def _gather(self, table:Sequence[int]) -> Any:
+        # Spread one value per underlying to one value per position.
+        if np is None:
+            return [table[i] for i in self._underlying_index]
+        return np.array(table, dtype=object)[self._underlying_index]
+    
+    def prices_from_snapshot(self, snapshot:PythSnapshot) -> dict[ChecksumAddress,int]:
+        """
+        Return the WAD price of every underlying in the book from a PythSnapshot.
+        
+        Raises:
+            ValueError: If an underlying has no Pyth feed ID or its feed is not in the snapshot.
+        """
+        prices:dict[ChecksumAddress,int] = {}
+        for underlying in self.underlyings:
+            price = snapshot.get_price(self.pyth_ids[underlying]) if underlying in self.pyth_ids else None
+            if price is None:
+                raise ValueError(f"No Pyth price for {underlying}")
+            prices[underlying] = pyth_price_to_wad(price.price)
+        return prices
+    
+    def compute(self, prices:Union[Mapping[AddressLike,int],PythSnapshot]) -> PortfolioMetrics:
+        """
+        Recompute the metrics of every position for one price tick.
+        
+        Args:
+            prices (Mapping[AddressLike, int] | PythSnapshot): Underlying to WAD price, or a snapshot read through pyth_ids.
+        Returns:
+            PortfolioMetrics: One column per metric, in the order of the positions.
+        Raises:
+            ValueError: If an underlying of the book has no positive price.
+        Example:
+            book = client.get_position_book()
+            metrics = book.compute(client.get_pyth_snapshot())
+            print("total pnl:", sum(metrics.pnl))
+        """
+        if isinstance(prices, PythSnapshot):
+            prices = self.prices_from_snapshot(prices)
+        else:
+            prices = {to_checksum_address(underlying):price for underlying,price in prices.items()}
+        table:list[int] = []
+        for underlying in self.underlyings:
+            price = prices.get(underlying)
+            if price is None or price <= 0:
+                raise ValueError(f"No price for {underlying}")
+            table.append(price)
+        
+        return self._compute(self._gather(table))
+    
+    def _compute(self, price:Any) -> PortfolioMetrics:
+        if np is not None:
+            return PortfolioMetrics(self.pos_ids, price, *_metrics(self.direction,
+                                                                   self.entry_prices,
+                                                                   self.contract_sizes,
+                                                                   self.collaterals,
+                                                                   self.maintenance_margin_ratios,
+                                                                   price))
+        rows = [_metrics(*values) for values in zip(self.direction,
+                                                    self.entry_prices,
+                                                    self.contract_sizes,
+                                                    self.collaterals,
+                                                    self.maintenance_margin_ratios,
+                                                    price)]
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in range(5)]
+        return PortfolioMetrics(self.pos_ids, price, *columns)
+    
+    def validate(self,
+                 positions:Sequence[FWXPerpHelperGetAllPositionRespond],
+                 tolerance:int=0) -> list[tuple[int,str,int,int]]:
+        """
+        Compare a local pass against FWXPerpHelper.getAllActivePositions output, priced at the helper's current_price.
+        
+        Args:
+            positions (Sequence[FWXPerpHelperGetAllPositionRespond]): Helper output for positions of this book.
+            tolerance (int, optional): Largest absolute difference that still counts as a match. Defaults to 0.
+        Returns:
+            list[tuple[int, str, int, int]]: (pos_id, field, local, helper) for every pnl, roe, margin or
+                liquidation_price that differs by more than tolerance. Empty when the book matches.
+        Raises:
+            ValueError: If a position is not in the book.
+        """
+        index = [self._position_index.get(position.pos_id) for position in positions]
+        if None in index:
+            raise ValueError(f"Position {positions[index.index(None)].pos_id} is not in the book")
+        
+        price = [0] * len(self)
+        for i,position in zip(index,positions):
+            price[i] = position.current_price
+        # Positions missing from the helper output are priced at their entry, their results are ignored.
+        for i in range(len(self)):
+            price[i] = price[i] or self.entry_prices[i]
+        metrics = self._compute(_column(price))
+        
+        mismatches:list[tuple[int,str,int,int]] = []
+        for i,position in zip(index,positions):
+            for field in METRIC_FIELDS:
+                local = int(getattr(metrics, field)[i])
+                helper = getattr(position, field)
+                if abs(local - helper) > tolerance:
+                    mismatches.append((position.pos_id, field, local, helper))
+        return mismatches
@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import threading
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Optional,
+    Sequence,
+)
+from hexbytes import HexBytes
+
+from .Constant import (
+    load_abi,
+)
+from .Events import (
+    PERP_CORE_EVENT_RECORDS,
+)
+from .Indexer import (
+    EventSink,
+)
+from .types import (
+    AddressLike,
+    EventRecord,
+)
+from .W3 import (
+    to_checksum_address,
+)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    address TEXT NOT NULL,
+    block_hash BLOB NOT NULL,
+    transaction_hash BLOB NOT NULL,
+    transaction_index INTEGER NOT NULL,
+    owner TEXT,
+    nft_id INTEGER,
+    pos_id INTEGER,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS events_nft_id ON events (nft_id);
+CREATE INDEX IF NOT EXISTS events_owner ON events (owner);
+CREATE INDEX IF NOT EXISTS events_pos_id ON events (pos_id);
+'''
+
+_COLUMNS = 'block_number, log_index, event, address, block_hash, transaction_hash, transaction_index, owner, nft_id, pos_id, args'
+
+_MAX_INT64 = 2**63 - 1
+
+def _key(value:Optional[int]) -> Any:
+    # SQLite integers are 64 bit, larger ids are stored as text.
+    return value if value is None or -_MAX_INT64 <= value <= _MAX_INT64 else str(value)
+
+def _to_json(value:Any) -> Any:
+    if isinstance(value, bytes):
+        return '0x' + value.hex()
+    if isinstance(value, (tuple, list)):
+        return [_to_json(item) for item in value]
+    return value
+
+def _from_json(abi_type:str) -> Callable[[Any], Any]:
+    if abi_type.endswith(']'):
+        item = _from_json(abi_type[:abi_type.rindex('[')])
+        return lambda value: tuple(item(v) for v in value)
+    if abi_type.startswith('bytes'):
+        return lambda value: bytes.fromhex(value[2:])
+    return lambda value: value
+
+class SQLiteEventStore(EventSink):
+    """
+    Local SQLite store of decoded FWXPerpCore events.
+    
+    Rows are keyed by (block_number, log_index). owner, nft_id and pos_id are copied out of
+    the args into indexed columns; the args themselves are kept as a JSON list in ABI order.
+    Records read back compare equal to the ones appended. The store is an EventSink, so an
+    EventIndexer can fill it and roll it back on reorgs.
+    """
+    
+    def __init__(self, path:str=':memory:') -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(_SCHEMA)
+        abi = {item['name']: item for item in load_abi('FWX_PERP_CORE_ABI') if item.get('type') == 'event'}
+        self._args_decoders = {name: [_from_json(arg['type']) for arg in abi[name]['inputs']] for name in PERP_CORE_EVENT_RECORDS}
+    
+    def _row(self, record:EventRecord) -> tuple[Any, ...]:
+        args = record.args
+        return (record.block_number,
+                record.log_index,
+                record.event,
+                record.address,
+                bytes(record.block_hash),
+                bytes(record.transaction_hash),
+                record.transaction_index,
+                getattr(args, 'owner', None),
+                _key(getattr(args, 'nft_id', None)),
+                _key(getattr(args, 'pos_id', None)),
+                json.dumps(_to_json(list(args)), separators=(',', ':')))
+    
+    def _record(self, row:tuple[Any, ...]) -> EventRecord:
+        block_number, log_index, event, address, block_hash, transaction_hash, transaction_index, _, _, _, args = row
+        record, args_type = PERP_CORE_EVENT_RECORDS[event]
+        values = [decode(value) for decode, value in zip(self._args_decoders[event], json.loads(args))]
+        return record(address=address,
+                      block_hash=HexBytes(block_hash),
+                      block_number=block_number,
+                      log_index=log_index,
+                      transaction_hash=HexBytes(transaction_hash),
+                      transaction_index=transaction_index,
+                      args=args_type(*values))
+    
+    def append(self, records:Iterable[EventRecord]) -> None:
+        """
+        Store records in one transaction. A record already stored at the same (block_number, log_index) is replaced.
+        """
+        rows = [self._row(record) for record in records]
+        with self._lock, self.connection:
+            self.connection.executemany(f'INSERT OR REPLACE INTO events ({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?,?)', rows)
+    
+    def rollback(self, block_number:int) -> None:
+        with self._lock, self.connection:
+            self.connection.execute('DELETE FROM events WHERE block_number > ?', (block_number,))
+    
+    def get_events(self,
+                   from_block:Optional[int]=None,
+                   to_block:Optional[int]=None,
+                   events:Optional[Sequence[str]]=None,
+                   owner:Optional[AddressLike]=None,
+                   nft_id:Optional[int]=None,
+                   pos_id:Optional[int]=None,
+                   limit:Optional[int]=None) -> list[EventRecord]:
+        """
+        Query stored records in chain order.
+        
+        Args:
+            from_block (Optional[int]): First block, inclusive.
+            to_block (Optional[int]): Last block, inclusive.
+            events (Optional[Sequence[str]]): Event names to keep, e.g. ['OpenPosition'].
+            owner (Optional[AddressLike]): Keep the events of this owner.
+            nft_id (Optional[int]): Keep the events of this membership NFT.
+            pos_id (Optional[int]): Keep the events of this position.
+            limit (Optional[int]): Maximum number of records.
+        Returns:
+            list[EventRecord]: The matching records ordered by (block_number, log_index).
+        """
+        where:list[str] = []
+        params:list[Any] = []
+        if from_block is not None:
+            where.append('block_number >= ?')
+            params.append(from_block)
+        if to_block is not None:
+            where.append('block_number <= ?')
+            params.append(to_block)
+        if events is not None:
+            where.append(f'event IN ({",".join("?" * len(events))})')
+            params.extend(events)
+        if owner is not None:
+            where.append('owner = ?')
+            params.append(to_checksum_address(owner))
+        if nft_id is not None:
+            where.append('nft_id = ?')
+            params.append(_key(nft_id))
+        if pos_id is not None:
+            where.append('pos_id = ?')
+            params.append(_key(pos_id))
+        query = f'SELECT {_COLUMNS} FROM events'
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+        query += ' ORDER BY block_number, log_index'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self.connection.execute(query, params).fetchall()
+        
+        return [self._record(row) for row in rows]
+    
+    def count(self) -> int:
+        with self._lock:
+            return self.connection.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+    
+    def last_block(self) -> Optional[int]:
+        with self._lock:
+            return self.connection.execute('SELECT MAX(block_number) FROM events').fetchone()[0]
+    
+    def close(self) -> None:
+        
+        self.connection.close()
@@ -1,4 +1,12 @@
+import logging
+import time
+import threading
+import requests
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
 from web3 import (
+    AsyncHTTPProvider,
+    AsyncWeb3,
     Web3,
     HTTPProvider
 )
@@ -8,8 +16,10 @@ from web3.middleware.proof_of_authority import (
 from hexbytes import HexBytes
 from typing import (
     Any,
+    Callable,
     Optional,  
-    Dict)
+    Dict,
+    Sequence)
 from eth_typing import (
     ChecksumAddress,
     BlockIdentifier
@@ -20,13 +30,29 @@ from web3.contract.contract import (
     ContractFunction
 )
 from web3.types import (
+    BlockData,
     EventData,
+    FilterParams,
+    LogReceipt,
+    RPCEndpoint,
     TxParams,
+    TxReceipt,
     Nonce,
+    Wei,
+)
+from web3.exceptions import (
+    TimeExhausted,
+    Web3RPCError,
 )
 from web3._utils.events import (
     EventLogErrorFlags,
 )
+from web3._utils.method_formatters import (
+    block_formatter,
+    filter_params_formatter,
+    log_entry_formatter,
+    receipt_formatter,
+)
 from eth_account.datastructures import (
     SignedTransaction,
 )
@@ -35,18 +61,173 @@ from eth_account.signers.local import (
     LocalAccount,
 )
 
+from .Constant import (
+    to_checksum_address,
+)
 from .types import (
+    AddressLike,
     BaseEventData,
+    PendingTransaction,
     TxParamsInput
 )
 
+logger = logging.getLogger(__name__)
+
+class Web3Pool:
+    """
+    Registry of Web3 and AsyncWeb3 instances shared across wrappers, keyed by endpoint URL.
+    
+    Every wrapper attached to the same endpoint reuses one HTTPProvider backed by a
+    single keep-alive connection pool, and the chain id is resolved only once
+    (including the chain id lookups web3 makes when validating eth_call).
+    """
+    
+    def __init__(self, pool_maxsize:int=32) -> None:
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._session:requests.Session|None = None
+        self._w3:dict[str, Web3] = {}
+        self._async_w3:dict[str, AsyncWeb3] = {}
+        self._chain_id:dict[str, int] = {}
+        self._receipt_pollers:dict[str, ReceiptPoller] = {}
+        
+    def get_session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_maxsize, pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+    
+    def get_web3(self, provider:str) -> Web3:
+        w3 = self._w3.get(provider)
+        if w3 is not None:
+            return w3
+        session = self.get_session()
+        with self._lock:
+            if provider not in self._w3:
+                w3 = Web3(HTTPProvider(provider,
+                                       session=session,
+                                       cache_allowed_requests=True,
+                                       cacheable_requests={RPCEndpoint('eth_chainId')},
+                                       request_cache_validation_threshold=None))
+                if self._chain_id.get(provider) == 43113:
+                    w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+                self._w3[provider] = w3
+            return self._w3[provider]
+        
+    def get_async_web3(self, provider:str) -> AsyncWeb3:
+        with self._lock:
+            if provider not in self._async_w3:
+                w3 = AsyncWeb3(AsyncHTTPProvider(provider,
+                                                 cache_allowed_requests=True,
+                                                 cacheable_requests={RPCEndpoint('eth_chainId')},
+                                                 request_cache_validation_threshold=None))
+                if self._chain_id.get(provider) == 43113:
+                    w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+                self._async_w3[provider] = w3
+            return self._async_w3[provider]
+    
+    def get_receipt_poller(self, provider:str) -> 'ReceiptPoller':
+        poller = self._receipt_pollers.get(provider)
+        if poller is not None:
+            return poller
+        web3_http = Web3HTTP(provider, self)
+        with self._lock:
+            if provider not in self._receipt_pollers:
+                self._receipt_pollers[provider] = ReceiptPoller(web3_http)
+            return self._receipt_pollers[provider]
+    
+    def get_cached_chain_id(self, provider:str) -> int|None:
+        
+        return self._chain_id.get(provider)
+    
+    def get_chain_id(self, provider:str) -> int:
+        chain_id = self._chain_id.get(provider)
+        if chain_id is None:
+            chain_id = self.get_web3(provider).eth.chain_id
+            self.set_chain_id(provider, chain_id)
+        return chain_id
+    
+    async def async_get_chain_id(self, provider:str) -> int:
+        chain_id = self._chain_id.get(provider)
+        if chain_id is None:
+            chain_id = await self.get_async_web3(provider).eth.chain_id
+            self.set_chain_id(provider, chain_id)
+        return chain_id
+    
+    def set_chain_id(self, provider:str, chain_id:int) -> None:
+        with self._lock:
+            if provider in self._chain_id:
+                return
+            self._chain_id[provider] = chain_id
+            if chain_id == 43113:
+                for w3 in (self._w3.get(provider), self._async_w3.get(provider)):
+                    if w3 is not None:
+                        w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+                
+    def clear(self) -> None:
+        with self._lock:
+            for poller in self._receipt_pollers.values():
+                poller.stop()
+            self._receipt_pollers.clear()
+            self._w3.clear()
+            self._async_w3.clear()
+            self._chain_id.clear()
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+SHARED_WEB3_POOL = Web3Pool()
+
 class Web3HTTP:
     
-    def __init__(self, provider:str) -> None:
-        self.w3 = Web3(HTTPProvider(provider))
-        self.chain_id = self.w3.eth.chain_id
-        if self.chain_id == 43113:
+    def __init__(self, 
+                 provider:str,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        self.provider = provider
+        self.pool = pool
+        self._chain_id:int|None = None
+        self._receipt_poller:ReceiptPoller|None = None
+        if pool is None:
+            self.w3 = Web3(HTTPProvider(provider))
+        else:
+            self.w3 = pool.get_web3(provider)
+            
+    @property
+    def receipt_poller(self) -> 'ReceiptPoller':
+        if self.pool is not None:
+            return self.pool.get_receipt_poller(self.provider)
+        if self._receipt_poller is None:
+            self._receipt_poller = ReceiptPoller(self)
+        return self._receipt_poller
+    
+    def watch_transaction(self, txn_hash:HexBytes, timeout:float=120) -> 'Future[TxReceipt]':
+        """
+        Return a future resolved with the receipt of txn_hash by the background receipt poller.
+        
+        Raises (through the future):
+            TimeExhausted: If the transaction is not in the chain after timeout seconds.
+        """
+        return self.receipt_poller.watch(txn_hash, timeout)
+            
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            if self.pool is None:
+                self.set_chain_id(self.w3.eth.chain_id)
+            else:
+                self._chain_id = self.pool.get_chain_id(self.provider)
+        return self._chain_id
+    
+    def set_chain_id(self, chain_id:int) -> None:
+        if self.pool is not None:
+            self.pool.set_chain_id(self.provider, chain_id)
+        elif self._chain_id is None and chain_id == 43113:
             self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        self._chain_id = chain_id
             
     def load_contract(self,abi:Any,address:ChecksumAddress) -> Contract:
         return self.w3.eth.contract(abi=abi,address=address) 
@@ -67,8 +248,99 @@ class Web3HTTP:
         
         return event.get_logs(from_block=from_block, to_block=to_block, argument_filters=argument_filters)
     
+    def make_batch_request(self,
+                           requests:Sequence[tuple[str, Any]],
+                           max_batch_size:int=100) -> list[Any]:
+        """
+        Send JSON-RPC requests as batches, max_batch_size requests per HTTP POST,
+        and return the raw results in the order of the requests.
+        
+        Raises:
+            Web3RPCError: If the node answered any of the requests with an error.
+        """
+        results:list[Any] = []
+        for start in range(0, len(requests), max_batch_size):
+            batch = [(RPCEndpoint(method), params) for method, params in requests[start:start+max_batch_size]]
+            responses = self.w3.provider.make_batch_request(batch)
+            if not isinstance(responses, list):
+                raise Web3RPCError(str(responses.get('error')), rpc_response=responses)
+            for response in responses:
+                if 'error' in response:
+                    raise Web3RPCError(str(response['error']), rpc_response=response)
+                results.append(response.get('result'))
+                
+        return results
+    
+    def get_transaction_receipts(self, txn_hashes:Sequence[HexBytes]) -> list[TxReceipt|None]:
+        """
+        Fetch many receipts in one batched request. Transactions that are still pending come back as None.
+        """
+        results = self.make_batch_request([('eth_getTransactionReceipt', [HexBytes(txn_hash).to_0x_hex()]) for txn_hash in txn_hashes])
+        
+        return [None if res is None else receipt_formatter(res) for res in results]
+    
+    def get_transaction_counts(self,
+                               addresses:Sequence[ChecksumAddress],
+                               block_identifier:BlockIdentifier='pending') -> list[Nonce]:
+        
+        block = block_identifier if isinstance(block_identifier, str) else hex(int(block_identifier))
+        results = self.make_batch_request([('eth_getTransactionCount', [address, block]) for address in addresses])
+        
+        return [Nonce(int(res, 16)) for res in results]
+    
+    def get_blocks(self,
+                   block_numbers:Sequence[int],
+                   full_transactions:bool=False) -> list[BlockData|None]:
+        
+        results = self.make_batch_request([('eth_getBlockByNumber', [hex(block_number), full_transactions]) for block_number in block_numbers])
+        
+        return [None if res is None else block_formatter(res) for res in results]
+    
+    def get_logs_batch(self, filters:Sequence[FilterParams]) -> list[list[LogReceipt]]:
+        
+        results = self.make_batch_request([('eth_getLogs', [filter_params_formatter(filter_params)]) for filter_params in filters])
+        
+        return [[log_entry_formatter(log) for log in res] for res in results]
+    
+    def get_raw_logs(self, filter_params:FilterParams) -> list[dict[str, Any]]:
+        """
+        Run eth_getLogs and return the logs as the node sent them (hex strings), skipping web3's
+        result formatters. Meant to be fed to a LogDecoder.
+        
+        Raises:
+            Web3RPCError: If the node answered with an error.
+        """
+        response = self.w3.provider.make_request(RPCEndpoint('eth_getLogs'), [filter_params_formatter(filter_params)])
+        if 'error' in response:
+            raise Web3RPCError(str(response['error']), rpc_response=response)
+        
+        return response['result']
+    
+    def wait_for_transaction_receipts(self,
+                                      txn_hashes:Sequence[HexBytes],
+                                      timeout:float=120,
+                                      poll_latency:float=0.5) -> list[TxReceipt]:
+        """
+        Wait for many transactions at once, polling every still-pending receipt in one batched request per round.
+        
+        Raises:
+            TimeExhausted: If some receipts are still missing after timeout seconds.
+        """
+        receipts:dict[int, TxReceipt] = {}
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = [i for i in range(len(txn_hashes)) if i not in receipts]
+            for i, receipt in zip(pending, self.get_transaction_receipts([txn_hashes[i] for i in pending])):
+                if receipt is not None:
+                    receipts[i] = receipt
+            if len(receipts) == len(txn_hashes):
+                return [receipts[i] for i in range(len(txn_hashes))]
+            if time.monotonic() > deadline:
+                raise TimeExhausted(f"{len(txn_hashes) - len(receipts)} transactions are not in the chain after {timeout} seconds")
+            time.sleep(poll_latency)
+    
     def process_event_data(self, event_data:EventData) -> tuple[BaseEventData, dict[str, Any]]:
-        address: ChecksumAddress = Web3.to_checksum_address(event_data['address'])
+        address: ChecksumAddress = to_checksum_address(event_data['address'])
         blockHash: HexBytes = HexBytes(event_data['blockHash'])
         blockNumber: int = int(event_data['blockNumber'])
         logIndex: int = int(event_data['logIndex'])
@@ -78,19 +350,277 @@ class Web3HTTP:
         args = event_data['args']
         return BaseEventData(address,blockHash,blockNumber,event_name,logIndex,transactionHash,transactionIndex),args 
     
+class ReceiptPoller:
+    """
+    Background thread resolving the receipts of every watched transaction of one endpoint.
+    
+    Each round reads the block number and, once per new block, fetches the receipts of all
+    pending hashes in a single batched request, so a burst of transactions costs a couple of
+    HTTP calls per block instead of one polling loop per transaction.
+    """
+    
+    def __init__(self, web3_http:Web3HTTP, poll_latency:float=0.5) -> None:
+        self.web3_http = web3_http
+        self.poll_latency = poll_latency
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending:dict[HexBytes, tuple['Future[TxReceipt]', float, int]] = {}
+        self._thread:threading.Thread|None = None
+        self._stopped = False
+        
+    def watch(self, txn_hash:HexBytes, timeout:float=120) -> 'Future[TxReceipt]':
+        txn_hash = HexBytes(txn_hash)
+        with self._lock:
+            entry = self._pending.get(txn_hash)
+            if entry is not None:
+                return entry[0]
+            future:'Future[TxReceipt]' = Future()
+            self._pending[txn_hash] = (future, time.monotonic() + timeout, -1)
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name='FWXReceiptPoller', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        
+        return future
+    
+    def stop(self) -> None:
+        """
+        Stop the polling thread and fail the futures still waiting, so no caller blocks on a poller that is gone.
+        """
+        self._stopped = True
+        with self._lock:
+            pending = [future for future, _, _ in self._pending.values()]
+            self._pending.clear()
+        self._wakeup.set()
+        for future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Receipt poller stopped before the transaction was mined"))
+        
+    def _run(self) -> None:
+        while not self._stopped:
+            if not self._pending:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            try:
+                self.poll()
+            except Exception:
+                logger.exception('Receipt polling failed')
+            self._wakeup.wait(self.poll_latency)
+            self._wakeup.clear()
+            
+    def poll(self) -> None:
+        """
+        Run one polling round: fetch the receipts not yet checked at the current block and
+        resolve the futures of mined or timed out transactions. Deadlines are enforced even
+        when the node cannot be reached.
+        """
+        try:
+            self._fetch_receipts()
+        finally:
+            self._expire()
+            
+    def _fetch_receipts(self) -> None:
+        block_number = self.web3_http.w3.eth.block_number
+        with self._lock:
+            txn_hashes = [txn_hash for txn_hash, (_, _, polled_at) in self._pending.items() if polled_at < block_number]
+            
+        receipts = self.web3_http.get_transaction_receipts(txn_hashes) if txn_hashes else []
+        
+        done:list[tuple['Future[TxReceipt]', TxReceipt]] = []
+        with self._lock:
+            for txn_hash, receipt in zip(txn_hashes, receipts):
+                entry = self._pending.get(txn_hash)
+                if entry is None:
+                    continue
+                future, deadline, _ = entry
+                if receipt is not None:
+                    del self._pending[txn_hash]
+                    done.append((future, receipt))
+                else:
+                    self._pending[txn_hash] = (future, deadline, block_number)
+                    
+        for future, receipt in done:
+            if not future.done():
+                future.set_result(receipt)
+                
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired:list['Future[TxReceipt]'] = []
+        with self._lock:
+            for txn_hash, (future, deadline, _) in list(self._pending.items()):
+                if now > deadline:
+                    del self._pending[txn_hash]
+                    expired.append(future)
+                    
+        for future in expired:
+            if not future.done():
+                future.set_exception(TimeExhausted("Transaction is not in the chain after the timeout"))
+
+class GasCache:
+    """
+    Gas limit profiles and a short lived fee quote for one wallet.
+    
+    Gas estimates are stored per (contract, function selector, calldata size). The calldata size
+    stands for the shape of the arguments: two openPosition calls with the same number of price
+    updates cost about the same, so the next build reuses the estimate times safety_multiplier
+    instead of calling eth_estimateGas. The EIP-1559 fee quote is reused for fee_ttl seconds
+    (about one block). A transaction that runs out of gas drops its profile so the next build
+    re-estimates.
+    
+    Trade-off: eth_estimateGas is also the preflight that rejects a call which would revert.
+    Once a profile is cached the build no longer runs it, so a reverting order is signed, sent
+    and mined as a failed transaction that still costs gas, instead of raising before sending.
+    The cache is therefore off by default: set wallet.gas_cache = GasCache() to opt in.
+    """
+    
+    def __init__(self, safety_multiplier:float=1.2, fee_ttl:float=2.0) -> None:
+        self.safety_multiplier = safety_multiplier
+        self.fee_ttl = fee_ttl
+        self._lock = threading.Lock()
+        self._gas:dict[tuple[str,str,int], int] = {}
+        self._fees:tuple[Wei, Wei]|None = None
+        self._fees_at:float = 0
+        
+    @staticmethod
+    def profile_key(to:Any, data:Any) -> tuple[str,str,int]:
+        data = HexBytes(data).to_0x_hex()
+        return str(to).lower(), data[:10], len(data)
+    
+    def get_gas(self, key:tuple[str,str,int]) -> int|None:
+        estimate = self._gas.get(key)
+        if estimate is None:
+            return None
+        return int(estimate * self.safety_multiplier)
+    
+    def record_gas(self, key:tuple[str,str,int], estimate:int) -> None:
+        with self._lock:
+            self._gas[key] = max(estimate, self._gas.get(key, 0))
+            
+    def invalidate_gas(self, key:tuple[str,str,int]) -> None:
+        with self._lock:
+            self._gas.pop(key, None)
+            
+    def is_out_of_gas(self, txn:TxParams, receipt:TxReceipt) -> bool:
+        
+        return receipt['status'] == 0 and receipt['gasUsed'] >= int(txn.get('gas', 0)) * 0.97
+    
+    def get_fees(self) -> tuple[Wei, Wei]|None:
+        """
+        Return the cached (maxFeePerGas, maxPriorityFeePerGas), or None once it is older than fee_ttl.
+        """
+        if self._fees is None or time.monotonic() - self._fees_at > self.fee_ttl:
+            return None
+        return self._fees
+    
+    def set_fees(self, max_priority_fee:int, base_fee:int) -> tuple[Wei, Wei]:
+        # Same rule as web3's default: tip plus twice the latest base fee.
+        fees = (Wei(max_priority_fee + 2 * base_fee), Wei(max_priority_fee))
+        with self._lock:
+            self._fees = fees
+            self._fees_at = time.monotonic()
+        return fees
+
+class NonceManager:
+    """
+    Allocates the nonces of one wallet locally and atomically.
+    
+    The manager syncs with the node's pending transaction count once, then hands out
+    consecutive nonces without any RPC. It only goes back to the node after a nonce
+    error from the node (see NONCE_ERRORS), after a failed send that leaves a hole,
+    or when detect_gap finds that an allocated nonce never reached the mempool.
+    """
+    
+    NONCE_ERRORS = ('nonce too low',
+                    'nonce too high',
+                    'replacement transaction underpriced',
+                    'invalid nonce')
+    
+    def __init__(self, gap_timeout:float=30) -> None:
+        self.gap_timeout = gap_timeout
+        self._lock = threading.Lock()
+        self._next_nonce:int|None = None
+        self._last_allocation:float = 0
+        
+    @classmethod
+    def is_nonce_error(cls, error:Exception) -> bool:
+        message = str(error).lower()
+        return any(nonce_error in message for nonce_error in cls.NONCE_ERRORS)
+        
+    @property
+    def needs_sync(self) -> bool:
+        
+        return self._next_nonce is None
+    
+    def sync(self, pending_nonce:int) -> None:
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = pending_nonce
+    
+    def allocate(self, fetch_nonce:Optional[Callable[[], int]]=None) -> Nonce:
+        """
+        Return the next nonce. If the manager is not synced, fetch_nonce is called (under the lock)
+        to read the pending transaction count from the node.
+        """
+        with self._lock:
+            if self._next_nonce is None:
+                if fetch_nonce is None:
+                    raise ValueError("Nonce manager is not synced")
+                self._next_nonce = fetch_nonce()
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            self._last_allocation = time.monotonic()
+            return Nonce(nonce)
+        
+    def release(self, nonce:int) -> None:
+        """
+        Give back a nonce whose transaction never reached the node.
+        The latest nonce is simply reused, any other one leaves a hole so the manager resyncs.
+        """
+        with self._lock:
+            if self._next_nonce is not None and nonce == self._next_nonce - 1:
+                self._next_nonce = nonce
+            else:
+                self._next_nonce = None
+                
+    def reset(self) -> None:
+        with self._lock:
+            self._next_nonce = None
+            
+    def detect_gap(self, pending_nonce:int) -> bool:
+        """
+        Compare the node's pending nonce with the local one. If allocated nonces older than
+        gap_timeout seconds never reached the mempool, resync to the node and return True.
+        """
+        with self._lock:
+            if self._next_nonce is None or pending_nonce >= self._next_nonce:
+                return False
+            if time.monotonic() - self._last_allocation < self.gap_timeout:
+                return False
+            self._next_nonce = pending_nonce
+            return True
+
 class Web3WalletHTTP(Web3HTTP):
     
+    # The node already holds this exact signed transaction, so sending it again is not a failure.
+    KNOWN_TRANSACTION_ERRORS = ('already known',
+                                'known transaction')
+    
     def __init__(self, 
                  provider:str, 
-                 private_key:str) -> None:
-        super().__init__(provider)
+                 private_key:str,
+                 pool:Optional[Web3Pool]=SHARED_WEB3_POOL) -> None:
+        super().__init__(provider,pool)
         self.__private_key = private_key
         account:LocalAccount = self.w3.eth.account.from_key(private_key)
         self.wallet_address:ChecksumAddress = account.address
-        self.last_nonce:Nonce|None = None
+        self.nonce_manager = NonceManager()
+        # Opt-in: see GasCache for why skipping eth_estimateGas changes how reverts surface.
+        self.gas_cache:GasCache|None = None
         pass 
     
-    def create_txn_params(self, tx_params:TxParamsInput=TxParamsInput()) -> TxParams:
+    def _merge_txn_params(self, tx_params:TxParamsInput) -> TxParams:
         txn_params:TxParams = {'from':self.wallet_address,
                                'chainId':self.chain_id}
         
@@ -98,20 +628,30 @@ class Web3WalletHTTP(Web3HTTP):
             if value is not None:
                 txn_params[key] = value
                 
+        return txn_params
+    
+    def create_txn_params(self, tx_params:TxParamsInput=TxParamsInput()) -> TxParams:
+        txn_params:TxParams = self._merge_txn_params(tx_params)
+                
         if 'nonce' not in txn_params:
-            if self.last_nonce is None:
-                self.last_nonce = Nonce(0)
-            nonce:Nonce = max(self.last_nonce, self.w3.eth.get_transaction_count(self.wallet_address))
-            txn_params['nonce'] = nonce
+            txn_params['nonce'] = self.get_next_nonce()
             
         return txn_params
     
+    def get_next_nonce(self) -> Nonce:
+        
+        return self.nonce_manager.allocate(lambda: self.w3.eth.get_transaction_count(self.wallet_address, 'pending'))
+    
+    def check_nonce_gap(self) -> bool:
+        """
+        Resync the nonce manager if a transaction it numbered never reached the node's mempool.
+        """
+        pending_nonce = self.w3.eth.get_transaction_count(self.wallet_address, 'pending')
+        return self.nonce_manager.detect_gap(pending_nonce)
+    
     def checking_txn_params(self, txn_params:TxParams) -> TxParams:
         if 'nonce' not in txn_params:
-            if self.last_nonce is None:
-                self.last_nonce = Nonce(0)
-            nonce:Nonce = max(self.last_nonce, self.w3.eth.get_transaction_count(self.wallet_address))
-            txn_params['nonce'] = nonce
+            txn_params['nonce'] = self.get_next_nonce()
             
         if 'to' not in txn_params:
             raise ValueError("Destination address is required")  
@@ -123,7 +663,43 @@ class Web3WalletHTTP(Web3HTTP):
                                     tx_params:TxParamsInput=TxParamsInput()) -> TxParams:
         
         txn_params:TxParams = self.create_txn_params(tx_params)
-        return func.build_transaction(txn_params)
+        try:
+            return self._build_transaction(func, txn_params)
+        except Exception:
+            # A failed build (e.g. an eth_estimateGas revert) never sends its nonce, give it back.
+            if tx_params.nonce is None:
+                self.nonce_manager.release(int(txn_params['nonce']))
+            raise
+    
+    def _build_transaction(self, func:ContractFunction, txn_params:TxParams) -> TxParams:
+        if self.gas_cache is None:
+            return func.build_transaction(txn_params)
+        
+        key = GasCache.profile_key(func.address, func._encode_transaction_data())
+        if 'gas' not in txn_params:
+            gas = self.gas_cache.get_gas(key)
+            if gas is not None:
+                txn_params['gas'] = gas
+        if self._uses_default_fees(txn_params):
+            txn_params['maxFeePerGas'], txn_params['maxPriorityFeePerGas'] = self._get_cached_fees(self.gas_cache)
+            
+        txn = func.build_transaction(txn_params)
+        if 'gas' not in txn_params:
+            self.gas_cache.record_gas(key, int(txn['gas']))
+        return txn
+    
+    def _uses_default_fees(self, txn_params:TxParams) -> bool:
+        
+        return (self.w3.eth.generate_gas_price(txn_params) is None
+                and not any(key in txn_params for key in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas')))
+    
+    def _get_cached_fees(self, gas_cache:GasCache) -> tuple[Wei, Wei]:
+        fees = gas_cache.get_fees()
+        if fees is None:
+            max_priority_fee = self.w3.eth.max_priority_fee
+            base_fee = self.w3.eth.get_block('latest')['baseFeePerGas']
+            fees = gas_cache.set_fees(max_priority_fee, base_fee)
+        return fees
     
     def build_txn(self,
                   func:Optional[ContractFunction]=None,
@@ -134,23 +710,89 @@ class Web3WalletHTTP(Web3HTTP):
         else:
             return self.create_txn_params_with_func(func, tx_params)
     
+    def sign_transaction(self, txn:TxParams) -> SignedTransaction:
+        
+        return self.w3.eth.account.sign_transaction(txn, self.__private_key)
+    
     def send_transaction(self, 
                          txn:TxParams,
-                         waiting:bool=True) -> HexBytes:
-        signed_txn:SignedTransaction = self.w3.eth.account.sign_transaction(txn, self.__private_key)
-        txn_hash:HexBytes = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-        self.last_nonce = Nonce(int(txn.get('nonce',0)) + 1)
-        self.w3.eth.wait_for_transaction_receipt(txn_hash) if waiting else None
+                         waiting:bool=True,
+                         timeout:float=120,
+                         managed_nonce:bool=False) -> HexBytes:
+        """
+        Sign and send txn. Pass managed_nonce=True when its nonce came from nonce_manager,
+        so a failed send gives the nonce back; a nonce chosen by the caller is left alone.
+        """
+        signed_txn:SignedTransaction = self.sign_transaction(txn)
+        try:
+            txn_hash:HexBytes = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        except Exception as e:
+            if not self.is_known_transaction(e):
+                if managed_nonce:
+                    self._release_nonce(txn, e)
+                raise
+            txn_hash = HexBytes(signed_txn.hash)
+        self._watch_gas_profile(txn, txn_hash)
+        if waiting:
+            try:
+                self.watch_transaction(txn_hash, timeout).result(timeout)
+            except FutureTimeoutError:
+                raise TimeExhausted(f"Transaction {txn_hash.to_0x_hex()} is not in the chain after {timeout} seconds")
         
         return txn_hash
     
+    def submit_transaction(self,
+                           func:Optional[ContractFunction]=None,
+                           tx_params_input:TxParamsInput=TxParamsInput(),
+                           timeout:float=120) -> PendingTransaction:
+        """
+        Build, sign and send a transaction without waiting for it to be mined.
+        The returned handle carries the hash and a future resolved by the receipt poller.
+        """
+        txn_hash = self.build_and_send_transaction(func, tx_params_input, waiting=False)
+        return PendingTransaction(txn_hash, self.watch_transaction(txn_hash, timeout))
+    
+    def _watch_gas_profile(self, txn:TxParams, txn_hash:HexBytes) -> None:
+        # Only transactions whose gas limit came from a cached profile are watched for running out of gas.
+        gas_cache = self.gas_cache
+        if gas_cache is None or 'to' not in txn or 'data' not in txn:
+            return
+        key = GasCache.profile_key(txn['to'], txn['data'])
+        if gas_cache.get_gas(key) != txn.get('gas'):
+            return
+        
+        def check_receipt(future:'Future[TxReceipt]') -> None:
+            if future.exception() is None and gas_cache.is_out_of_gas(txn, future.result()):
+                gas_cache.invalidate_gas(key)
+                
+        self.receipt_poller.watch(txn_hash).add_done_callback(check_receipt)
+    
+    @classmethod
+    def is_known_transaction(cls, error:Exception) -> bool:
+        message = str(error).lower()
+        return any(known_error in message for known_error in cls.KNOWN_TRANSACTION_ERRORS)
+    
+    def _release_nonce(self, txn:TxParams, error:Exception) -> None:
+        if NonceManager.is_nonce_error(error):
+            self.nonce_manager.reset()
+        else:
+            self.nonce_manager.release(int(txn.get('nonce',0)))
+    
     def build_and_send_transaction(self,
                                    func:Optional[ContractFunction]=None,
                                    tx_params_input:TxParamsInput=TxParamsInput(),
                                    waiting:bool=True) -> HexBytes:
         
+        managed_nonce = tx_params_input.nonce is None
         txn:TxParams = self.build_txn(func, tx_params_input)
-        return self.send_transaction(txn, waiting)
+        try:
+            return self.send_transaction(txn, waiting, managed_nonce=managed_nonce)
+        except Web3RPCError as e:
+            # A stale local nonce is retried once with a nonce resynced from the node.
+            if not managed_nonce or not NonceManager.is_nonce_error(e):
+                raise
+            txn = self.build_txn(func, tx_params_input)
+            return self.send_transaction(txn, waiting, managed_nonce=managed_nonce)
     
     
     
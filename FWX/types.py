@@ -1,14 +1,24 @@
-from typing import NamedTuple, Union,Sequence,NewType
+from typing import TYPE_CHECKING, Any, Iterator, NamedTuple, Optional, TypedDict, Union,Sequence,NewType
+try:
+    from typing import NotRequired
+except ImportError:
+    # Python < 3.11
+    from typing_extensions import NotRequired
+from concurrent.futures import Future
 from hexbytes import HexBytes
 from eth_typing import (
     Address,
     ChecksumAddress,
     HexStr,
 )
-from web3.types import (
-    Wei,
-    Nonce,
-)
+
+# web3 is only imported for type checking, so the event decoders can be loaded without it.
+if TYPE_CHECKING:
+    from web3.types import (
+        Wei,
+        Nonce,
+        TxReceipt,
+    )
 
 class AccessListEntry(NamedTuple):
     address: HexStr
@@ -33,26 +43,102 @@ class TxParamsInput(NamedTuple):
     data:Union[bytes, HexStr]|None = None
     from_address:ChecksumAddress|None = None
     gas:int|None = None
-    gasPrice:Wei|None = None
-    maxFeePerBlobGas:Union[str, Wei]|None = None
-    maxFeePerGas:Union[str, Wei]|None = None
-    maxPriorityFeePerGas: Union[str, Wei]|None = None
-    nonce: Nonce|None = None
+    gasPrice:'Wei|None' = None
+    maxFeePerBlobGas:'Union[str, Wei]|None' = None
+    maxFeePerGas:'Union[str, Wei]|None' = None
+    maxPriorityFeePerGas: 'Union[str, Wei]|None' = None
+    nonce: 'Nonce|None' = None
     to:ChecksumAddress|None = None
     type:Union[int, HexStr]|None = None
-    value:Wei|None = None
+    value:'Wei|None' = None
     
 class ERC20TransferArgs(NamedTuple):
     from_address: ChecksumAddress
     to_address: ChecksumAddress
     value: int
     
-class ERC20TransferEventData(BaseEventData):
-    def __new__(cls, address: ChecksumAddress, block_hash: HexBytes, block_number: int, log_index: int, transaction_hash: HexBytes, transaction_index: int, args: ERC20TransferArgs) -> 'ERC20TransferEventData':
-        return super().__new__(cls, address, block_hash, block_number, "Transfer", log_index, transaction_hash, transaction_index)
+class EventRecord:
+    """
+    Base of the decoded event records.
+    
+    Records use __slots__, so an instance holds only its seven field references (six log fields
+    and args) and no __dict__. The event name is a class attribute. Iterating, indexing and
+    comparing behave like the BaseEventData tuple the records used to be, and args holds the
+    decoded arguments.
     
-    def __init__(self, address: ChecksumAddress, block_hash: HexBytes, block_number: int, log_index: int, transaction_hash: HexBytes, transaction_index: int, args:ERC20TransferArgs) -> None:
+    Records are not tuples any more: isinstance(record, tuple) and isinstance(record,
+    BaseEventData) are False, and there is no _replace. To change a field, build a new record
+    from the constructor arguments, e.g. type(record)(record.address, record.block_hash, n,
+    record.log_index, record.transaction_hash, record.transaction_index, record.args).
+    """
+    __slots__ = ('address',
+                 'block_hash',
+                 'block_number',
+                 'log_index',
+                 'transaction_hash',
+                 'transaction_index',
+                 'args')
+    _fields = ('address',
+               'block_hash',
+               'block_number',
+               'event',
+               'log_index',
+               'transaction_hash',
+               'transaction_index')
+    event:str = ''
+    
+    def __init__(self, address: ChecksumAddress, block_hash: HexBytes, block_number: int, log_index: int, transaction_hash: HexBytes, transaction_index: int, args:Any) -> None:
+        self.address = address
+        self.block_hash = block_hash
+        self.block_number = block_number
+        self.log_index = log_index
+        self.transaction_hash = transaction_hash
+        self.transaction_index = transaction_index
         self.args = args
+        
+    def __iter__(self) -> Iterator[Any]:
+        
+        return iter((self.address, self.block_hash, self.block_number, self.event, self.log_index, self.transaction_hash, self.transaction_index))
+    
+    def __len__(self) -> int:
+        
+        return len(self._fields)
+    
+    def __getitem__(self, index:int) -> Any:
+        
+        return tuple(self)[index]
+    
+    def __eq__(self, other:object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return tuple(self) == tuple(other) and self.args == other.args
+    
+    def __hash__(self) -> int:
+        
+        return hash((tuple(self), self.args))
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={value!r}' for name, value in zip(self._fields, self))
+        return f'{type(self).__name__}({fields}, args={self.args!r})'
+    
+    def _asdict(self) -> dict[str,Any]:
+        data = dict(zip(self._fields, self))
+        data['args'] = self.args
+        return data
+    
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Records cross process boundaries in bulk backfills; plain positional state unpickles
+        # several times faster than the generic __slots__ protocol.
+        return (_restore_record, (type(self), self.address, bytes(self.block_hash), self.block_number, self.log_index, bytes(self.transaction_hash), self.transaction_index, self.args))
+    
+def _restore_record(cls:type[EventRecord], address:ChecksumAddress, block_hash:bytes, block_number:int, log_index:int, transaction_hash:bytes, transaction_index:int, args:Any) -> EventRecord:
+    
+    return cls(address, bytes.__new__(HexBytes, block_hash), block_number, log_index, bytes.__new__(HexBytes, transaction_hash), transaction_index, args)
+    
+class ERC20TransferEventData(EventRecord):
+    __slots__ = ()
+    event = "Transfer"
+    args:ERC20TransferArgs
     
 class FWXPerpCoreOpenPositionArgs(NamedTuple):
     owner:ChecksumAddress
@@ -66,12 +152,10 @@ class FWXPerpCoreOpenPositionArgs(NamedTuple):
     collateral_swap_amount_locked:int
     router_address:ChecksumAddress
     
-class FWXPerpCoreOpenPositionEventData(BaseEventData):
-    def __new__(cls, address: ChecksumAddress, block_hash: HexBytes, block_number: int, log_index: int, transaction_hash: HexBytes, transaction_index: int, args: FWXPerpCoreOpenPositionArgs) -> 'FWXPerpCoreOpenPositionEventData':
-        return super().__new__(cls, address, block_hash, block_number, "OpenPosition", log_index, transaction_hash, transaction_index)
-    
-    def __init__(self, address: ChecksumAddress, block_hash: HexBytes, block_number: int, log_index: int, transaction_hash: HexBytes, transaction_index: int, args:FWXPerpCoreOpenPositionArgs) -> None:
-        self.args = args
+class FWXPerpCoreOpenPositionEventData(EventRecord):
+    __slots__ = ()
+    event = "OpenPosition"
+    args:FWXPerpCoreOpenPositionArgs
         
 class FWXPerpCoreClosePositionArgs(NamedTuple):
     owner:ChecksumAddress
@@ -86,12 +170,425 @@ class FWXPerpCoreClosePositionArgs(NamedTuple):
     collateral_swap_amount_unlocked:int
     router_address:ChecksumAddress
     
-class FWXPerpCoreClosePositionEventData(BaseEventData):
-    def __new__(cls, address: ChecksumAddress, block_hash: HexBytes, block_number: int, log_index: int, transaction_hash: HexBytes, transaction_index: int, args: FWXPerpCoreClosePositionArgs) -> 'FWXPerpCoreClosePositionEventData':
-        return super().__new__(cls, address, block_hash, block_number, "ClosePosition", log_index, transaction_hash, transaction_index)
+class FWXPerpCoreClosePositionEventData(EventRecord):
+    __slots__ = ()
+    event = "ClosePosition"
+    args:FWXPerpCoreClosePositionArgs
     
-    def __init__(self, address: ChecksumAddress, block_hash: HexBytes, block_number: int, log_index: int, transaction_hash: HexBytes, transaction_index: int, args:FWXPerpCoreClosePositionArgs) -> None:
-        self.args = args
+class FWXPerpCoreActivateRankArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    old_rank:int
+    new_rank:int
+    
+class FWXPerpCoreActivateRankEventData(EventRecord):
+    __slots__ = ()
+    event = "ActivateRank"
+    args:FWXPerpCoreActivateRankArgs
+    
+class FWXPerpCoreBurnAtpTokenArgs(NamedTuple):
+    burner:ChecksumAddress
+    nft_id:int
+    amount:int
+    price:int
+    
+class FWXPerpCoreBurnAtpTokenEventData(EventRecord):
+    __slots__ = ()
+    event = "BurnAtpToken"
+    args:FWXPerpCoreBurnAtpTokenArgs
+    
+class FWXPerpCoreBurnPTokenArgs(NamedTuple):
+    burner:ChecksumAddress
+    nft_id:int
+    amount:int
+    
+class FWXPerpCoreBurnPTokenEventData(EventRecord):
+    __slots__ = ()
+    event = "BurnPToken"
+    args:FWXPerpCoreBurnPTokenArgs
+    
+class FWXPerpCoreClaimTokenInterestArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    interest_token_claimed:int
+    interest_token_bonus:int
+    burned_itp:int
+    
+class FWXPerpCoreClaimTokenInterestEventData(EventRecord):
+    __slots__ = ()
+    event = "ClaimTokenInterest"
+    args:FWXPerpCoreClaimTokenInterestArgs
+    
+class FWXPerpCoreCollectFeesArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    pos_id:int
+    pair_bytes32:bytes
+    trading_fee:int
+    swap_fee:int
+    interest_paid:int
+    liquidation_fee:int
+    bounty_fee_to_protocol:int
+    bounty_fee_to_liquidator:int
+    
+class FWXPerpCoreCollectFeesEventData(EventRecord):
+    __slots__ = ()
+    event = "CollectFees"
+    args:FWXPerpCoreCollectFeesArgs
+    
+class FWXPerpCoreDepositArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    deposit_amount:int
+    minted_p:int
+    minted_atp:int
+    minted_itp:int
+    minted_ifp:int
+    
+class FWXPerpCoreDepositEventData(EventRecord):
+    __slots__ = ()
+    event = "Deposit"
+    args:FWXPerpCoreDepositArgs
+    
+class FWXPerpCoreDepositCollateralArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    collateral_token:ChecksumAddress
+    underlying_token:ChecksumAddress
+    pair_bytes32:bytes
+    amount:int
+    
+class FWXPerpCoreDepositCollateralEventData(EventRecord):
+    __slots__ = ()
+    event = "DepositCollateral"
+    args:FWXPerpCoreDepositCollateralArgs
+    
+class FWXPerpCoreLiquidatePositionArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    pos_id:int
+    is_long:bool
+    liquidator:ChecksumAddress
+    liquidated_size:int
+    swap_price:int
+    pair_bytes32:bytes
+    router_address:ChecksumAddress
+    
+class FWXPerpCoreLiquidatePositionEventData(EventRecord):
+    __slots__ = ()
+    event = "LiquidatePosition"
+    args:FWXPerpCoreLiquidatePositionArgs
+    
+class FWXPerpCoreMintAtpTokenArgs(NamedTuple):
+    minter:ChecksumAddress
+    nft_id:int
+    amount:int
+    price:int
+    
+class FWXPerpCoreMintAtpTokenEventData(EventRecord):
+    __slots__ = ()
+    event = "MintAtpToken"
+    args:FWXPerpCoreMintAtpTokenArgs
+    
+class FWXPerpCoreMintPTokenArgs(NamedTuple):
+    minter:ChecksumAddress
+    nft_id:int
+    amount:int
+    
+class FWXPerpCoreMintPTokenEventData(EventRecord):
+    __slots__ = ()
+    event = "MintPToken"
+    args:FWXPerpCoreMintPTokenArgs
+    
+class FWXPerpCoreSetAllowUnderlyingArgs(NamedTuple):
+    sender:ChecksumAddress
+    set_address:ChecksumAddress
+    is_allow:bool
+    
+class FWXPerpCoreSetAllowUnderlyingEventData(EventRecord):
+    __slots__ = ()
+    event = "SetAllowUnderlying"
+    args:FWXPerpCoreSetAllowUnderlyingArgs
+    
+class FWXPerpCoreSetBountyFeeRateToLiquidatorArgs(NamedTuple):
+    sender:ChecksumAddress
+    value:int
+    
+class FWXPerpCoreSetBountyFeeRateToLiquidatorEventData(EventRecord):
+    __slots__ = ()
+    event = "SetBountyFeeRateToLiquidator"
+    args:FWXPerpCoreSetBountyFeeRateToLiquidatorArgs
+    
+class FWXPerpCoreSetBountyFeeRateToProtocolArgs(NamedTuple):
+    sender:ChecksumAddress
+    value:int
+    
+class FWXPerpCoreSetBountyFeeRateToProtocolEventData(EventRecord):
+    __slots__ = ()
+    event = "SetBountyFeeRateToProtocol"
+    args:FWXPerpCoreSetBountyFeeRateToProtocolArgs
+    
+class FWXPerpCoreSetFeeToProtocolRateArgs(NamedTuple):
+    sender:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetFeeToProtocolRateEventData(EventRecord):
+    __slots__ = ()
+    event = "SetFeeToProtocolRate"
+    args:FWXPerpCoreSetFeeToProtocolRateArgs
+    
+class FWXPerpCoreSetLiquidatePnlRatioArgs(NamedTuple):
+    sender:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetLiquidatePnlRatioEventData(EventRecord):
+    __slots__ = ()
+    event = "SetLiquidatePnlRatio"
+    args:FWXPerpCoreSetLiquidatePnlRatioArgs
+    
+class FWXPerpCoreSetLiquidityRatioArgs(NamedTuple):
+    sender:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetLiquidityRatioEventData(EventRecord):
+    __slots__ = ()
+    event = "SetLiquidityRatio"
+    args:FWXPerpCoreSetLiquidityRatioArgs
+    
+class FWXPerpCoreSetMaintenanceMarginRatioArgs(NamedTuple):
+    sender:ChecksumAddress
+    token:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetMaintenanceMarginRatioEventData(EventRecord):
+    __slots__ = ()
+    event = "SetMaintenanceMarginRatio"
+    args:FWXPerpCoreSetMaintenanceMarginRatioArgs
+    
+class FWXPerpCoreSetMaxPnlsArgs(NamedTuple):
+    sender:ChecksumAddress
+    token:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetMaxPnlsEventData(EventRecord):
+    __slots__ = ()
+    event = "SetMaxPnls"
+    args:FWXPerpCoreSetMaxPnlsArgs
+    
+class FWXPerpCoreSetMaximumOpenSizeArgs(NamedTuple):
+    sender:ChecksumAddress
+    token:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetMaximumOpenSizeEventData(EventRecord):
+    __slots__ = ()
+    event = "SetMaximumOpenSize"
+    args:FWXPerpCoreSetMaximumOpenSizeArgs
+    
+class FWXPerpCoreSetMinimumMarginRatioArgs(NamedTuple):
+    sender:ChecksumAddress
+    token:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetMinimumMarginRatioEventData(EventRecord):
+    __slots__ = ()
+    event = "SetMinimumMarginRatio"
+    args:FWXPerpCoreSetMinimumMarginRatioArgs
+    
+class FWXPerpCoreSetMinimumOpenSizeArgs(NamedTuple):
+    sender:ChecksumAddress
+    token:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetMinimumOpenSizeEventData(EventRecord):
+    __slots__ = ()
+    event = "SetMinimumOpenSize"
+    args:FWXPerpCoreSetMinimumOpenSizeArgs
+    
+class FWXPerpCoreSetOIConfigArgs(NamedTuple):
+    sender:ChecksumAddress
+    token_address:ChecksumAddress
+    funding_net_oi:tuple[int, ...]
+    funding_rates:tuple[int, ...]
+    spread_notional:tuple[int, ...]
+    spread:tuple[int, ...]
+    
+class FWXPerpCoreSetOIConfigEventData(EventRecord):
+    __slots__ = ()
+    event = "SetOIConfig"
+    args:FWXPerpCoreSetOIConfigArgs
+    
+class FWXPerpCoreSetPerpCloseTradingArgs(NamedTuple):
+    setter:ChecksumAddress
+    old_address:ChecksumAddress
+    new_address:ChecksumAddress
+    
+class FWXPerpCoreSetPerpCloseTradingEventData(EventRecord):
+    __slots__ = ()
+    event = "SetPerpCloseTrading"
+    args:FWXPerpCoreSetPerpCloseTradingArgs
+    
+class FWXPerpCoreSetPerpLendingArgs(NamedTuple):
+    setter:ChecksumAddress
+    old_address:ChecksumAddress
+    new_address:ChecksumAddress
+    
+class FWXPerpCoreSetPerpLendingEventData(EventRecord):
+    __slots__ = ()
+    event = "SetPerpLending"
+    args:FWXPerpCoreSetPerpLendingArgs
+    
+class FWXPerpCoreSetPerpTradingArgs(NamedTuple):
+    setter:ChecksumAddress
+    old_address:ChecksumAddress
+    new_address:ChecksumAddress
+    
+class FWXPerpCoreSetPerpTradingEventData(EventRecord):
+    __slots__ = ()
+    event = "SetPerpTrading"
+    args:FWXPerpCoreSetPerpTradingArgs
+    
+class FWXPerpCoreSetPerpWalletTradingArgs(NamedTuple):
+    setter:ChecksumAddress
+    old_address:ChecksumAddress
+    new_address:ChecksumAddress
+    
+class FWXPerpCoreSetPerpWalletTradingEventData(EventRecord):
+    __slots__ = ()
+    event = "SetPerpWalletTrading"
+    args:FWXPerpCoreSetPerpWalletTradingArgs
+    
+class FWXPerpCoreSetPythIdArgs(NamedTuple):
+    setter:ChecksumAddress
+    token:ChecksumAddress
+    old_id:bytes
+    new_id:bytes
+    
+class FWXPerpCoreSetPythIdEventData(EventRecord):
+    __slots__ = ()
+    event = "SetPythId"
+    args:FWXPerpCoreSetPythIdArgs
+    
+class FWXPerpCoreSetStalePeriodArgs(NamedTuple):
+    sender:ChecksumAddress
+    period:int
+    
+class FWXPerpCoreSetStalePeriodEventData(EventRecord):
+    __slots__ = ()
+    event = "SetStalePeriod"
+    args:FWXPerpCoreSetStalePeriodArgs
+    
+class FWXPerpCoreSetTPSLArgs(NamedTuple):
+    sender:ChecksumAddress
+    nft_id:int
+    pos_id:int
+    tp_price:int
+    sl_price:int
+    current_price:int
+    
+class FWXPerpCoreSetTPSLEventData(EventRecord):
+    __slots__ = ()
+    event = "SetTPSL"
+    args:FWXPerpCoreSetTPSLArgs
+    
+class FWXPerpCoreSetTPSLExecutionFeeArgs(NamedTuple):
+    sender:ChecksumAddress
+    underlying_token:ChecksumAddress
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreSetTPSLExecutionFeeEventData(EventRecord):
+    __slots__ = ()
+    event = "SetTPSLExecutionFee"
+    args:FWXPerpCoreSetTPSLExecutionFeeArgs
+    
+class FWXPerpCoreSetTradingFeeArgs(NamedTuple):
+    sender:ChecksumAddress
+    token:ChecksumAddress
+    old_fee:int
+    new_fee:int
+    
+class FWXPerpCoreSetTradingFeeEventData(EventRecord):
+    __slots__ = ()
+    event = "SetTradingFee"
+    args:FWXPerpCoreSetTradingFeeArgs
+    
+class FWXPerpCoreTriggerTPSLArgs(NamedTuple):
+    sender:ChecksumAddress
+    nft_id:int
+    pos_id:int
+    trig_price:int
+    close_price:int
+    
+class FWXPerpCoreTriggerTPSLEventData(EventRecord):
+    __slots__ = ()
+    event = "TriggerTPSL"
+    args:FWXPerpCoreTriggerTPSLArgs
+    
+class FWXPerpCoreUpdateGlobalStatArgs(NamedTuple):
+    sender:ChecksumAddress
+    underlying:ChecksumAddress
+    total_contract_size_long:int
+    total_contract_size_short:int
+    average_price_long:int
+    average_price_short:int
+    realized_long_pnl:int
+    realized_short_pnl:int
+    unsettle_long_pnl:int
+    unsettle_short_pnl:int
+    
+class FWXPerpCoreUpdateGlobalStatEventData(EventRecord):
+    __slots__ = ()
+    event = "UpdateGlobalStat"
+    args:FWXPerpCoreUpdateGlobalStatArgs
+    
+class FWXPerpCoreUpdateWalletArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    pair_bytes32:bytes
+    old_value:int
+    new_value:int
+    
+class FWXPerpCoreUpdateWalletEventData(EventRecord):
+    __slots__ = ()
+    event = "UpdateWallet"
+    args:FWXPerpCoreUpdateWalletArgs
+    
+class FWXPerpCoreWithdrawArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    withdraw_amount:int
+    burned_p:int
+    burned_atp:int
+    burned_loss:int
+    burned_itp:int
+    burned_ifp:int
+    
+class FWXPerpCoreWithdrawEventData(EventRecord):
+    __slots__ = ()
+    event = "Withdraw"
+    args:FWXPerpCoreWithdrawArgs
+    
+class FWXPerpCoreWithdrawCollateralArgs(NamedTuple):
+    owner:ChecksumAddress
+    nft_id:int
+    collateral_token:ChecksumAddress
+    underlying_token:ChecksumAddress
+    pair_bytes32:bytes
+    amount:int
+    
+class FWXPerpCoreWithdrawCollateralEventData(EventRecord):
+    __slots__ = ()
+    event = "WithdrawCollateral"
+    args:FWXPerpCoreWithdrawCollateralArgs
     
 class FWXPerpHelperGetBalanceRespond(NamedTuple):
     net_balance:int
@@ -122,4 +619,53 @@ class FWXPerpCoreGetPositionRespond(NamedTuple):
     entry_price:int
     contract_size:int
     collateral_locked:int
-    leverage:int
\ No newline at end of file
+    leverage:int
+    
+# Columns of a PositionBook pass, one entry per position. They are NumPy object arrays of
+# Python ints when NumPy is installed and lists otherwise.
+class PortfolioMetrics(NamedTuple):
+    pos_id:Sequence[int]
+    price:Sequence[int]
+    pnl:Sequence[int]
+    roe:Sequence[int]
+    margin:Sequence[int]
+    liquidation_price:Sequence[int]
+    liquidation_distance:Sequence[int]
+    
+class MulticallResult(NamedTuple):
+    success:bool
+    result:Any
+
+class PendingTransaction(NamedTuple):
+    txn_hash:HexBytes
+    future:'Future[TxReceipt]'
+    
+    def done(self) -> bool:
+        
+        return self.future.done()
+    
+    def receipt(self, timeout:Optional[float]=None) -> 'TxReceipt':
+        
+        return self.future.result(timeout)
+
+# Hermes sends price and conf as decimal strings. Every decoder keeps them as strings, so the
+# raw payload has the same shape whichever JSON backend is installed; PythSnapshot converts them.
+class HermesPrice(TypedDict):
+    price:str
+    conf:str
+    expo:int
+    publish_time:int
+
+class HermesPriceFeed(TypedDict):
+    id:str
+    price:HermesPrice
+    ema_price:HermesPrice
+    metadata:NotRequired[dict[str,Any]]
+
+class HermesBinary(TypedDict):
+    encoding:str
+    data:list[str]
+
+class HermesResponse(TypedDict):
+    binary:HermesBinary
+    parsed:list[HermesPriceFeed]
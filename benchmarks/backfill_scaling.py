@@ -0,0 +1,89 @@
+"""
+Backfill throughput against the number of decoding processes.
+
+    python benchmarks/backfill_scaling.py [--events 60000] [--chunk-size 200] [--processes 1 2 4]
+
+A local JSON-RPC server answers eth_getLogs from the synthetic logs of event_decode.py, so the
+numbers measure the SDK rather than a remote node. scan_event_logs (threads, decoding in this
+process) is the baseline; backfill_event_logs is run once per process count. Every run must
+return the same records. The speedup is bounded by the number of cores: on a single core
+machine the process pool only adds pickling overhead.
+"""
+import argparse
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_decode import CORE, sample_logs
+
+from FWX.Contract import FWXPerpCoreContract
+from FWX.Events import get_perp_core_log_decoder
+
+def serve_logs(logs:list[dict[str, Any]]) -> ThreadingHTTPServer:
+    blocks = [int(log['blockNumber'], 16) for log in logs]
+    
+    def answer(request:dict[str, Any]) -> dict[str, Any]:
+        if request['method'] == 'eth_getLogs':
+            start, end = int(request['params'][0]['fromBlock'], 16), int(request['params'][0]['toBlock'], 16)
+            result:Any = logs[bisect.bisect_left(blocks, start):bisect.bisect_right(blocks, end)]
+        elif request['method'] == 'eth_chainId':
+            result = hex(8453)
+        else:
+            result = hex(blocks[-1])
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_POST(self) -> None:
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            body = json.dumps([answer(item) for item in request] if isinstance(request, list) else answer(request)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args:Any) -> None:
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=60_000)
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--processes', type=int, nargs='+', default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    
+    decoder = get_perp_core_log_decoder()
+    logs = sample_logs(args.events, decoder.topic_of('OpenPosition'), decoder.topic_of('ClosePosition'))
+    server = serve_logs(logs)
+    core = FWXPerpCoreContract(f'http://127.0.0.1:{server.server_port}', CORE, pool=None)
+    last_block = int(logs[-1]['blockNumber'], 16)
+    
+    start = time.perf_counter()
+    expected = list(core.scan_event_logs(0, last_block, chunk_size=args.chunk_size))
+    baseline = args.events / (time.perf_counter() - start)
+    print(f'{args.events:,} logs, {os.cpu_count()} cpu')
+    print(f'{"scan_event_logs":<22} {baseline:10,.0f} events/s')
+    for processes in args.processes:
+        start = time.perf_counter()
+        records = list(core.backfill_event_logs(0, last_block, chunk_size=args.chunk_size, processes=processes))
+        rate = args.events / (time.perf_counter() - start)
+        if records != expected:
+            raise ValueError(f'backfill with {processes} processes does not return the scan records')
+        print(f'{f"backfill, {processes} proc":<22} {rate:10,.0f} events/s ({rate / baseline:.2f}x)')
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Speedup of the memoized to_checksum_address over eth_utils' version.
+
+    python benchmarks/checksum.py [--addresses 50] [--events 20000]
+
+'calls' checksums a working set of distinct addresses over and over, the way the SDK sees the
+same contracts, routers and owners; 'misses' checksums unique addresses, so it only measures
+the cache overhead. 'decode' runs LogDecoder.decode_logs on the synthetic logs of
+event_decode.py with FWX.Events using one function or the other. Both must return the same
+records.
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eth_utils import to_checksum_address as eth_to_checksum_address
+
+from event_decode import sample_logs
+
+import FWX.Events
+from FWX.Constant import to_checksum_address
+from FWX.Events import get_perp_core_log_decoder
+
+def best(function:Callable[[], Any], number:int=1) -> float:
+    
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--addresses', type=int, default=50)
+    parser.add_argument('--events', type=int, default=20_000)
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    working_set = ['0x' + rng.getrandbits(160).to_bytes(20, 'big').hex() for _ in range(args.addresses)]
+    calls = [rng.choice(working_set) for _ in range(10_000)]
+    unique = ['0x' + rng.getrandbits(160).to_bytes(20, 'big').hex() for _ in range(10_000)]
+    if [to_checksum_address(address) for address in calls] != [eth_to_checksum_address(address) for address in calls]:
+        raise ValueError('The memoized checksum differs from eth_utils')
+    
+    def misses() -> None:
+        to_checksum_address.cache_clear()
+        for address in unique:
+            to_checksum_address(address)
+    
+    rows = [('calls', best(lambda: [eth_to_checksum_address(address) for address in calls]) / len(calls),
+             best(lambda: [to_checksum_address(address) for address in calls]) / len(calls)),
+            ('misses', best(lambda: [eth_to_checksum_address(address) for address in unique]) / len(unique),
+             best(misses) / len(unique))]
+    
+    decoder = get_perp_core_log_decoder()
+    logs = sample_logs(args.events, decoder.topic_of('OpenPosition'), decoder.topic_of('ClosePosition'))
+    cached = decoder.decode_logs(logs)
+    FWX.Events.to_checksum_address = eth_to_checksum_address
+    try:
+        uncached = decoder.decode_logs(logs)
+        uncached_seconds = best(lambda: decoder.decode_logs(logs)) / len(logs)
+    finally:
+        FWX.Events.to_checksum_address = to_checksum_address
+    if cached != uncached:
+        raise ValueError('Decoding with the memoized checksum returns other records')
+    rows.append(('decode', uncached_seconds, best(lambda: decoder.decode_logs(logs)) / len(logs)))
+    
+    print(f'{args.addresses} distinct addresses, {args.events:,} logs, us per call / per event')
+    print(f'{"":<8} {"eth_utils":>10} {"memoized":>10}')
+    for name, plain, memoized in rows:
+        print(f'{name:<8} {plain * 1e6:10.2f} {memoized * 1e6:10.2f}   ({plain / memoized:.1f}x)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Decode throughput of FWXPerpCore logs: web3's EventData path against the raw LogDecoder.
+
+    python benchmarks/event_decode.py [--events 20000]
+
+The logs are synthetic OpenPosition and ClosePosition logs shaped like an eth_getLogs
+response. The web3 path is what FWXPerpCoreContract did per log before the raw decoder:
+format the log, process_log, then process_open_position_event or
+get_process_close_position_event_log. The raw decoder is timed on the hex logs as they come
+from the node and on logs web3 already formatted. All three must return equal records, which
+the script checks before printing.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eth_abi import encode
+from web3._utils.method_formatters import log_entry_formatter
+
+from FWX.Contract import FWXPerpCoreContract
+from FWX.Events import get_perp_core_log_decoder
+
+CORE = '0x1111111111111111111111111111111111111111'
+ROUTER = '0x2222222222222222222222222222222222222222'
+
+def topic(value:int) -> str:
+    
+    return '0x' + value.to_bytes(32, 'big').hex()
+
+def sample_logs(events:int, open_topic:str, close_topic:str) -> list[dict[str, Any]]:
+    rng = random.Random(0)
+    owners = [rng.getrandbits(160) for _ in range(50)]
+    logs:list[dict[str, Any]] = []
+    for n in range(events):
+        owner = rng.choice(owners)
+        if n % 2 == 0:
+            data = encode(['uint256', 'uint256', 'uint256', 'bool', 'bytes32', 'uint256', 'address'],
+                          [n * 10, 5, n, True, b'p' * 32, n * 3, ROUTER])
+            topics = [open_topic, topic(owner), topic(n), topic(n + 1)]
+        else:
+            data = encode(['uint256', 'uint256', 'int128', 'bool', 'bool', 'bytes32', 'uint256', 'address'],
+                          [n, n * 2, -n, False, True, b'q' * 32, n * 4, ROUTER])
+            topics = [close_topic, topic(owner), topic(n), topic(n + 1)]
+        logs.append({'address': CORE,
+                     'blockHash': topic(rng.getrandbits(256)),
+                     'blockNumber': hex(n // 10 + 1),
+                     'data': '0x' + data.hex(),
+                     'logIndex': hex(n % 10),
+                     'removed': False,
+                     'topics': topics,
+                     'transactionHash': topic(rng.getrandbits(256)),
+                     'transactionIndex': hex(n % 5)})
+    return logs
+
+def web3_decoder(core:FWXPerpCoreContract, open_topic:str) -> Callable[[list[dict[str, Any]]], list[Any]]:
+    open_position = core.contract.events.OpenPosition()
+    close_position = core.contract.events.ClosePosition()
+    
+    def decode(logs:list[dict[str, Any]]) -> list[Any]:
+        records = []
+        for log in logs:
+            formatted = log_entry_formatter(log)
+            if formatted['topics'][0].to_0x_hex() == open_topic:
+                records.append(core.process_open_position_event(open_position.process_log(formatted)))
+            else:
+                records.append(core.get_process_close_position_event_log(close_position.process_log(formatted)))
+        return records
+    return decode
+
+def timed(decode:Callable[[Any], list[Any]], logs:Any) -> tuple[list[Any], float]:
+    start = time.perf_counter()
+    records = decode(logs)
+    return records, time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=20_000)
+    args = parser.parse_args()
+    
+    decoder = get_perp_core_log_decoder()
+    open_topic = decoder.topic_of('OpenPosition')
+    logs = sample_logs(args.events, open_topic, decoder.topic_of('ClosePosition'))
+    formatted = [log_entry_formatter(log) for log in logs]
+    # The provider is never contacted: the contract is only used for its ABI and event processing.
+    core = FWXPerpCoreContract('http://127.0.0.1:8545', CORE, pool=None)
+    
+    web3_records, web3_seconds = timed(web3_decoder(core, open_topic), logs)
+    raw_records, raw_seconds = timed(decoder.decode_logs, logs)
+    formatted_records, formatted_seconds = timed(decoder.decode_logs, formatted)
+    if not web3_records == raw_records == formatted_records:
+        raise ValueError('The raw decoder does not return the same records as web3')
+    
+    print(f'{args.events:,} logs')
+    print(f'{"web3 EventData":<26} {args.events / web3_seconds:10,.0f} events/s')
+    print(f'{"LogDecoder, hex logs":<26} {args.events / raw_seconds:10,.0f} events/s ({web3_seconds / raw_seconds:.0f}x)')
+    print(f'{"LogDecoder, web3 logs":<26} {args.events / formatted_seconds:10,.0f} events/s ({web3_seconds / formatted_seconds:.0f}x)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Memory per decoded event record, measured with tracemalloc.
+
+    python benchmarks/event_records.py [--events 100000]
+
+OpenPosition records are built the way the decoders build them, once with the slotted
+EventRecord class and once with the BaseEventData tuple subclass it replaced, whose __init__
+also gave every record a __dict__ for args. 'record' counts the record object alone (all
+records share one args tuple); 'total' also counts a fresh args tuple, hashes and integers
+per event. Both include the 8 byte list slot holding the record.
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hexbytes import HexBytes
+
+from FWX.types import (
+    BaseEventData,
+    FWXPerpCoreOpenPositionArgs,
+    FWXPerpCoreOpenPositionEventData,
+)
+
+CORE = '0x9E0bF9d5F9F6F6D4d6c1b5C1e4AB1c2E4e0f1a2b'
+OWNER = '0x1111111111111111111111111111111111111111'
+ROUTER = '0x2222222222222222222222222222222222222222'
+
+class LegacyOpenPositionEventData(BaseEventData):
+    # The record before EventRecord: a tuple subclass, plus a __dict__ created by setting args.
+    def __new__(cls, address, block_hash, block_number, log_index, transaction_hash, transaction_index, args):
+        return super().__new__(cls, address, block_hash, block_number, 'OpenPosition', log_index, transaction_hash, transaction_index)
+    
+    def __init__(self, address, block_hash, block_number, log_index, transaction_hash, transaction_index, args) -> None:
+        self.args = args
+
+SHARED_ARGS = FWXPerpCoreOpenPositionArgs(OWNER, 1, 2, 10**18, 5 * 10**18, 10**18, True, b'p' * 32, 10**18, ROUTER)
+SHARED_HASH = HexBytes(b'h' * 32)
+
+def record_only(cls:type) -> Callable[[int], Any]:
+    
+    return lambda i: cls(CORE, SHARED_HASH, 0, 0, SHARED_HASH, 0, SHARED_ARGS)
+
+def with_args(cls:type) -> Callable[[int], Any]:
+    def build(i:int) -> Any:
+        args = FWXPerpCoreOpenPositionArgs(OWNER, i, i + 1, 10**18 + i, 5 * 10**18 + i, 10**18 + i, True, i.to_bytes(32, 'big'), 10**18 + i, ROUTER)
+        return cls(CORE, HexBytes(i.to_bytes(32, 'big')), 20_000_000 + i, i % 10, HexBytes((i + 1).to_bytes(32, 'big')), i % 5, args)
+    return build
+
+def bytes_per_event(factory:Callable[[int], Any], events:int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    records = [factory(i) for i in range(events)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size / events
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=100_000)
+    args = parser.parse_args()
+    
+    legacy = LegacyOpenPositionEventData(CORE, SHARED_HASH, 1, 0, SHARED_HASH, 0, SHARED_ARGS)
+    record = FWXPerpCoreOpenPositionEventData(CORE, SHARED_HASH, 1, 0, SHARED_HASH, 0, SHARED_ARGS)
+    if tuple(legacy) != tuple(record) or legacy.args != record.args:
+        raise ValueError('EventRecord does not expose the same fields as the tuple record')
+    
+    print(f'{args.events:,} OpenPosition records, bytes/event')
+    print(f'{"":<12} {"record":>8} {"total":>8}')
+    for name, cls in (('tuple+dict', LegacyOpenPositionEventData), ('EventRecord', FWXPerpCoreOpenPositionEventData)):
+        shell = bytes_per_event(record_only(cls), args.events)
+        total = bytes_per_event(with_args(cls), args.events)
+        print(f'{name:<12} {shell:8.0f} {total:8.0f}')
+
+if __name__ == '__main__':
+    main()
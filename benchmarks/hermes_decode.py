@@ -0,0 +1,97 @@
+"""
+Decode time of a Hermes price payload with each available JSON backend.
+
+    python benchmarks/hermes_decode.py [--feeds 5] [--number 2000]
+
+The payload mimics the FWX Hermes response: one parsed entry per feed and a hex accumulator
+update of about 700 bytes per feed. Every backend must return the same payload, which the
+script checks before timing. PythSnapshot.from_raw is timed on top of the fastest decode.
+
+The new path (fastest decode + PythSnapshot.from_raw) must produce the same pyth_data and update
+data as the dict path it replaced (requests' .json() + the old per-call create_pyth_data and
+create_pyth_update_data); the script checks that and times both end to end.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FWX.Pyth import PythSnapshot
+from FWX.types import HermesResponse
+
+def sample_payload(feeds:int) -> bytes:
+    parsed:list[dict[str, Any]] = []
+    for i in range(feeds):
+        price = {'price': str(6_543_210_987 + i), 'conf': str(3_210_987 + i), 'expo': -8, 'publish_time': 1_730_000_000 + i}
+        parsed.append({'id': f'{i:064x}',
+                       'price': price,
+                       'ema_price': dict(price, price=str(6_543_000_000 + i)),
+                       'metadata': {'slot': 180_000_000 + i, 'proof_available_time': 1_730_000_001, 'prev_publish_time': 1_729_999_999}})
+    data = '504e4155' + 'ab' * (700 * feeds)
+    return json.dumps({'binary': {'encoding': 'hex', 'data': [data]}, 'parsed': parsed}).encode()
+
+# The conversion create_pyth_data and create_pyth_update_data did before PythSnapshot.
+def dict_path(payload:bytes) -> tuple[list[tuple[bytes,tuple[int,...],tuple[int,...]]], list[bytes]]:
+    raw_pyth_data = json.loads(payload)
+    pyth_data:list[tuple[bytes,tuple[int,...],tuple[int,...]]] = []
+    for i in raw_pyth_data['parsed']:
+        id:bytes = bytes.fromhex(i['id'])
+        price:tuple[int,...] = tuple([int(j) for j in i['price'].values()])
+        ema_price:tuple[int,...] = tuple([int(j) for j in i['ema_price'].values()])
+        pyth_data.append((id,price,ema_price))
+    return pyth_data, [bytes.fromhex(raw_pyth_data['binary']['data'][0])]
+
+def backends() -> dict[str, Callable[[bytes], Any]]:
+    decoders:dict[str, Callable[[bytes], Any]] = {'json': json.loads}
+    try:
+        import orjson
+        decoders['orjson'] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        decoders['msgspec'] = msgspec.json.Decoder(HermesResponse, strict=False).decode
+    except ImportError:
+        pass
+    return decoders
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=5)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+    
+    payload = sample_payload(args.feeds)
+    decoders = backends()
+    expected = json.loads(payload)
+    for name, decode in decoders.items():
+        if decode(payload) != expected:
+            raise ValueError(f'{name} does not return the json payload shape')
+    
+    print(f'payload: {len(payload):,} bytes, {args.feeds} feeds')
+    timings:dict[str, float] = {}
+    for name, decode in decoders.items():
+        timings[name] = min(timeit.repeat(lambda: decode(payload), number=args.number, repeat=5)) / args.number
+        print(f'{name:<8} {timings[name] * 1e6:8.1f} us/decode')
+    
+    fastest = decoders[min(timings, key=timings.__getitem__)]
+    raw = fastest(payload)
+    snapshot = min(timeit.repeat(lambda: PythSnapshot.from_raw(raw), number=args.number, repeat=5)) / args.number
+    print(f'{"snapshot":<8} {snapshot * 1e6:8.1f} us/PythSnapshot.from_raw')
+    
+    new_path = lambda: PythSnapshot.from_raw(fastest(payload))
+    expected_pyth_data, expected_update_data = dict_path(payload)
+    result = new_path()
+    if list(result.pyth_data) != expected_pyth_data or list(result.update_data) != expected_update_data:
+        raise ValueError('decode + PythSnapshot.from_raw does not match the old dict path')
+    old = min(timeit.repeat(lambda: dict_path(payload), number=args.number, repeat=5)) / args.number
+    new = min(timeit.repeat(new_path, number=args.number, repeat=5)) / args.number
+    print(f'{"dict":<8} {old * 1e6:8.1f} us/json.loads + create_pyth_data (old path)')
+    print(f'{"new":<8} {new * 1e6:8.1f} us/decode + PythSnapshot.from_raw ({old / new:.1f}x)')
+
+if __name__ == '__main__':
+    main()
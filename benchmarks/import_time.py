@@ -0,0 +1,74 @@
+"""
+Cold import time of the FWX modules, each measured in a fresh interpreter, and a guard on it.
+
+    python benchmarks/import_time.py [--repeat 5] [--budget-scale 1.0]
+
+FWX, FWX.Constant, FWX.types and FWX.Events must stay light: CLI jobs reading constants and
+the worker processes of a BackfillScanner only pay for them. The script exits with status 1
+when one of them loads a heavy dependency (web3, eth_account, aiohttp) or takes longer than its
+budget; --budget-scale stretches the budgets on slow machines. FWX.Client is the full SDK and
+is only reported.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Optional
+
+# Module -> import budget in milliseconds, None for modules that are only reported.
+MODULES:dict[str, Optional[float]] = {
+    'FWX': 50,
+    'FWX.Constant': 50,
+    'FWX.types': 400,
+    'FWX.Events': 1000,
+    'FWX.Client': None,
+}
+
+HEAVY_MODULES = ('web3', 'eth_account', 'aiohttp')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import sys, time
+t = time.perf_counter()
+import {module}
+print(time.perf_counter() - t, *[name for name in {heavy!r} if name in sys.modules])
+'''
+
+def measure(module:str, repeat:int) -> tuple[float, list[str]]:
+    samples:list[float] = []
+    heavy:list[str] = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                             cwd=ROOT,
+                             check=True,
+                             capture_output=True,
+                             text=True).stdout.split()
+        samples.append(float(out[0]))
+        heavy = out[1:]
+    return statistics.median(samples), heavy
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-scale', type=float, default=1.0)
+    args = parser.parse_args()
+    
+    failures:list[str] = []
+    for module, budget in MODULES.items():
+        seconds, heavy = measure(module, args.repeat)
+        print(f'{module:<14} {seconds * 1000:8.1f} ms   heavy modules: {", ".join(heavy) or "none"}')
+        if budget is None:
+            continue
+        if heavy:
+            failures.append(f'{module} imports {", ".join(heavy)}')
+        if seconds * 1000 > budget * args.budget_scale:
+            failures.append(f'{module} took {seconds * 1000:.1f} ms, budget {budget * args.budget_scale:.0f} ms')
+    
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
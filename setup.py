@@ -3,6 +3,7 @@ from setuptools import find_packages, setup
 setup(
     name='fwx-python-sdk',
     packages=find_packages(include=['FWX']),
+    package_data={'FWX': ['assets/*.json']},
     version='0.1.0',
     description='An unofficial Python SDK for interacting with the FWX DeFi protocol',
     author='Krittipat Krittakom',
@@ -10,7 +11,12 @@ setup(
     url='https://github.com/Krittipat-K/FWX-Python-SDK',  # Add the URL to your repository
     install_requires=[
         'web3==7.7.0',
-        'python-dotenv==1.0.1'
+        'python-dotenv==1.0.1',
+        'typing_extensions>=4.0.1; python_version<"3.11"',
     ],
+    extras_require={
+        'fast': ['msgspec', 'orjson'],
+        'numpy': ['numpy'],
+    },
     python_requires='>=3.9',
 )
\ No newline at end of file
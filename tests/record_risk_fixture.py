@@ -0,0 +1,53 @@
+"""
+Record FWXPerpHelper.getAllActivePositions rows for tests/test_risk.py.
+
+    python tests/record_risk_fixture.py RPC_URL NFT_ID [NFT_ID ...]
+
+The rows, the maintenance margin ratios and the Pyth feed IDs of their underlyings are read at
+one block and written to tests/fixtures/risk_<chain id>_<block>.json. Every row carries the
+helper's own pnl, roe, margin and liquidation_price, which the test compares with a
+PositionBook pass priced at the row's current_price.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FWX.Contract import FWXPerpCoreContract, FWXPerpHelperContract
+from FWX.Pyth import SHARED_PYTH_CACHE
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('provider')
+    parser.add_argument('nft_ids', type=int, nargs='+')
+    args = parser.parse_args()
+    
+    core = FWXPerpCoreContract(args.provider)
+    helper = FWXPerpHelperContract(args.provider)
+    block_number = core.w3.eth.block_number
+    pyth_data = SHARED_PYTH_CACHE.get_snapshot().pyth_data
+    positions = [position for result in helper.get_all_active_positions_of(core.address, args.nft_ids, pyth_data, block_number)
+                 for position in result or []]
+    if not positions:
+        raise ValueError(f'No active positions for NFT IDs {args.nft_ids}')
+    ratios, pyth_ids = core.get_risk_params([position.underlying_address for position in positions], block_number)
+    
+    fixture = {'chain_id': core.chain_id,
+               'block_number': block_number,
+               'core': core.address,
+               'helper': helper.address,
+               'nft_ids': args.nft_ids,
+               'maintenance_margin_ratios': ratios,
+               'pyth_ids': pyth_ids,
+               'positions': [position._asdict() for position in positions]}
+    path = os.path.join(FIXTURES, f'risk_{core.chain_id}_{block_number}.json')
+    with open(path, 'w') as file:
+        json.dump(fixture, file, indent=1)
+    print(f'{len(positions)} positions written to {path}')
+
+if __name__ == '__main__':
+    main()
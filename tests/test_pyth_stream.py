@@ -0,0 +1,74 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from FWX.Pyth import PythPriceStream
+
+FEED_ID = 'ab' * 32
+
+def sse_event() -> bytes:
+    price = {'price': '6543210987', 'conf': '3210987', 'expo': -8, 'publish_time': 1730000000}
+    update = {'binary': {'encoding': 'hex', 'data': ['504e4155']},
+              'parsed': [{'id': FEED_ID, 'price': price, 'ema_price': price}]}
+    return b'data:' + json.dumps(update).encode() + b'\n\n'
+
+class SSEHandler(BaseHTTPRequestHandler):
+    # Sends one short event, then keeps the connection open without sending anything.
+    chunked = False
+    
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        if self.chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        event = sse_event()
+        if self.chunked:
+            event = b'%x\r\n%s\r\n' % (len(event), event)
+        self.wfile.write(event)
+        self.wfile.flush()
+        self.server.release.wait(10)
+    
+    def log_message(self, *args) -> None:
+        pass
+
+class ChunkedSSEHandler(SSEHandler):
+    protocol_version = 'HTTP/1.1'
+    chunked = True
+
+class PythPriceStreamTest(unittest.TestCase):
+    handler = SSEHandler
+    
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler)
+        self.server.release = threading.Event()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.stream = PythPriceStream(ids=[FEED_ID], url=f'http://127.0.0.1:{self.server.server_port}/stream')
+    
+    def tearDown(self) -> None:
+        self.stream.stop()
+        self.server.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_short_event_is_delivered_immediately(self) -> None:
+        self.stream.start()
+        self.assertTrue(self.stream.wait_ready(2))
+        self.assertEqual(self.stream.get_price(FEED_ID)['price']['price'], '6543210987')
+        self.assertEqual(self.stream.get_snapshot().pyth_data[0][1][0], 6543210987)
+    
+    def test_stop_does_not_wait_for_blocked_read(self) -> None:
+        self.stream.start()
+        self.assertTrue(self.stream.wait_ready(2))
+        started = time.monotonic()
+        self.stream.stop(timeout=5)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(self.stream._thread.is_alive())
+
+class ChunkedPythPriceStreamTest(PythPriceStreamTest):
+    handler = ChunkedSSEHandler
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import glob
+import json
+import os
+import unittest
+from unittest import mock
+
+from FWX import Risk
+from FWX.Risk import WAD, PositionBook
+from FWX.types import FWXPerpCoreGetPositionRespond, FWXPerpHelperGetAllPositionRespond
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'risk_*.json')))
+
+ETH = '0x4200000000000000000000000000000000000006'
+BTC = '0x0555E30da8f98308EdB960aa94C0Db47230d2B9c'
+USDC = '0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913'
+RATIOS = {ETH: WAD // 100, BTC: WAD // 200}
+
+def sample_book() -> PositionBook:
+    return PositionBook([1, 2, 3],
+                        [True, False, True],
+                        [ETH, ETH, BTC],
+                        [3000 * WAD, 3000 * WAD, 60000 * WAD],
+                        [2 * WAD, WAD, WAD // 10],
+                        [1000 * WAD, 600 * WAD, 2000 * WAD],
+                        RATIOS)
+
+class RecordedHelperRowsTest(unittest.TestCase):
+    # The rows are FWXPerpHelper.getAllActivePositions output recorded with tests/record_risk_fixture.py.
+    
+    def test_book_matches_helper(self) -> None:
+        if not FIXTURES:
+            self.skipTest('No recorded getAllActivePositions rows, run tests/record_risk_fixture.py')
+        for path in FIXTURES:
+            with self.subTest(fixture=os.path.basename(path)), open(path) as file:
+                fixture = json.load(file)
+                positions = [FWXPerpHelperGetAllPositionRespond(**position) for position in fixture['positions']]
+                book = PositionBook.from_helper_positions(positions, fixture['maintenance_margin_ratios'], fixture['pyth_ids'])
+                self.assertEqual(book.validate(positions), [])
+
+class PositionBookTest(unittest.TestCase):
+    
+    def test_long_position(self) -> None:
+        metrics = sample_book().compute({ETH: 3300 * WAD, BTC: 60000 * WAD})
+        self.assertEqual(metrics.pnl[0], 600 * WAD)
+        self.assertEqual(metrics.roe[0], 6 * WAD // 10)
+        self.assertEqual(metrics.margin[0], 1600 * WAD)
+        # (3000 * 2 - 1000) / 2 / (1 - 0.01)
+        self.assertEqual(metrics.liquidation_price[0], 2500 * WAD * WAD // (WAD - WAD // 100))
+    
+    def test_divisions_truncate_toward_zero(self) -> None:
+        book = PositionBook([1], [True], [ETH], [3 * WAD], [WAD], [7 * WAD], RATIOS)
+        metrics = book.compute({ETH: 2 * WAD})
+        self.assertEqual(metrics.pnl[0], -WAD)
+        self.assertEqual(metrics.roe[0], -(WAD // 7))
+    
+    def test_loop_matches_numpy(self) -> None:
+        prices = {ETH: 2950 * WAD + 123, BTC: 61234 * WAD + 5}
+        expected = sample_book().compute(prices)
+        with mock.patch.object(Risk, 'np', None):
+            metrics = sample_book().compute(prices)
+        for column, expected_column in zip(metrics, expected):
+            self.assertEqual([int(value) for value in column], [int(value) for value in expected_column])
+    
+    def test_core_positions_use_given_collateral(self) -> None:
+        core = [FWXPerpCoreGetPositionRespond(1, 0, USDC, ETH, 3000 * WAD, 2 * WAD, 999 * 10**6, 6 * WAD)]
+        book = PositionBook.from_core_positions(core, [True], [1000 * WAD], RATIOS)
+        self.assertEqual(list(book.collaterals), [1000 * WAD])
+    
+    def test_validate_reports_mismatch(self) -> None:
+        book = sample_book()
+        metrics = book.compute({ETH: 3300 * WAD, BTC: 60000 * WAD})
+        row = FWXPerpHelperGetAllPositionRespond(1, True, USDC, ETH, 3000 * WAD, 3300 * WAD, 2 * WAD, 1000 * WAD,
+                                                 int(metrics.liquidation_price[0]), 600 * WAD + 1, 6 * WAD // 10, 1600 * WAD, 0, 0, 0)
+        self.assertEqual(book.validate([row]), [(1, 'pnl', 600 * WAD, 600 * WAD + 1)])
+
+if __name__ == '__main__':
+    unittest.main()